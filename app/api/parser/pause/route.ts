@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth';
+import { pythonParser, toParseStatus } from '@/lib/python-parser-integration';
 import { ParserMonitor } from '../ws/route';
 
 export async function POST(request: NextRequest) {
@@ -11,15 +12,25 @@ export async function POST(request: NextRequest) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    // TODO: Implement actual pause logic
-    // This would involve setting a flag in Redis or database
-    // to pause the parsing process
-    
-    ParserMonitor.broadcastLog('info', 'Parsing paused by admin');
+    // Optional { jobId } targets one parse, otherwise every running parse on this host
+    const { jobId } = await request.json().catch(() => ({}));
+    const result = await pythonParser.controlParse('pause', jobId);
+    if (!result.success || !result.data) {
+      return NextResponse.json({ error: result.error || 'Failed to pause parser' }, { status: 500 });
+    }
+
+    const jobs = result.data.jobs;
+    if (jobs.length === 0) {
+      return NextResponse.json({ error: 'No running parse job' }, { status: 409 });
+    }
+
+    ParserMonitor.broadcastLog('info', `Parsing paused by admin (${jobs.map((job) => job.job_id).join(', ')})`);
+    jobs.forEach((job) => ParserMonitor.broadcastStatus(toParseStatus(job)));
     
     return NextResponse.json({ 
       success: true, 
-      message: 'Parsing paused' 
+      message: 'Parsing paused',
+      jobs
     });
 
   } catch (error) {
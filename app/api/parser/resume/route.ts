@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth';
+import { pythonParser, toParseStatus } from '@/lib/python-parser-integration';
 import { ParserMonitor } from '../ws/route';
 
 export async function POST(request: NextRequest) {
@@ -11,14 +12,25 @@ export async function POST(request: NextRequest) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    // TODO: Implement actual resume logic
-    // This would involve clearing the pause flag in Redis or database
-    
-    ParserMonitor.broadcastLog('info', 'Parsing resumed by admin');
+    // Optional { jobId } targets one parse, otherwise every running parse on this host
+    const { jobId } = await request.json().catch(() => ({}));
+    const result = await pythonParser.controlParse('resume', jobId);
+    if (!result.success || !result.data) {
+      return NextResponse.json({ error: result.error || 'Failed to resume parser' }, { status: 500 });
+    }
+
+    const jobs = result.data.jobs;
+    if (jobs.length === 0) {
+      return NextResponse.json({ error: 'No running parse job' }, { status: 409 });
+    }
+
+    ParserMonitor.broadcastLog('info', `Parsing resumed by admin (${jobs.map((job) => job.job_id).join(', ')})`);
+    jobs.forEach((job) => ParserMonitor.broadcastStatus(toParseStatus(job)));
     
     return NextResponse.json({ 
       success: true, 
-      message: 'Parsing resumed' 
+      message: 'Parsing resumed',
+      jobs
     });
 
   } catch (error) {
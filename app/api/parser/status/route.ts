@@ -1,8 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth';
+import { pythonParser, toParseStatus } from '@/lib/python-parser-integration';
 
-// Mock data for parser status - in a real implementation, this would come from your parser service
+// Status shown while no Python parse job is running (running jobs report their own progress)
 let mockParseStatus = {
   id: 'parser-1',
   textType: 'bg',
@@ -40,8 +41,13 @@ export async function GET(request: NextRequest) {
     return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
   }
 
+  // Live progress of the parses running on this host
+  const control = await pythonParser.controlParse('status').catch(() => null);
+  const jobs = control?.success && control.data ? control.data.jobs : [];
+
   return NextResponse.json({
-    parseStatus: mockParseStatus,
+    parseStatus: jobs.length > 0 ? toParseStatus(jobs[0]) : mockParseStatus,
+    jobs,
     logs: mockLogs.slice(-50), // Return last 50 logs
     stats: mockStats,
     timestamp: new Date().toISOString(),
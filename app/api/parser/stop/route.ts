@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth';
+import { pythonParser } from '@/lib/python-parser-integration';
 
 // Global variable to track parsing state
 let isParsingActive = false;
@@ -21,10 +22,18 @@ export async function POST(request: NextRequest) {
     isParsingActive = false;
     currentParseId = null;
 
+    // Cancel running Python parses: chapters not yet started are skipped, parsed verses are kept
+    const { jobId } = await request.json().catch(() => ({}));
+    const result = await pythonParser.controlParse('cancel', jobId);
+    if (!result.success) {
+      console.error('Error cancelling Python parse:', result.error);
+    }
+
     return NextResponse.json({
       success: true,
       message: 'Parsing stopped successfully',
-      parseId: currentParseId
+      parseId: currentParseId,
+      jobs: result.data?.jobs ?? []
     });
 
   } catch (error) {
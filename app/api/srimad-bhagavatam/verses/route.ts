@@ -118,21 +118,23 @@ export async function POST(request: NextRequest) {
     // Create or update verse
     const verse = await prisma.verse.upsert({
       where: {
-        title_chapter_verseNumber_language: {
+        title_canto_chapter_verseNumber_language: {
           title: 'Шримад-Бхагаватам',
+          canto,
           chapter,
           verseNumber,
           language: 'ru',
         },
       },
       update: {
-        canto,
         sanskrit,
         transliteration,
         wordByWordTranslation,
         translation,
         commentary,
         updatedAt: new Date(),
+        // The parser skips rows whose content hash is unchanged; a manual edit must be rewritten
+        contentHash: null,
       },
       create: {
         title: 'Шримад-Бхагаватам',
@@ -0,0 +1,51 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { gunzipSync } from 'zlib'
+import { BUNDLE_TEXTS, BundleText, getChapterBundleETag, readChapterBundle } from '@/lib/chapter-bundles'
+
+// GET /api/verses/chapter?text=sb&canto=1&chapter=2 - Whole chapter from its precomputed bundle
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const text = searchParams.get('text') as BundleText | null
+    const chapter = parseInt(searchParams.get('chapter') || '')
+    const canto = searchParams.get('canto') ? parseInt(searchParams.get('canto')!) : null
+
+    if (!text || !BUNDLE_TEXTS.includes(text) || !(chapter >= 1) || (canto !== null && !(canto >= 1))) {
+      return NextResponse.json(
+        { error: `Required parameters: text (${BUNDLE_TEXTS.join(', ')}), chapter and, for SB/CC, canto` },
+        { status: 400 }
+      )
+    }
+
+    const address = { text, chapter, canto }
+    const etag = await getChapterBundleETag(address)
+    if (!etag) {
+      return NextResponse.json({ error: 'Chapter bundle not found' }, { status: 404 })
+    }
+
+    const headers: Record<string, string> = {
+      ETag: etag,
+      'Cache-Control': 'public, max-age=0, must-revalidate',
+      Vary: 'Accept-Encoding',
+    }
+
+    // Clients of a session revalidate with the ETag; an unchanged chapter is not sent again
+    if (request.headers.get('if-none-match') === etag) {
+      return new NextResponse(null, { status: 304, headers })
+    }
+
+    const bundle = await readChapterBundle(address)
+    if (!bundle) {
+      return NextResponse.json({ error: 'Chapter bundle not found' }, { status: 404 })
+    }
+
+    headers['Content-Type'] = 'application/json; charset=utf-8'
+    if ((request.headers.get('accept-encoding') || '').includes('gzip')) {
+      return new NextResponse(bundle, { headers: { ...headers, 'Content-Encoding': 'gzip' } })
+    }
+    return new NextResponse(gunzipSync(bundle), { headers })
+  } catch (error) {
+    console.error('Error serving chapter bundle:', error)
+    return NextResponse.json({ error: 'Internal server error' }, { status: 500 })
+  }
+}
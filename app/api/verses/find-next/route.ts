@@ -1,9 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { prisma } from '@/lib/db';
+import { getCachedVerse, formatCachedVerse } from '@/lib/verse-cache';
 
 export async function POST(request: NextRequest) {
   try {
-    const { title, chapter, verseNumber, language = 'ru' } = await request.json();
+    const { title, chapter, verseNumber, language = 'ru', canto = null } = await request.json();
 
     if (!title || !chapter || !verseNumber) {
       return NextResponse.json(
@@ -14,6 +15,12 @@ export async function POST(request: NextRequest) {
 
     console.log(`🔍 Searching for next available verse after ${title} ${chapter}.${verseNumber}`);
 
+    // Live sessions navigate verse by verse: the verse cache answers from memory
+    const cachedVerse = await getCachedVerse('next', { title, chapter, verseNumber, language, canto });
+    if (cachedVerse) {
+      return NextResponse.json({ success: true, verse: formatCachedVerse(cachedVerse) });
+    }
+
     // Сначала попробуем найти стих с номером больше запрошенного в той же главе
     let nextVerse = await prisma.verse.findFirst({
       where: {
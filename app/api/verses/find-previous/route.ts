@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { prisma } from '@/lib/db'
+import { getCachedVerse, formatCachedVerse } from '@/lib/verse-cache'
 import { z } from 'zod'
 import { Verse } from '@prisma/client'
 
@@ -8,6 +9,7 @@ const findPreviousVerseSchema = z.object({
   chapter: z.number().min(1, 'Chapter must be at least 1'),
   verseNumber: z.number().min(1, 'Verse number must be at least 1'),
   language: z.string().default('ru'),
+  canto: z.number().min(1).nullable().optional(), // SB canto / CC lila
 })
 
 export async function POST(request: NextRequest) {
@@ -17,6 +19,12 @@ export async function POST(request: NextRequest) {
 
     console.log(`🔍 Searching for previous verse before ${validatedData.chapter}.${validatedData.verseNumber}...`)
 
+    // Live sessions navigate verse by verse: the verse cache answers from memory
+    const cachedVerse = await getCachedVerse('previous', validatedData)
+    if (cachedVerse) {
+      return NextResponse.json({ success: true, verse: formatCachedVerse(cachedVerse), found: true })
+    }
+
     // Ищем предыдущий стих в той же главе
     let previousVerse: Verse | null = await prisma.verse.findFirst({
       where: {
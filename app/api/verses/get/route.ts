@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server'
 import { getServerSession } from 'next-auth'
 import { authOptions } from '@/lib/auth'
 import { prisma } from '@/lib/db'
+import { getCachedVerse, formatCachedVerse } from '@/lib/verse-cache'
 import { z } from 'zod'
 
 const getVerseSchema = z.object({
@@ -9,6 +10,7 @@ const getVerseSchema = z.object({
   chapter: z.number().min(1, 'Chapter must be at least 1'),
   verseNumber: z.number().min(1, 'Verse number must be at least 1'),
   language: z.string().default('ru'),
+  canto: z.number().min(1).nullable().optional(), // SB canto / CC lila
 })
 
 // GET /api/verses/get - Get a specific verse from database
@@ -19,6 +21,7 @@ export async function GET(request: NextRequest) {
     const chapter = searchParams.get('chapter')
     const verseNumber = searchParams.get('verseNumber')
     const language = searchParams.get('language') || 'ru'
+    const canto = searchParams.get('canto')
 
     if (!title || !chapter || !verseNumber) {
       return NextResponse.json(
@@ -27,6 +30,17 @@ export async function GET(request: NextRequest) {
       )
     }
 
+    const cachedVerse = await getCachedVerse('verse', {
+      title,
+      chapter: parseInt(chapter),
+      verseNumber: parseInt(verseNumber),
+      language,
+      canto: canto ? parseInt(canto) : null
+    })
+    if (cachedVerse) {
+      return NextResponse.json({ success: true, verse: formatCachedVerse(cachedVerse), found: true })
+    }
+
     const verse = await prisma.verse.findFirst({
       where: {
         title: {
@@ -171,6 +185,11 @@ export async function POST(request: NextRequest) {
     const body = await request.json()
     const validatedData = getVerseSchema.parse(body)
 
+    const cachedVerse = await getCachedVerse('verse', validatedData)
+    if (cachedVerse) {
+      return NextResponse.json({ success: true, verse: formatCachedVerse(cachedVerse), found: true })
+    }
+
     const verse = await prisma.verse.findFirst({
       where: {
         title: {
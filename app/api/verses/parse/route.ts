@@ -401,6 +401,27 @@ async function processParsingAsync(
         const parseResult = await pythonParser.parseTextType(currentTextType as 'bg' | 'sb' | 'cc', {
           saveToDb: true,
           maxChapters: undefined
+        }, (event) => {
+          // Python streams its progress, forward it to the monitor as it happens
+          if (event.event === 'chapter_done') {
+            ParserMonitor.broadcastProgress({
+              id: parseId,
+              textType: currentTextType,
+              status: 'running',
+              progress: event.chapters_total ? (event.chapters_done / event.chapters_total) * 100 : 0,
+              currentChapter: event.chapters_done,
+              totalChapters: event.chapters_total ?? 0,
+              processedVerses: event.verses_total,
+              speed: Math.round(event.verses_per_second * 60), // verses per minute
+              estimatedTimeRemaining: event.eta_seconds !== null ? Math.round(event.eta_seconds) : undefined,
+            });
+            ParserMonitor.broadcastLog(
+              event.failed ? 'warning' : 'info',
+              `${currentTextType.toUpperCase()} ${event.chapter}: ${event.verses} verses`
+            );
+          } else if (event.event === 'verse_batch_saved') {
+            ParserMonitor.broadcastLog('success', `Saved ${event.saved} verses to database`);
+          }
         });
         
         if (parseResult.success && parseResult.data) {
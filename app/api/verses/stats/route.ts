@@ -1,6 +1,20 @@
 import { NextRequest, NextResponse } from 'next/server'
+import { Prisma } from '@prisma/client'
 import { prisma } from '@/lib/db'
 
+type StatsRow = {
+  title: string | null
+  chapter: number | null
+  language: string | null
+  level: number
+  all_languages: bigint
+  verses: bigint
+  with_transliteration: bigint
+  with_word_by_word: bigint
+  with_commentary: bigint
+  merged: bigint
+}
+
 // GET /api/verses/stats - Get statistics about verses in database
 export async function GET(request: NextRequest) {
   try {
@@ -19,67 +33,73 @@ export async function GET(request: NextRequest) {
       where.language = language
     }
 
-    // Get total count
-    const totalCount = await prisma.verse.count({ where })
+    // Counts by title, chapter and language plus field completeness in one grouped query.
+    // Language-level counts ignore the language filter, everything else respects it.
+    const titleFilter = title
+      ? Prisma.sql`WHERE title ILIKE ${'%' + title + '%'}`
+      : Prisma.empty
+    const rows = await prisma.$queryRaw<StatsRow[]>`
+      SELECT title, chapter, language,
+             GROUPING(title, chapter, language)::int AS level,
+             COUNT(*) AS all_languages,
+             COUNT(*) FILTER (WHERE language = ${language}) AS verses,
+             COUNT(*) FILTER (WHERE language = ${language} AND COALESCE(transliteration, block_transliteration, '') <> '') AS with_transliteration,
+             COUNT(*) FILTER (WHERE language = ${language} AND COALESCE("wordByWordTranslation", block_word_by_word, '') <> '') AS with_word_by_word,
+             COUNT(*) FILTER (WHERE language = ${language} AND COALESCE(commentary, block_commentary, '') <> '') AS with_commentary,
+             COUNT(*) FILTER (WHERE language = ${language} AND "isMergedVerse") AS merged
+      FROM verses
+      -- Verse rows of merged blocks keep their text in verse_blocks
+      LEFT JOIN LATERAL (
+        SELECT transliteration AS block_transliteration,
+               "wordByWordTranslation" AS block_word_by_word,
+               commentary AS block_commentary
+        FROM verse_blocks
+        WHERE verse_blocks.id = verses."mergedBlockId"
+      ) block ON true
+      ${titleFilter}
+      GROUP BY GROUPING SETS ((), (language), (title), (title, chapter))
+    `
 
-    // Get count by title
-    const countByTitle = await prisma.verse.groupBy({
-      by: ['title'],
-      where,
-      _count: {
-        id: true
-      },
-      orderBy: {
-        _count: {
-          id: 'desc'
-        }
-      }
-    })
+    // GROUPING() bitmask: title=4, chapter=2, language=1 (bit set = aggregated away)
+    let totalCount = 0
+    let completeness = { transliteration: 0, wordByWord: 0, commentary: 0, merged: 0 }
+    const countByTitle: Array<{ title: string; count: number }> = []
+    const countByLanguage: Array<{ language: string; count: number }> = []
+    const titleChapterInfo: Record<string, { minChapter: number; maxChapter: number; totalVerses: number }> = {}
 
-    // Get count by language
-    const countByLanguage = await prisma.verse.groupBy({
-      by: ['language'],
-      where: title ? { title: { contains: title, mode: 'insensitive' } } : {},
-      _count: {
-        id: true
-      },
-      orderBy: {
-        _count: {
-          id: 'desc'
+    rows.forEach(row => {
+      const count = Number(row.verses)
+      if (row.level === 7) {
+        totalCount = count
+        completeness = {
+          transliteration: Number(row.with_transliteration),
+          wordByWord: Number(row.with_word_by_word),
+          commentary: Number(row.with_commentary),
+          merged: Number(row.merged)
         }
-      }
-    })
-
-    // Get chapter range for each title
-    const chapterRanges = await prisma.verse.groupBy({
-      by: ['title', 'chapter'],
-      where,
-      _count: {
-        id: true
-      },
-      orderBy: [
-        { title: 'asc' },
-        { chapter: 'asc' }
-      ]
-    })
-
-    // Process chapter ranges
-    const titleChapterInfo: Record<string, { minChapter: number; maxChapter: number; totalVerses: number }> = {}
-    
-    chapterRanges.forEach(item => {
-      if (!titleChapterInfo[item.title]) {
-        titleChapterInfo[item.title] = {
-          minChapter: item.chapter,
-          maxChapter: item.chapter,
-          totalVerses: 0
+      } else if (row.level === 6 && row.language) {
+        countByLanguage.push({ language: row.language, count: Number(row.all_languages) })
+      } else if (row.level === 3 && row.title && count > 0) {
+        countByTitle.push({ title: row.title, count })
+      } else if (row.level === 1 && row.title && row.chapter !== null && count > 0) {
+        const info = titleChapterInfo[row.title]
+        if (!info) {
+          titleChapterInfo[row.title] = {
+            minChapter: row.chapter,
+            maxChapter: row.chapter,
+            totalVerses: count
+          }
+        } else {
+          info.minChapter = Math.min(info.minChapter, row.chapter)
+          info.maxChapter = Math.max(info.maxChapter, row.chapter)
+          info.totalVerses += count
         }
       }
-      
-      titleChapterInfo[item.title].minChapter = Math.min(titleChapterInfo[item.title].minChapter, item.chapter)
-      titleChapterInfo[item.title].maxChapter = Math.max(titleChapterInfo[item.title].maxChapter, item.chapter)
-      titleChapterInfo[item.title].totalVerses += item._count.id
     })
 
+    countByTitle.sort((a, b) => b.count - a.count)
+    countByLanguage.sort((a, b) => b.count - a.count)
+
     // Get recent verses
     const recentVerses = await prisma.verse.findMany({
       where,
@@ -102,15 +122,10 @@ export async function GET(request: NextRequest) {
       success: true,
       stats: {
         totalCount,
-        countByTitle: countByTitle.map(item => ({
-          title: item.title,
-          count: item._count.id
-        })),
-        countByLanguage: countByLanguage.map(item => ({
-          language: item.language,
-          count: item._count.id
-        })),
+        countByTitle,
+        countByLanguage,
         titleChapterInfo,
+        completeness,
         recentVerses: recentVerses.map(verse => ({
           id: verse.id,
           title: verse.title,
@@ -16,6 +16,7 @@ interface VerseStats {
   countByTitle: Array<{ title: string; count: number }>;
   countByLanguage: Array<{ language: string; count: number }>;
   titleChapterInfo: Record<string, { minChapter: number; maxChapter: number; totalVerses: number }>;
+  completeness: { transliteration: number; wordByWord: number; commentary: number; merged: number };
   recentVerses: Array<{
     id: string;
     title: string;
@@ -146,6 +147,28 @@ export default function VerseDatabaseStats({ className }: VerseDatabaseStatsProp
           </div>
         </div>
 
+        {/* Полнота полей */}
+        {stats.totalCount > 0 && (
+          <div>
+            <h4 className="font-semibold mb-2 flex items-center gap-2">
+              <TrendingUp className="w-4 h-4" />
+              Полнота данных
+            </h4>
+            <div className="flex flex-wrap gap-2">
+              {[
+                { label: 'Транслитерация', count: stats.completeness.transliteration },
+                { label: 'Пословный перевод', count: stats.completeness.wordByWord },
+                { label: 'Комментарий', count: stats.completeness.commentary },
+                { label: 'Объединенные', count: stats.completeness.merged }
+              ].map((item) => (
+                <Badge key={item.label} variant="outline">
+                  {item.label}: {Math.round((item.count / stats.totalCount) * 100)}%
+                </Badge>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* Статистика по языкам */}
         <div>
           <h4 className="font-semibold mb-2 flex items-center gap-2">
@@ -300,23 +300,43 @@ export default function ParserMonitor() {
     }
   };
 
+  const controlParse = async (action: 'pause' | 'resume') => {
+    const response = await fetch(`/api/parser/${action}/`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      credentials: 'include',
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || `Failed to ${action} parsing`);
+    }
+
+    return response.json();
+  };
+
   const pauseParse = async () => {
     try {
-      // For now, we'll just show a message since the real parser doesn't support pause/resume
-      addLog('info', 'Pause functionality not yet implemented for real parser');
-      toast.info('Pause functionality not yet implemented');
+      // Running chapters finish, the next ones wait until resumed
+      await controlParse('pause');
+      addLog('info', 'Parsing paused by user');
+      toast.success('Parsing paused');
+      setParseStatus(prev => prev ? { ...prev, status: 'paused' as const } : null);
     } catch (error) {
       addLog('error', 'Failed to pause parsing', error);
+      toast.error('Failed to pause parsing');
     }
   };
 
   const resumeParse = async () => {
     try {
-      // For now, we'll just show a message since the real parser doesn't support pause/resume
-      addLog('info', 'Resume functionality not yet implemented for real parser');
-      toast.info('Resume functionality not yet implemented');
+      await controlParse('resume');
+      addLog('info', 'Parsing resumed by user');
+      toast.success('Parsing resumed');
+      setParseStatus(prev => prev ? { ...prev, status: 'running' as const } : null);
     } catch (error) {
       addLog('error', 'Failed to resume parsing', error);
+      toast.error('Failed to resume parsing');
     }
   };
 
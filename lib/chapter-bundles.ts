@@ -0,0 +1,46 @@
+/**
+ * Precomputed chapter bundles built by python-parser (chapter_bundles.py):
+ * <CHAPTER_BUNDLE_DIR>/<text>/<chapter label>.json.gz with its ETag in
+ * <chapter label>.etag. A reading session gets the whole chapter from one
+ * file read instead of database queries.
+ */
+import { readFile } from 'fs/promises'
+import path from 'path'
+
+const CHAPTER_BUNDLE_DIR = process.env.CHAPTER_BUNDLE_DIR || path.join(process.cwd(), 'data', 'chapter-bundles')
+
+export const BUNDLE_TEXTS = ['bg', 'sb', 'cc'] as const
+export type BundleText = typeof BUNDLE_TEXTS[number]
+
+export interface ChapterBundleAddress {
+  text: BundleText
+  chapter: number
+  canto?: number | null // SB canto / CC lila
+}
+
+function bundleBasePath({ text, chapter, canto }: ChapterBundleAddress): string {
+  const label = canto != null ? `${canto}.${chapter}` : String(chapter)
+  return path.join(CHAPTER_BUNDLE_DIR, text, label)
+}
+
+/**
+ * ETag of a chapter bundle, null when the chapter has no bundle
+ */
+export async function getChapterBundleETag(address: ChapterBundleAddress): Promise<string | null> {
+  try {
+    return (await readFile(`${bundleBasePath(address)}.etag`, 'utf-8')).trim()
+  } catch {
+    return null
+  }
+}
+
+/**
+ * Gzip-compressed JSON of a chapter bundle, null when the chapter has no bundle
+ */
+export async function readChapterBundle(address: ChapterBundleAddress): Promise<Buffer | null> {
+  try {
+    return await readFile(`${bundleBasePath(address)}.json.gz`)
+  } catch {
+    return null
+  }
+}
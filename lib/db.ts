@@ -1,9 +1,88 @@
 import { PrismaClient } from '@prisma/client'
 
+// Verse text that a merged block (ТЕКСТЫ 16-18) stores once for all of its verses
+const BLOCK_TEXT_FIELDS = ['sanskrit', 'transliteration', 'wordByWordTranslation', 'translation', 'commentary'] as const
+
+type BlockTextField = (typeof BLOCK_TEXT_FIELDS)[number]
+type VerseRow = { mergedBlockId?: string | null } & Partial<Record<BlockTextField, string | null>>
+
+/**
+ * Verse rows of a query result: the result itself or records it includes
+ * (sessionVerse.verse, readingGroup.verses, ...), recognised by their mergedBlockId field
+ */
+function collectVerseRows(value: unknown, rows: VerseRow[]) {
+  if (Array.isArray(value)) {
+    for (const item of value) collectVerseRows(item, rows)
+    return
+  }
+  if (!value || typeof value !== 'object' || value instanceof Date) return
+  if ('mergedBlockId' in value) rows.push(value as VerseRow)
+  for (const nested of Object.values(value)) {
+    if (nested && typeof nested === 'object') collectVerseRows(nested, rows)
+  }
+}
+
+/**
+ * Fill in the text of merged-block verse rows from their verse_blocks row.
+ * python-parser writes these rows without text; rows with their own text are left as is.
+ * Raw SQL readers use the verses_resolved view instead.
+ */
+async function withBlockText<T>(client: PrismaClient, result: T): Promise<T> {
+  const rows: VerseRow[] = []
+  collectVerseRows(result, rows)
+  const blockRows = rows.filter(row => row.mergedBlockId && !row.sanskrit && !row.translation)
+  if (blockRows.length === 0) return result
+
+  const blocks = await client.verseBlock.findMany({
+    where: { id: { in: Array.from(new Set(blockRows.map(row => row.mergedBlockId as string))) } },
+    select: {
+      id: true,
+      sanskrit: true,
+      transliteration: true,
+      wordByWordTranslation: true,
+      translation: true,
+      commentary: true
+    }
+  })
+  const blocksById = new Map(blocks.map(block => [block.id, block]))
+
+  for (const row of blockRows) {
+    const block = blocksById.get(row.mergedBlockId as string)
+    if (!block) continue
+    for (const field of BLOCK_TEXT_FIELDS) {
+      // Only fields the query selected
+      if (field in row && !row[field]) row[field] = block[field]
+    }
+  }
+  return result
+}
+
+function createPrismaClient() {
+  const client = new PrismaClient()
+  return client.$extends({
+    query: {
+      // All models, so verses loaded through include/select of other models are filled too
+      $allModels: {
+        async findUnique({ args, query }) {
+          return withBlockText(client, await query(args))
+        },
+        async findFirst({ args, query }) {
+          return withBlockText(client, await query(args))
+        },
+        async findMany({ args, query }) {
+          return withBlockText(client, await query(args))
+        }
+      }
+    }
+  })
+}
+
+type ExtendedPrismaClient = ReturnType<typeof createPrismaClient>
+
 const globalForPrisma = globalThis as unknown as {
-  prisma: PrismaClient | undefined
+  prisma: ExtendedPrismaClient | undefined
 }
 
-export const prisma = globalForPrisma.prisma ?? new PrismaClient()
+export const prisma = globalForPrisma.prisma ?? createPrismaClient()
 
 if (process.env.NODE_ENV !== 'production') globalForPrisma.prisma = prisma
@@ -4,11 +4,20 @@
 
 import { spawn } from 'child_process';
 import path from 'path';
+import readline from 'readline';
+
+// Only the end of stderr is kept for error messages; the Python logs themselves are not collected
+const STDERR_TAIL_CHARS = 16 * 1024;
 
 export interface PythonParserOptions {
   saveToDb?: boolean;
   maxChapters?: number;
   clearExisting?: boolean;
+  // Work selection, see python-parser/selection.py
+  cantos?: string | number[]; // SB cantos / CC lilas: "10-12" or [10, 11, 12]
+  chapters?: string | number[]; // "1-5"
+  verses?: string; // "2.13,2.20-25" (BG) or "10.1.1-10" (SB/CC)
+  shard?: string; // "3/8"
 }
 
 export interface PythonParseResult {
@@ -21,6 +30,7 @@ export interface PythonParseResult {
   duration: number;
   verses_count: number;
   sample_verses: Array<{
+    canto: number | null; // SB canto or CC lila
     chapter: number;
     verse_number: number;
     sanskrit: string;
@@ -35,13 +45,35 @@ export interface PythonApiResponse {
   data: PythonParseResult | null;
 }
 
+export interface FieldCompleteness {
+  sanskrit: number;
+  transliteration: number;
+  word_by_word_translation: number;
+  translation: number;
+  commentary: number;
+}
+
+export interface TitleStats {
+  text_type: 'bg' | 'sb' | 'cc' | null;
+  total_verses: number;
+  merged_verses: number;
+  completeness: FieldCompleteness;
+  by_language: Record<string, number>;
+  cantos: Array<{ canto: number; chapters: number; verses: number }>;
+  chapters: Array<{ canto: number | null; chapter: number; verses: number }>;
+}
+
 export interface DatabaseStats {
   total_verses: number;
+  merged_verses: number;
+  completeness: FieldCompleteness;
   by_text_type: {
     bg: number;
     sb: number;
     cc: number;
   };
+  by_language: Record<string, number>;
+  by_title: Record<string, TitleStats>;
   recent_parse_records: Array<{
     text_type: string;
     total_verses: number;
@@ -51,6 +83,108 @@ export interface DatabaseStats {
   }>;
 }
 
+export interface PythonParserStatus {
+  python: string;
+  database: boolean;
+  verses_table: boolean;
+}
+
+// Progress events streamed by `integration_api.py parse` with { stream: true } (NDJSON on stdout)
+interface ParseEventBase {
+  job_id: string;
+  text_type: string;
+  time: number; // unix seconds
+}
+
+export type ParseEvent =
+  | (ParseEventBase & { event: 'chapter_started'; chapter: string })
+  | (ParseEventBase & {
+      event: 'chapter_done';
+      chapter: string; // "2", "10.1"
+      verses: number;
+      failed: boolean;
+      seconds: number | null;
+      chapters_done: number;
+      chapters_total: number | null;
+      verses_total: number;
+      verses_per_second: number;
+      eta_seconds: number | null;
+    })
+  | (ParseEventBase & { event: 'verse_batch_saved'; saved: number; seconds: number; saved_total: number });
+
+// Commands understood by running parses, see python-parser/job_control.py
+export type ParseJobCommand = 'status' | 'pause' | 'resume' | 'cancel';
+
+export interface ParseJobProgress {
+  job_id: string;
+  text_type: string; // 'bg' | 'sb' | 'cc', or 'queue:<name>' for a work queue worker
+  pid: number;
+  state: 'running' | 'paused' | 'cancelling' | 'cancelled' | 'done' | 'failed';
+  chapters_total: number | null;
+  chapters_done: number;
+  chapters_failed: number;
+  current_chapters: string[]; // chapter labels being parsed: "2", "10.1"
+  verses: number;
+  verses_per_second: number;
+  elapsed_seconds: number; // pauses excluded
+  eta_seconds: number | null;
+  started_at: number; // unix seconds
+  finished_at: number | null;
+}
+
+// Progress of a parse job in the shape of the admin ParserMonitor status
+export function toParseStatus(job: ParseJobProgress) {
+  const states = {
+    running: 'running',
+    paused: 'paused',
+    cancelling: 'running',
+    cancelled: 'stopped',
+    done: 'completed',
+    failed: 'error',
+  } as const;
+
+  return {
+    id: job.job_id,
+    textType: job.text_type,
+    status: states[job.state],
+    progress: job.chapters_total ? (job.chapters_done / job.chapters_total) * 100 : 0,
+    currentChapter: job.chapters_done,
+    totalChapters: job.chapters_total ?? 0,
+    currentVerse: 0,
+    totalVerses: 0,
+    processedVerses: job.verses,
+    errors: job.chapters_failed,
+    startTime: new Date(job.started_at * 1000),
+    endTime: job.finished_at ? new Date(job.finished_at * 1000) : undefined,
+    estimatedTimeRemaining: job.eta_seconds !== null ? Math.round(job.eta_seconds) : undefined,
+    speed: Math.round(job.verses_per_second * 60), // verses per minute
+  };
+}
+
+export interface VerseSearchOptions {
+  title?: string;
+  language?: string;
+  limit?: number;
+  offset?: number;
+}
+
+export interface VerseSearchResult {
+  total: number;
+  limit: number;
+  offset: number;
+  results: Array<{
+    id: string;
+    title: string;
+    canto: number | null;
+    chapter: number;
+    verse_number: number;
+    translation: string;
+    transliteration: string | null;
+    headline: string;
+    rank: number;
+  }>;
+}
+
 export class PythonParserIntegration {
   private pythonPath: string;
   private parserPath: string;
@@ -65,7 +199,8 @@ export class PythonParserIntegration {
    */
   async parseTextType(
     textType: 'bg' | 'sb' | 'cc',
-    options: PythonParserOptions = {}
+    options: PythonParserOptions = {},
+    onEvent?: (event: ParseEvent) => void
   ): Promise<PythonApiResponse> {
     const args = [
       'integration_api.py',
@@ -74,10 +209,16 @@ export class PythonParserIntegration {
       JSON.stringify({
         save_to_db: options.saveToDb ?? true,
         max_chapters: options.maxChapters ?? null,
+        cantos: options.cantos ?? null,
+        chapters: options.chapters ?? null,
+        verses: options.verses ?? null,
+        shard: options.shard ?? null,
+        // Progress events are streamed only when someone listens to them
+        stream: Boolean(onEvent),
       }),
     ];
 
-    return this.runPythonScript(args);
+    return this.runPythonScript(args, onEvent);
   }
 
   /**
@@ -89,55 +230,96 @@ export class PythonParserIntegration {
   }
 
   /**
-   * Run a Python script and return parsed JSON response
+   * Cheap availability check: Python starts and the database is reachable
+   */
+  async getStatus(): Promise<{ success: boolean; error: string | null; data: PythonParserStatus | null }> {
+    const args = ['integration_api.py', 'status'];
+    return this.runPythonScript(args);
+  }
+
+  /**
+   * Full-text search over verse translations, commentary and transliteration
    */
-  private async runPythonScript(args: string[]): Promise<any> {
+  async searchVerses(
+    query: string,
+    options: VerseSearchOptions = {}
+  ): Promise<{ success: boolean; error: string | null; data: VerseSearchResult | null }> {
+    const args = ['integration_api.py', 'search', query, JSON.stringify(options)];
+    return this.runPythonScript(args);
+  }
+
+  /**
+   * Status, pause, resume or cancel running parses (all of them unless jobId is given).
+   * Parses stop at their next chapter boundary; chapters already running finish.
+   */
+  async controlParse(
+    command: ParseJobCommand,
+    jobId?: string
+  ): Promise<{ success: boolean; error: string | null; data: { jobs: ParseJobProgress[] } | null }> {
+    const args = ['integration_api.py', 'control', command, ...(jobId ? [jobId] : [])];
+    return this.runPythonScript(args);
+  }
+
+  /**
+   * Run a Python script and return its JSON response.
+   * stdout is read line by line: NDJSON progress events (lines with an "event" field) go to
+   * onEvent as they arrive, the last JSON line is the response. Other output is dropped.
+   */
+  private async runPythonScript(args: string[], onEvent?: (event: ParseEvent) => void): Promise<any> {
     return new Promise((resolve, reject) => {
       const pythonProcess = spawn(this.pythonPath, args, {
         cwd: this.parserPath,
         stdio: ['pipe', 'pipe', 'pipe'],
+        // DATABASE_URL etc. come from this process, Python need not load .env again
+        env: { ...process.env, PARSER_SKIP_DOTENV: '1' },
       });
 
-      let stdout = '';
-      let stderr = '';
+      let response: any = null;
+      let stderrTail = '';
 
-      pythonProcess.stdout.on('data', (data) => {
-        stdout += data.toString();
+      const lines = readline.createInterface({ input: pythonProcess.stdout, crlfDelay: Infinity });
+      lines.on('line', (line) => {
+        const trimmed = line.trim();
+        if (!trimmed.startsWith('{') || !trimmed.endsWith('}')) {
+          return;
+        }
+
+        let message: any;
+        try {
+          message = JSON.parse(trimmed);
+        } catch {
+          return;
+        }
+
+        if (message.event && message.event !== 'finished') {
+          try {
+            onEvent?.(message as ParseEvent);
+          } catch (error) {
+            console.error('Error handling parser event:', error);
+          }
+          return;
+        }
+        // The "finished" event carries the response envelope itself
+        response = message;
       });
 
       pythonProcess.stderr.on('data', (data) => {
-        stderr += data.toString();
+        stderrTail = (stderrTail + data.toString()).slice(-STDERR_TAIL_CHARS);
       });
 
       pythonProcess.on('close', (code) => {
         if (code !== 0) {
-          reject(new Error(`Python script failed with code ${code}: ${stderr}`));
+          reject(new Error(`Python script failed with code ${code}: ${stderrTail}`));
           return;
         }
 
-        try {
-          // Extract JSON from stdout (look for the last JSON object)
-          const lines = stdout.split('\n');
-          let jsonLine = '';
-          
-          // Find the last line that looks like JSON
-          for (let i = lines.length - 1; i >= 0; i--) {
-            const line = lines[i].trim();
-            if (line.startsWith('{') && line.endsWith('}')) {
-              jsonLine = line;
-              break;
-            }
-          }
-          
-          if (!jsonLine) {
-            throw new Error('No JSON found in output');
-          }
-          
-          const result = JSON.parse(jsonLine);
-          resolve(result);
-        } catch (error) {
-          reject(new Error(`Failed to parse Python script output: ${stdout}`));
+        if (!response) {
+          reject(new Error(`No JSON response from Python script: ${stderrTail}`));
+          return;
         }
+
+        const { event, ...result } = response;
+        resolve(result);
       });
 
       pythonProcess.on('error', (error) => {
@@ -151,7 +333,7 @@ export class PythonParserIntegration {
    */
   async checkAvailability(): Promise<boolean> {
     try {
-      const result = await this.getDatabaseStats();
+      const result = await this.getStatus();
       return result.success;
     } catch (error) {
       console.error('Python parser not available:', error);
@@ -169,18 +351,19 @@ export class PythonParserIntegration {
     error?: string;
   }> {
     try {
-      const available = await this.checkAvailability();
+      const status = await this.getStatus();
       
-      if (!available) {
+      if (!status.success) {
         return {
           available: false,
           capabilities: [],
-          error: 'Python parser not available',
+          error: status.error || 'Python parser not available',
         };
       }
 
       return {
         available: true,
+        version: status.data?.python,
         capabilities: [
           'parse_bg', // Bhagavad Gita
           'parse_sb', // Srimad Bhagavatam
@@ -206,9 +389,10 @@ export const pythonParser = new PythonParserIntegration();
 // Export utility functions
 export async function parseWithPython(
   textType: 'bg' | 'sb' | 'cc',
-  options: PythonParserOptions = {}
+  options: PythonParserOptions = {},
+  onEvent?: (event: ParseEvent) => void
 ): Promise<PythonApiResponse> {
-  return pythonParser.parseTextType(textType, options);
+  return pythonParser.parseTextType(textType, options, onEvent);
 }
 
 export async function getPythonParserStats(): Promise<DatabaseStats | null> {
@@ -0,0 +1,95 @@
+/**
+ * Client of the python-parser verse cache (python main.py --serve-verses).
+ * The reading room routes ask it first and fall back to Prisma when it is not
+ * configured (VERSE_CACHE_URL), does not answer in time or has no such verse.
+ */
+
+const VERSE_CACHE_URL = process.env.VERSE_CACHE_URL
+const VERSE_CACHE_TIMEOUT_MS = Number(process.env.VERSE_CACHE_TIMEOUT_MS || 300)
+
+export type VerseLookup = 'verse' | 'next' | 'previous'
+
+// Verse row as returned by the cache (merged block text already filled in)
+export interface CachedVerse {
+  id: string
+  title: string
+  chapter: number
+  verseNumber: number
+  canto: number | null
+  sanskrit: string
+  transliteration: string | null
+  wordByWordTranslation: string | null
+  translation: string
+  commentary: string | null
+  source: string
+  language: string
+  isMergedVerse: boolean
+  mergedWith: string | null
+  mergedBlockId: string | null
+  createdAt: string
+  updatedAt: string
+}
+
+export interface VerseLookupParams {
+  title: string
+  chapter: number
+  verseNumber: number
+  language?: string
+  // SB canto / CC lila: without it the cache answers 400 for those texts and the route reads the database
+  canto?: number | null
+}
+
+/**
+ * The verse, or the verse after/before it, from the cache; null when the
+ * cache cannot answer and the caller should query the database.
+ */
+export async function getCachedVerse(lookup: VerseLookup, params: VerseLookupParams): Promise<CachedVerse | null> {
+  if (!VERSE_CACHE_URL) return null
+
+  const query = new URLSearchParams({
+    title: params.title,
+    chapter: String(params.chapter),
+    verse: String(params.verseNumber),
+    language: params.language || 'ru',
+  })
+  if (params.canto != null) query.set('canto', String(params.canto))
+
+  try {
+    const response = await fetch(`${VERSE_CACHE_URL}/verses/${lookup}?${query}`, {
+      signal: AbortSignal.timeout(VERSE_CACHE_TIMEOUT_MS),
+      cache: 'no-store',
+    })
+    if (!response.ok) return null
+    const body = await response.json()
+    return body.success ? body.data : null
+  } catch (error) {
+    console.warn('Verse cache unavailable, reading from the database:', error)
+    return null
+  }
+}
+
+/**
+ * Cached verse in the response format of the reading room routes
+ */
+export function formatCachedVerse(verse: CachedVerse) {
+  return {
+    id: verse.id,
+    title: verse.title,
+    chapter: verse.chapter,
+    verse: verse.verseNumber,
+    sanskrit: verse.sanskrit,
+    transliteration: verse.transliteration || '',
+    wordByWordTranslation: verse.wordByWordTranslation || '',
+    translation: verse.translation,
+    commentary: verse.commentary || '',
+    source: verse.source || 'Database',
+    cached: true,
+    language: verse.language,
+    bookName: verse.title,
+    createdAt: verse.createdAt,
+    updatedAt: verse.updatedAt,
+    isMergedVerse: verse.isMergedVerse || false,
+    mergedWith: verse.mergedWith ? JSON.parse(verse.mergedWith) : null,
+    mergedBlockId: verse.mergedBlockId || null,
+  }
+}
@@ -0,0 +1,24 @@
+-- AddVerseSearch
+-- Full-text search vectors, filled by Postgres on every insert and update
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "searchText" tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian'::regconfig, COALESCE(translation, '')), 'A') ||
+        setweight(to_tsvector('russian'::regconfig, COALESCE(commentary, '')), 'B')
+    ) STORED;
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "searchTransliteration" tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, COALESCE(transliteration, ''))) STORED;
+
+-- Trigram indexes for misspelled and partial queries
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_search_text_idx" ON "verses" USING GIN ("searchText");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_search_transliteration_idx" ON "verses" USING GIN ("searchTransliteration");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_translation_trgm_idx" ON "verses" USING GIN ("translation" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_transliteration_trgm_idx" ON "verses" USING GIN ("transliteration" gin_trgm_ops);
@@ -0,0 +1,7 @@
+-- AddFoldedTransliteration
+-- Diacritic-free transliteration written by python-parser (transliteration.fold_transliteration).
+-- Rows written before it are folded by python main.py --migrate.
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "transliterationFolded" TEXT;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_transliteration_folded_trgm_idx" ON "verses" USING GIN ("transliterationFolded" gin_trgm_ops);
@@ -0,0 +1,22 @@
+-- AddCantoToVerseKey
+-- The unique key without canto made CC Madhya 1.1 overwrite Adi 1.1 and SB 2.1.1 overwrite SB 1.1.1
+DROP INDEX IF EXISTS "verses_title_chapter_verseNumber_language_key";
+
+-- Covered by the new unique key
+DROP INDEX IF EXISTS "verses_title_canto_chapter_idx";
+
+-- CreateIndex
+-- On Postgres 15+ the NULL canto of single-level texts (BG) counts as one key value
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::int >= 150000 THEN
+        EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS "verses_title_canto_chapter_verseNumber_language_key" '
+                'ON "verses"("title", "canto", "chapter", "verseNumber", "language") NULLS NOT DISTINCT';
+    ELSE
+        EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS "verses_title_canto_chapter_verseNumber_language_key" '
+                'ON "verses"("title", "canto", "chapter", "verseNumber", "language")';
+    END IF;
+END $$;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_title_chapter_verseNumber_language_idx" ON "verses"("title", "chapter", "verseNumber", "language");
@@ -0,0 +1,48 @@
+-- AddVerseBlocks
+-- Merged verse blocks (ТЕКСТЫ 16-18): the text shared by the verses of a block, stored once
+CREATE TABLE IF NOT EXISTS "verse_blocks" (
+    "id" TEXT NOT NULL,
+    "title" TEXT NOT NULL,
+    "canto" INTEGER,
+    "chapter" INTEGER NOT NULL,
+    "verseNumbers" INTEGER[],
+    "sanskrit" TEXT NOT NULL,
+    "transliteration" TEXT,
+    "wordByWordTranslation" TEXT,
+    "translation" TEXT NOT NULL,
+    "commentary" TEXT,
+    "source" TEXT NOT NULL DEFAULT 'Vedabase',
+    "language" TEXT NOT NULL DEFAULT 'ru',
+    "transliterationFolded" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "verse_blocks_pkey" PRIMARY KEY ("id")
+);
+
+-- Full-text search vectors, as on verses
+ALTER TABLE "verse_blocks" ADD COLUMN IF NOT EXISTS "searchText" tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian'::regconfig, COALESCE(translation, '')), 'A') ||
+        setweight(to_tsvector('russian'::regconfig, COALESCE(commentary, '')), 'B')
+    ) STORED;
+ALTER TABLE "verse_blocks" ADD COLUMN IF NOT EXISTS "searchTransliteration" tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, COALESCE(transliteration, ''))) STORED;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_mergedBlockId_idx" ON "verses"("mergedBlockId");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verse_blocks_search_text_idx" ON "verse_blocks" USING GIN ("searchText");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verse_blocks_search_transliteration_idx" ON "verse_blocks" USING GIN ("searchTransliteration");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verse_blocks_translation_trgm_idx" ON "verse_blocks" USING GIN ("translation" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verse_blocks_transliteration_trgm_idx" ON "verse_blocks" USING GIN ("transliteration" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verse_blocks_transliteration_folded_trgm_idx" ON "verse_blocks" USING GIN ("transliterationFolded" gin_trgm_ops);
@@ -0,0 +1,7 @@
+-- AddVerseQuality
+-- Parse quality of each verse, scored per chapter by python-parser (quality.py)
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "qualityScore" DOUBLE PRECISION;
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "quality" JSONB;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "verses_qualityScore_idx" ON "verses"("qualityScore");
@@ -0,0 +1,36 @@
+-- AddParseQueue
+-- Chapter jobs of the python-parser work queue (work_queue.py)
+CREATE TABLE IF NOT EXISTS "parse_jobs" (
+    "id" BIGSERIAL NOT NULL,
+    "queue" TEXT NOT NULL,
+    "textType" TEXT NOT NULL,
+    "canto" INTEGER,
+    "chapter" INTEGER NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'pending',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "maxAttempts" INTEGER NOT NULL,
+    "worker" TEXT,
+    "availableAt" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "leaseUntil" TIMESTAMPTZ,
+    "heartbeatAt" TIMESTAMPTZ,
+    "lastError" TEXT,
+    "verses" INTEGER,
+    "createdAt" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "parse_jobs_pkey" PRIMARY KEY ("id")
+);
+
+-- Politeness budget of the workers: next free request slot per site
+CREATE TABLE IF NOT EXISTS "crawl_budget" (
+    "site" TEXT NOT NULL,
+    "nextSlotAt" TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT "crawl_budget_pkey" PRIMARY KEY ("site")
+);
+
+-- One job per chapter and queue; BG chapters have no canto (expression index, not in schema.prisma)
+CREATE UNIQUE INDEX IF NOT EXISTS "parse_jobs_queue_chapter_key" ON "parse_jobs"("queue", "textType", COALESCE("canto", 0), "chapter");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "parse_jobs_queue_status_idx" ON "parse_jobs"("queue", "status", "availableAt");
@@ -0,0 +1,4 @@
+-- AddContentHash
+-- Hash of the values python-parser last wrote to a row; unchanged rows are not rewritten
+ALTER TABLE "verses" ADD COLUMN IF NOT EXISTS "contentHash" TEXT;
+ALTER TABLE "verse_blocks" ADD COLUMN IF NOT EXISTS "contentHash" TEXT;
@@ -0,0 +1,19 @@
+-- AddVersesResolvedView
+-- Verse rows of merged blocks are written without text (it is stored once in verse_blocks);
+-- the view resolves it for raw SQL readers, as python-parser's VERSE_BLOCK_JOIN does
+CREATE OR REPLACE VIEW "verses_resolved" AS
+SELECT "id", "title", "chapter", "verseNumber", "canto",
+       COALESCE(NULLIF("sanskrit", ''), block_sanskrit) AS "sanskrit",
+       COALESCE("transliteration", block_transliteration) AS "transliteration",
+       COALESCE("wordByWordTranslation", block_word_by_word) AS "wordByWordTranslation",
+       COALESCE(NULLIF("translation", ''), block_translation) AS "translation",
+       COALESCE("commentary", block_commentary) AS "commentary",
+       "source", "language", "isMergedVerse", "mergedWith", "mergedBlockId", "qualityScore", "createdAt", "updatedAt"
+FROM "verses"
+LEFT JOIN LATERAL (
+    SELECT "sanskrit" AS block_sanskrit, "transliteration" AS block_transliteration,
+           "wordByWordTranslation" AS block_word_by_word, "translation" AS block_translation,
+           "commentary" AS block_commentary
+    FROM "verse_blocks"
+    WHERE "verse_blocks"."id" = "verses"."mergedBlockId"
+) block ON true;
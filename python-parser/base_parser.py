@@ -1,28 +1,88 @@
 """
 Base parser class for vedabase.io
+
+Holds the shared advanced-view extraction engine. Text parsers (BG, SB, ...)
+only describe how their chapters are addressed and how chapter URLs are built.
 """
 import asyncio
 import aiohttp
 import time
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable, NamedTuple, Tuple
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import re
 
-from models import ParsedVerse, ParseResult, ChapterInfo
+from models import VerseRecord, MergedBlock, ParseResult, ChapterInfo
+from records import ChapterAddress
+from selection import WorkSelection
 from config import PARSER_CONFIG, VEDABASE_URLS
+from metrics import crawl_metrics
+from extraction_profiler import extraction_profiler
+from logging_setup import get_logger
+from page_classifier import classify_page
+from job_control import JobCancelled
+from quality import score_chapter, chapter_summary, scan_verse, GOOD_POINTS, MAX_POINTS
+
+
+class VerseSegment(NamedTuple):
+    """Verse element of a chapter page and its stripped text, extracted once"""
+    element: Tag
+    text: str
+
+
+# Verse header of the advanced view: "ТЕКСТ 5" or merged "ТЕКСТЫ 16-18" (groups: first and last verse)
+VERSE_HEADER_PATTERN = re.compile(r'ТЕКСТ(?:Ы)?\s*(\d+)(?:\s*[-–]\s*(\d+))?')
+
+
+@lru_cache(maxsize=1024)
+def header_verse_numbers(header: str) -> Tuple[int, ...]:
+    """Verse numbers of a verse header: "ТЕКСТ 5" -> (5,), "ТЕКСТЫ 16-18" -> (16, 17, 18)
+    
+    Headers repeat across chapters and texts, so the parsed ranges are cached.
+    A reversed range is taken as its first verse. Empty if header is not a verse header.
+    """
+    match = VERSE_HEADER_PATTERN.match(header)
+    if not match:
+        return ()
+    first = int(match.group(1))
+    last = int(match.group(2)) if match.group(2) else first
+    return tuple(range(first, max(last, first) + 1))
+
+
+DEVANAGARI_PATTERN = re.compile(r'[\u0900-\u097F]')
+CYRILLIC_PATTERN = re.compile(r'[а-яё]', re.IGNORECASE)
 
 
 class BaseVedabaseParser(ABC):
     """Base class for all vedabase.io parsers"""
     
+    # Selectors tried in order to locate verse elements on an advanced-view page
+    VERSE_SELECTORS = [
+        '.av-verses',  # Advanced view verse containers
+        '.verse',
+        '.shloka',
+        '[class*="verse"]',
+        '[class*="shloka"]'
+    ]
+    
     def __init__(self, text_type: str, config: Dict[str, Any] = None):
         self.text_type = text_type
         self.config = {**PARSER_CONFIG, **(config or {})}
         self.session: Optional[aiohttp.ClientSession] = None
         self.logger = self._setup_logger()
+        # Stage timings and counters, shared by all parsers of the process by default
+        self.metrics = crawl_metrics
+        # Attempts, hits and time of each extraction strategy per chapter
+        self.profiler = extraction_profiler
+        # Shared request budget (work_queue.RequestBudget) awaited before every page request
+        self.request_budget = None
+        # Controllable job (job_control.ParseJob): pause point before every chapter and progress
+        self.job = None
         
         if text_type not in VEDABASE_URLS:
             raise ValueError(f"Unsupported text type: {text_type}")
@@ -33,19 +93,8 @@ class BaseVedabaseParser(ABC):
         self.total_chapters = self.text_info['chapters']
     
     def _setup_logger(self) -> logging.Logger:
-        """Setup logger for the parser"""
-        logger = logging.getLogger(f"{self.__class__.__name__}_{self.text_type}")
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
+        """Logger for the parser; records go through the queued handler of logging_setup"""
+        return get_logger(f"{self.__class__.__name__}_{self.text_type}")
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -85,20 +134,28 @@ class BaseVedabaseParser(ABC):
         
         for attempt in range(retries + 1):
             try:
-                self.logger.info(f"Fetching: {url} (attempt {attempt + 1})")
+                if self.request_budget:
+                    await self.request_budget.acquire()
+                self.logger.debug(f"Fetching: {url} (attempt {attempt + 1})")
                 
+                start = time.perf_counter()
                 async with self.session.get(url) as response:
                     if response.status == 200:
                         content = await response.text()
-                        self.logger.info(f"Successfully fetched {len(content)} characters")
+                        self.metrics.observe('parser_fetch_seconds', time.perf_counter() - start, text=self.text_type)
+                        self.metrics.observe('parser_fetch_bytes', len(content.encode('utf-8')), text=self.text_type)
+                        self.logger.debug(f"Successfully fetched {len(content)} characters")
                         return content
                     else:
-                        self.logger.warning(f"HTTP {response.status} for {url}")
-                        
+                        self.metrics.increment('parser_fetch_errors_total', text=self.text_type, reason=f"http_{response.status}")
+                        self.logger.warning(f"HTTP {response.status} for {url}", extra={'url': url, 'status': response.status})
+            
             except Exception as e:
-                self.logger.error(f"Error fetching {url}: {e}")
-                
+                self.metrics.increment('parser_fetch_errors_total', text=self.text_type, reason=type(e).__name__)
+                self.logger.error(f"Error fetching {url}: {e}", extra={'url': url, 'attempt': attempt + 1})
+            
             if attempt < retries:
+                self.metrics.increment('parser_fetch_retries_total', text=self.text_type)
                 wait_time = self.config['delay_between_requests'] * (2 ** attempt)
                 self.logger.info(f"Waiting {wait_time}s before retry...")
                 await asyncio.sleep(wait_time)
@@ -150,27 +207,16 @@ class BaseVedabaseParser(ABC):
         return None
     
     def _extract_verse_range(self, text: str) -> Optional[List[int]]:
-        """Extract verse range from text like 'ТЕКСТЫ 16-18'"""
-        # Look for patterns like "ТЕКСТЫ 16-18", "ТЕКСТЫ 21-22", etc.
-        range_patterns = [
-            r'ТЕКСТЫ?\s*(\d+)-(\d+)',
-            r'стихи?\s*(\d+)-(\d+)',
-            r'verses?\s*(\d+)-(\d+)',
-            r'(\d+)-(\d+)'
-        ]
-        
-        for pattern in range_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    start_num = int(match.group(1))
-                    end_num = int(match.group(2))
-                    # Return list of all verse numbers in the range
-                    return list(range(start_num, end_num + 1))
-                except ValueError:
-                    continue
+        """Verse range of the first verse header in text, like 'ТЕКСТЫ 16-18'
         
-        return None
+        Only the header is read: hyphenated numbers elsewhere in the verse
+        (references, dates in the commentary) are not verse ranges.
+        """
+        match = VERSE_HEADER_PATTERN.search(text)
+        if not match:
+            return None
+        verse_numbers = header_verse_numbers(match.group())
+        return list(verse_numbers) if len(verse_numbers) > 1 else None
     
     def _extract_verse_numbers_from_text(self, text: str) -> List[int]:
         """Extract all verse numbers from text, handling both single verses and ranges"""
@@ -187,17 +233,105 @@ class BaseVedabaseParser(ABC):
         return []
     
     @abstractmethod
-    async def parse_chapter(self, chapter_number: int) -> List[ParsedVerse]:
-        """Parse a specific chapter - must be implemented by subclasses"""
+    async def parse_chapter(self, *address) -> List[VerseRecord]:
+        """Parse a specific chapter - public signature is defined by subclasses"""
         pass
     
-    @abstractmethod
-    def _extract_verses_from_html(self, soup: BeautifulSoup, chapter_number: int) -> List[ParsedVerse]:
-        """Extract verses from HTML - must be implemented by subclasses"""
-        pass
+    # --- Addressing and URL scheme (overridden by text parsers) ---
+    
+    def _chapter_addresses(self) -> Iterable[ChapterAddress]:
+        """All chapter addresses of the text, in reading order"""
+        return [ChapterAddress(chapter) for chapter in range(1, self.total_chapters + 1)]
+    
+    def _chapter_path(self, address: ChapterAddress) -> str:
+        """Path of a chapter relative to base_url: "2/" or "1/2/" """
+        if address.canto is None:
+            return f"{address.chapter}/"
+        return f"{address.canto}/{address.chapter}/"
+    
+    def _chapter_url(self, address: ChapterAddress) -> str:
+        """Advanced view URL of a chapter (contains Sanskrit, synonyms and purports)"""
+        return f"{self.base_url}{self._chapter_path(address)}advanced-view"
+    
+    def _verse_url(self, address: ChapterAddress, verse_number: int) -> str:
+        """URL of a verse anchor on the chapter's advanced view page"""
+        return f"{self._chapter_url(address)}#{verse_number}"
+    
+    def _chapter_log_name(self, address: ChapterAddress) -> str:
+        """Human readable chapter name for logs: "BG 2", "SB 1.2" """
+        return f"{self.text_type.upper()} {address.label}"
     
-    async def parse_all_chapters(self) -> ParseResult:
-        """Parse all chapters of the text"""
+    # --- Shared extraction engine ---
+    
+    def _page_cache_path(self, address: ChapterAddress) -> Optional[Path]:
+        """Location of the cached chapter page, None when the page cache is disabled"""
+        cache_dir = self.config.get('page_cache_dir')
+        if not cache_dir:
+            return None
+        return Path(cache_dir) / self.text_type / f"{address.label}.html"
+    
+    async def _fetch_chapter_page(self, address: ChapterAddress) -> Optional[str]:
+        """Fetch a chapter page, reading and filling the page cache when it is enabled"""
+        cache_path = self._page_cache_path(address)
+        if cache_path and cache_path.exists():
+            self.metrics.increment('parser_page_cache_hits_total', text=self.text_type)
+            return cache_path.read_text(encoding='utf-8')
+        if cache_path:
+            self.metrics.increment('parser_page_cache_misses_total', text=self.text_type)
+        
+        html = await self._fetch_page(self._chapter_url(address))
+        if html and cache_path:
+            # Written aside and renamed, so concurrent workers never read a partial page
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = cache_path.with_name(f".{cache_path.name}.{os.getpid()}")
+            partial.write_text(html, encoding='utf-8')
+            os.replace(partial, cache_path)
+        return html
+    
+    async def parse_address(self, address: ChapterAddress) -> List[VerseRecord]:
+        """Fetch and parse the chapter page at the given address"""
+        with self.metrics.timer('parser_chapter_seconds', text=self.text_type):
+            html = await self._fetch_chapter_page(address)
+            chapter_name = self._chapter_log_name(address)
+            
+            if not html:
+                self.logger.error(f"Failed to fetch {chapter_name}")
+                self.metrics.increment('parser_chapters_total', text=self.text_type, status='fetch_failed')
+                return []
+            
+            # Quick check if page contains verses before full parsing
+            verdict = classify_page(html)
+            if not verdict.has_verses:
+                self.logger.info(f"{chapter_name} - No verses found on page ({verdict.reason}), skipping")
+                self.metrics.increment('parser_chapters_total', text=self.text_type, status='no_verses')
+                return []
+            
+            with self.metrics.timer('parser_parse_seconds', text=self.text_type):
+                soup = self._parse_html(html)
+            verses = self._extract_verses_from_html(soup, address)
+            
+            self.metrics.increment('parser_chapters_total', text=self.text_type, status='ok' if verses else 'empty')
+            self.metrics.increment('parser_verses_total', len(verses), text=self.text_type)
+            return verses
+    
+    async def parse_selection(self, selection: WorkSelection) -> ParseResult:
+        """Parse the chapters of a work selection, keeping only its verses"""
+        all_addresses = list(self._chapter_addresses())
+        for address in selection.unknown_verse_chapters(all_addresses):
+            self.logger.warning(f"Verse list refers to chapter {address.label}, which {self.text_name} does not have")
+        
+        addresses = selection.addresses(all_addresses)
+        self.logger.info(f"Selected {len(addresses)} of {len(all_addresses)} chapters: {selection.describe()}")
+        result = await self.parse_all_chapters(addresses)
+        
+        if selection.verses is not None:
+            result.verses = [verse for verse in result.verses if selection.keeps(verse)]
+            result.total_verses = result.successful_verses = len(result.verses)
+            result.success = bool(result.verses)
+        return result
+    
+    async def parse_all_chapters(self, addresses: Iterable[ChapterAddress] = None) -> ParseResult:
+        """Parse all chapters of the text (or only the given chapter addresses)"""
         start_time = time.time()
         result = ParseResult(
             text_type=self.text_type,
@@ -205,38 +339,56 @@ class BaseVedabaseParser(ABC):
             errors=[]
         )
         
-        self.logger.info(f"Starting to parse {self.text_name} ({self.total_chapters} chapters)")
+        addresses = list(addresses if addresses is not None else self._chapter_addresses())
+        self.logger.info(f"Starting to parse {self.text_name} ({len(addresses)} chapters)")
+        if self.job and self.job.chapters_total is None:
+            # A job over several texts already counts the chapters of all of them
+            self.job.chapters_total = len(addresses)
+        skipped = 0
         
         try:
             # Parse chapters with limited concurrency
             semaphore = asyncio.Semaphore(self.config['max_concurrency'])
             
-            async def parse_chapter_with_semaphore(chapter_num: int):
+            async def parse_chapter_with_semaphore(address: ChapterAddress):
                 async with semaphore:
+                    chapter_name = self._chapter_log_name(address)
+                    if self.job:
+                        try:
+                            await self.job.checkpoint()
+                        except JobCancelled:
+                            # Cancelled before the chapter started: neither parsed nor failed
+                            return None
+                        self.job.chapter_started(address.label)
                     try:
-                        verses = await self.parse_chapter(chapter_num)
-                        self.logger.info(f"Chapter {chapter_num}: {len(verses)} verses")
-                        return verses, []
+                        verses = await self.parse_address(address)
+                        self.logger.info(
+                            f"{chapter_name}: {len(verses)} verses",
+                            extra={'text': self.text_type, 'chapter': address.label, 'verses': len(verses)}
+                        )
+                        outcome = verses, []
                     except Exception as e:
-                        error_msg = f"Error parsing chapter {chapter_num}: {e}"
+                        error_msg = f"Error parsing {chapter_name}: {e}"
                         self.logger.error(error_msg)
-                        return [], [error_msg]
+                        outcome = [], [error_msg]
+                    if self.job:
+                        self.job.chapter_finished(address.label, len(outcome[0]), failed=not outcome[0])
+                    return outcome
             
             # Create tasks for all chapters
-            tasks = [
-                parse_chapter_with_semaphore(chapter_num)
-                for chapter_num in range(1, self.total_chapters + 1)
-            ]
+            tasks = [parse_chapter_with_semaphore(address) for address in addresses]
             
             # Execute tasks
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results
-            for chapter_num, result_data in enumerate(results, 1):
+            for address, result_data in zip(addresses, results):
                 if isinstance(result_data, Exception):
-                    error_msg = f"Exception in chapter {chapter_num}: {result_data}"
+                    error_msg = f"Exception in {self._chapter_log_name(address)}: {result_data}"
                     result.errors.append(error_msg)
                     result.failed_verses += 1
+                elif result_data is None:
+                    skipped += 1
                 else:
                     verses, errors = result_data
                     result.verses.extend(verses)
@@ -248,7 +400,9 @@ class BaseVedabaseParser(ABC):
             
             result.total_verses = len(result.verses)
             result.success = len(result.verses) > 0
-            
+            if skipped:
+                result.errors.append(f"Cancelled: {skipped} of {len(addresses)} chapters not parsed")
+        
         except Exception as e:
             error_msg = f"Fatal error during parsing: {e}"
             self.logger.error(error_msg)
@@ -265,6 +419,849 @@ class BaseVedabaseParser(ABC):
         
         return result
     
+    def _page_has_verses(self, html: str) -> bool:
+        """Quick check if page contains verses without full parsing (see page_classifier)"""
+        return classify_page(html).has_verses
+    
+    async def _chapter_exists(self, address: ChapterAddress) -> bool:
+        """Quick check if chapter exists without full parsing"""
+        try:
+            html = await self._fetch_chapter_page(address)
+            
+            if not html:
+                return False
+            
+            return self._page_has_verses(html)
+        
+        except Exception as e:
+            self.logger.error(f"Error checking if chapter exists: {e}")
+            return False
+    
+    def _extract_verses_from_html(self, soup: BeautifulSoup, address: ChapterAddress) -> List[VerseRecord]:
+        """Extract verses from advanced view HTML with quality validation"""
+        verses = []
+        chapter_name = self._chapter_log_name(address)
+        
+        try:
+            # Look for verse containers in advanced view
+            segments = []
+            for selector in self.VERSE_SELECTORS:
+                elements = soup.select(selector)
+                if elements:
+                    # If we found av-verses container, look for individual verses inside it
+                    if selector == '.av-verses':
+                        segments = self._find_individual_verses_in_container(elements[0])
+                        self.logger.debug(f"Found {len(segments)} individual verses in av-verses container")
+                    else:
+                        segments = [VerseSegment(element, element.get_text().strip()) for element in elements]
+                        self.logger.debug(f"Found {len(elements)} elements with selector: {selector}")
+                    break
+            
+            # If no specific verse elements found, look for divs with Sanskrit content
+            if not segments:
+                self.logger.info("No specific verse elements found, searching for Sanskrit content")
+                all_divs = soup.find_all('div')
+                segments = [
+                    VerseSegment(div, div.get_text().strip())
+                    for div in all_divs if self._contains_sanskrit_content(div)
+                ]
+                self.logger.info(f"Found {len(segments)} divs with Sanskrit content")
+            
+            # Extract verses with quality validation and retry logic
+            for i, segment in enumerate(segments):
+                extracted_verses = self._extract_verse_with_validation(segment.element, address, i + 1, segment.text)
+                if extracted_verses:
+                    verses.extend(extracted_verses)
+            
+            # If still no verses found, try alternative approach
+            if not verses:
+                self.logger.info("Trying alternative verse extraction method")
+                with self.profiler.attempt(self.text_type, address.label, 'page_alternative') as attempt:
+                    verses = self._extract_verses_alternative(soup, address)
+                    attempt.hit = bool(verses)
+                self.profiler.produced(self.text_type, address.label, 'page_alternative', len(verses))
+            
+            # Quality vectors of the whole chapter, persisted with the verses
+            verses = self._score_chapter_quality(verses, address)
+        
+        except Exception as e:
+            self.logger.error(f"Error extracting verses from {chapter_name}: {e}")
+        
+        self.logger.debug(f"Extracted {len(verses)} verses from {chapter_name}")
+        return verses
+    
+    def _extract_verse_with_validation(self, element: Tag, address: ChapterAddress, expected_verse_number: int,
+                                       text: str = None) -> List[VerseRecord]:
+        """Extract verse(s) with quality validation and retry logic, handling merged verse blocks
+        
+        text is the stripped text of the element when the caller already has it.
+        """
+        if text is None:
+            text = element.get_text().strip()
+        
+        # Check if this element contains merged verses (like "ТЕКСТЫ 16-18")
+        verse_numbers = self._extract_verse_numbers_from_text(text)
+        
+        if len(verse_numbers) > 1:
+            # This is a merged verse block - extract multiple verses
+            self.logger.debug(f"Found merged verse block: {verse_numbers}")
+            with self.profiler.attempt(self.text_type, address.label, 'merged_block') as attempt:
+                verses = self._extract_merged_verses_from_element(element, address, verse_numbers, text)
+                attempt.hit = bool(verses)
+            self.profiler.produced(self.text_type, address.label, 'merged_block', len(verses))
+            return verses
+        else:
+            # Single verse - use original logic
+            with self.profiler.attempt(self.text_type, address.label, 'advanced_element') as attempt:
+                verse = self._with_quality_scan(self._extract_verse_from_advanced_element(element, address, text))
+                attempt.hit = self._validate_verse_quality(verse)
+            
+            if attempt.hit:
+                self.logger.debug(f"✅ Verse {address.label}.{verse.verse_number} extracted successfully")
+                self.profiler.produced(self.text_type, address.label, 'advanced_element')
+                return [verse]
+            
+            # If quality is poor, try alternative methods
+            self.logger.warning(f"⚠️ Verse {address.label}.{expected_verse_number} quality issues, trying alternative methods")
+            
+            # Try alternative extraction methods (returns only validated verses)
+            alternative_verse = self._extract_verse_alternative_methods(element, address, expected_verse_number)
+            
+            if alternative_verse:
+                self.logger.debug(f"✅ Verse {address.label}.{alternative_verse.verse_number} extracted with alternative method")
+                return [alternative_verse]
+            
+            # If still poor quality, log the issue but return what we have
+            if verse:
+                self.logger.warning(f"⚠️ Verse {address.label}.{verse.verse_number} has quality issues but will be included")
+                self.profiler.produced(self.text_type, address.label, 'advanced_element')
+                return [verse]
+            
+            self.logger.error(f"❌ Failed to extract verse {address.label}.{expected_verse_number}")
+            return []
+    
+    def _extract_merged_verses_from_element(self, element: Tag, address: ChapterAddress, verse_numbers: List[int],
+                                            text: str = None) -> List[VerseRecord]:
+        """Extract multiple verses from a merged verse block element
+        
+        The element is parsed and validated once for the whole block; its verses
+        are copies of one record that differ only in verse number and URL.
+        """
+        if text is None:
+            text = element.get_text().strip()
+        
+        # The shared text is extracted once and kept in the block; the verses of the
+        # block reference its strings, and the writer stores the text only once.
+        # The id is derived from the address, so re-parsing updates the same block row.
+        block_prefix = address.label.replace('.', '_')
+        block = MergedBlock(
+            id=f"merged_{self.text_type}_{block_prefix}_{verse_numbers[0]}_{verse_numbers[-1]}",
+            title=self.text_name,
+            chapter=address.chapter,
+            canto=address.canto,
+            verse_numbers=tuple(verse_numbers),
+            sanskrit=self._extract_sanskrit_from_advanced_element(element, text),
+            translation=self._extract_translation_from_advanced_element(element, text),
+            transliteration=self._extract_transliteration_from_advanced_element(element, text),
+            word_by_word_translation=self._extract_word_by_word_translation_from_advanced_element(element, text),
+            commentary=self._extract_commentary_from_advanced_element(element)
+        )
+        self.metrics.increment('parser_merged_blocks_total', text=self.text_type)
+        metadata = {
+            'element_tag': element.name,
+            'element_class': element.get('class', []),
+            'raw_text_length': len(text),
+            'extraction_method': 'merged_verse_block'
+        }
+        
+        first = self._with_quality_scan(VerseRecord(
+            title=block.title,
+            chapter=block.chapter,
+            verse_number=verse_numbers[0],
+            canto=block.canto,
+            sanskrit=block.sanskrit,
+            transliteration=block.transliteration,
+            word_by_word_translation=block.word_by_word_translation,
+            translation=block.translation,
+            commentary=block.commentary,
+            source=block.source,
+            language=block.language,
+            url=self._verse_url(address, verse_numbers[0]),
+            metadata=metadata,
+            block=block
+        ))
+        
+        # The verses share the block's text, so its quality is that of every verse
+        if self._validate_verse_quality(first):
+            self.logger.debug(f"✅ Merged verses {address.label}.{block.verse_range} extracted successfully")
+        else:
+            self.logger.warning(f"⚠️ Merged verses {address.label}.{block.verse_range} have quality issues but will be included")
+        
+        return [first] + [
+            first._replace(verse_number=verse_number, url=self._verse_url(address, verse_number), metadata=dict(metadata))
+            for verse_number in verse_numbers[1:]
+        ]
+    
+    def _verse_label(self, verse: VerseRecord) -> str:
+        """Dotted verse reference for logs: "2.13" or "1.2.13" """
+        return f"{ChapterAddress(verse.chapter, verse.canto).label}.{verse.verse_number}"
+    
+    def _with_quality_scan(self, verse: Optional[VerseRecord]) -> Optional[VerseRecord]:
+        """The verse with its quality scan, done once and reused by the chapter scoring"""
+        if verse is None or verse.scan is not None:
+            return verse
+        return verse._replace(scan=scan_verse(verse))
+    
+    def _validate_verse_quality(self, verse: VerseRecord) -> bool:
+        """Validate the quality of a parsed verse: usable Sanskrit and translation (see quality.scan_verse)"""
+        if not verse:
+            return False
+        
+        points = (verse.scan or scan_verse(verse)).points
+        if points < GOOD_POINTS:
+            self.logger.debug(f"Verse {self._verse_label(verse)}: Quality score {points}/{MAX_POINTS}")
+        return points >= GOOD_POINTS
+    
+    def _extract_verse_alternative_methods(self, element: Tag, address: ChapterAddress, expected_verse_number: int) -> VerseRecord:
+        """Try alternative methods to extract verse data, returns the first verse that passes validation"""
+        try:
+            text = element.get_text().strip()
+            
+            methods = [
+                # Method 1: Direct text parsing
+                ('text_direct', lambda: self._extract_verse_from_text_direct(text, address, expected_verse_number)),
+                # Method 2: Look for specific patterns in parent/sibling elements
+                ('context', lambda: self._extract_verse_from_context(element, address, expected_verse_number)),
+                # Method 3: Manual reconstruction from available data
+                ('reconstruct', lambda: self._reconstruct_verse_from_fragments(element, address, expected_verse_number)),
+            ]
+            
+            for strategy, extract in methods:
+                with self.profiler.attempt(self.text_type, address.label, strategy) as attempt:
+                    verse = self._with_quality_scan(extract())
+                    attempt.hit = self._validate_verse_quality(verse)
+                if attempt.hit:
+                    self.profiler.produced(self.text_type, address.label, strategy)
+                    return verse
+        
+        except Exception as e:
+            self.logger.error(f"Error in alternative extraction methods: {e}")
+        
+        return None
+    
+    def _extract_verse_from_text_direct(self, text: str, address: ChapterAddress, expected_verse_number: int) -> VerseRecord:
+        """Extract verse data directly from text using patterns"""
+        try:
+            # Extract Sanskrit text (Devanagari)
+            sanskrit_match = re.search(r'([\u0900-\u097F]+(?:\s+[\u0900-\u097F]+)*)', text)
+            sanskrit = sanskrit_match.group(1) if sanskrit_match else None
+            
+            # Extract transliteration
+            transliteration = self._extract_transliteration_from_text(text)
+            
+            # Extract translation (Russian text)
+            translation = self._extract_translation_from_text(text, sanskrit)
+            
+            # Extract word-by-word translation
+            word_by_word = self._extract_word_by_word_from_text(text)
+            
+            if sanskrit and translation:
+                return VerseRecord(
+                    title=self.text_name,
+                    chapter=address.chapter,
+                    verse_number=expected_verse_number,
+                    canto=address.canto,
+                    sanskrit=sanskrit,
+                    transliteration=transliteration,
+                    word_by_word_translation=word_by_word,
+                    translation=translation,
+                    source="Vedabase",
+                    language="ru",
+                    url=self._verse_url(address, expected_verse_number),
+                    metadata={'extraction_method': 'direct_text_parsing'}
+                )
+        except Exception as e:
+            self.logger.error(f"Error in direct text extraction: {e}")
+        
+        return None
+    
+    def _extract_verse_from_context(self, element: Tag, address: ChapterAddress, expected_verse_number: int) -> VerseRecord:
+        """Extract verse data from element context (parent/sibling elements)"""
+        try:
+            # Look in parent elements
+            parent = element.parent
+            while parent and parent.name != 'body':
+                text = parent.get_text().strip()
+                if len(text) > 100:  # Reasonable size for a verse
+                    verse = self._with_quality_scan(self._extract_verse_from_text_direct(text, address, expected_verse_number))
+                    if self._validate_verse_quality(verse):
+                        verse.metadata['extraction_method'] = 'parent_context'
+                        return verse
+                parent = parent.parent
+            
+            # Look in sibling elements
+            if element.parent:
+                siblings = element.parent.find_all(['div', 'span', 'p'])
+                for sibling in siblings:
+                    if sibling != element:
+                        text = sibling.get_text().strip()
+                        if len(text) > 100:
+                            verse = self._with_quality_scan(self._extract_verse_from_text_direct(text, address, expected_verse_number))
+                            if self._validate_verse_quality(verse):
+                                verse.metadata['extraction_method'] = 'sibling_context'
+                                return verse
+        except Exception as e:
+            self.logger.error(f"Error in context extraction: {e}")
+        
+        return None
+    
+    def _reconstruct_verse_from_fragments(self, element: Tag, address: ChapterAddress, expected_verse_number: int) -> VerseRecord:
+        """Reconstruct verse from fragments found in the element"""
+        try:
+            # Get all text from the element and its children
+            all_text = element.get_text()
+            
+            # Try to find Sanskrit text
+            sanskrit = self._extract_sanskrit_text(all_text)
+            
+            # Try to find transliteration
+            transliteration = self._extract_transliteration_from_text(all_text)
+            
+            # Try to find translation
+            translation = self._extract_translation_from_text(all_text, sanskrit)
+            
+            # Try to find word-by-word translation
+            word_by_word = self._extract_word_by_word_from_text(all_text)
+            
+            if sanskrit and translation:
+                return VerseRecord(
+                    title=self.text_name,
+                    chapter=address.chapter,
+                    verse_number=expected_verse_number,
+                    canto=address.canto,
+                    sanskrit=sanskrit,
+                    transliteration=transliteration,
+                    word_by_word_translation=word_by_word,
+                    translation=translation,
+                    source="Vedabase",
+                    language="ru",
+                    url=self._verse_url(address, expected_verse_number),
+                    metadata={'extraction_method': 'fragment_reconstruction'}
+                )
+        except Exception as e:
+            self.logger.error(f"Error in fragment reconstruction: {e}")
+        
+        return None
+    
+    def _extract_transliteration_from_text(self, text: str) -> str:
+        """Extract transliteration from text using improved patterns"""
+        # Look for transliteration after "Текст стиха"
+        text_after_verse = re.split(r'Текст стиха', text, flags=re.IGNORECASE)
+        if len(text_after_verse) > 1:
+            potential_transliteration = text_after_verse[1]
+            
+            # Extract transliteration pattern
+            transliteration_match = re.search(r'^([а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\s\-\u0300-\u036F]+)', potential_transliteration, re.IGNORECASE)
+            if transliteration_match:
+                candidate = transliteration_match.group(1).strip()
+                
+                # Check if it looks like Sanskrit transliteration
+                has_diacritics = bool(re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F]', candidate, re.IGNORECASE))
+                
+                if len(candidate) > 10 and has_diacritics:
+                    # Stop at common markers
+                    end_markers = ['Пословный перевод', 'Перевод', 'Комментарий']
+                    for marker in end_markers:
+                        if marker in candidate:
+                            candidate = candidate.split(marker)[0].strip()
+                            break
+                    return candidate
+        
+        # Alternative approach: look for transliteration patterns
+        transliteration_patterns = [
+            r'атра[^П]*',  # For verse 1.4 and similar patterns
+            r'[а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]+(?:\s+[а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]+)*[^а-яёА-ЯЁ]',  # General pattern
+        ]
+        
+        for pattern in transliteration_patterns:
+            transliteration_match = re.search(pattern, text, re.IGNORECASE)
+            if transliteration_match:
+                candidate = transliteration_match.group(0).strip()
+                
+                # Check if it looks like Sanskrit transliteration
+                has_diacritics = bool(re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F]', candidate, re.IGNORECASE))
+                has_sanskrit_patterns = bool(re.search(r'[а-яё]+[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F][а-яё]*', candidate, re.IGNORECASE))
+                
+                if (has_diacritics or has_sanskrit_patterns) and len(candidate) > 15:
+                    # Stop at common markers
+                    end_markers = ['Пословный перевод', 'Перевод', 'Комментарий']
+                    for marker in end_markers:
+                        if marker in candidate:
+                            candidate = candidate.split(marker)[0].strip()
+                            break
+                    return candidate
+        
+        return None
+    
+    def _extract_translation_from_text(self, text: str, sanskrit: str = None) -> str:
+        """Extract translation from text"""
+        # Remove Sanskrit text if provided
+        if sanskrit:
+            text = text.replace(sanskrit, '')
+        
+        # Look for translation after "Перевод"
+        translation_sections = re.split(r'Перевод', text, flags=re.IGNORECASE)
+        if len(translation_sections) > 1:
+            potential_translation = translation_sections[1]
+            
+            # Extract Russian text
+            russian_match = re.search(r'([а-яё\s\.,;:!?\-]+)', potential_translation, re.IGNORECASE)
+            if russian_match:
+                candidate = russian_match.group(1).strip()
+                
+                # Stop at common markers
+                end_markers = ['Комментарий', 'дхр̣тара̄шт̣рах̣ ува̄ча']
+                for marker in end_markers:
+                    if marker in candidate:
+                        candidate = candidate.split(marker)[0].strip()
+                        break
+                
+                if len(candidate) > 20:
+                    return self._clean_text(candidate)
+        
+        return None
+    
+    def _extract_word_by_word_from_text(self, text: str) -> str:
+        """Extract word-by-word translation from text"""
+        # Look for word-by-word translation after "Пословный перевод"
+        word_by_word_sections = re.split(r'Пословный перевод', text, flags=re.IGNORECASE)
+        if len(word_by_word_sections) > 1:
+            potential_word_by_word = word_by_word_sections[1]
+            
+            # Extract until we hit "Перевод" or "Комментарий"
+            end_markers = ['Перевод', 'Комментарий']
+            for marker in end_markers:
+                if marker in potential_word_by_word:
+                    potential_word_by_word = potential_word_by_word.split(marker)[0].strip()
+                    break
+            
+            if potential_word_by_word and len(potential_word_by_word) > 10:
+                return self._clean_text(potential_word_by_word)
+        
+        return None
+    
+    def _score_chapter_quality(self, verses: List[VerseRecord], address: ChapterAddress) -> List[VerseRecord]:
+        """Attach quality vectors scored over the whole chapter and log the chapter summary"""
+        chapter_name = self._chapter_log_name(address)
+        if not verses:
+            self.logger.warning(f"{chapter_name}: No verses extracted")
+            return verses
+        
+        qualities = score_chapter(verses)
+        verses = [verse._replace(quality=quality, scan=None) for verse, quality in zip(verses, qualities)]
+        
+        summary = chapter_summary(qualities)
+        self.logger.info(
+            f"{chapter_name} quality: {summary['good']}/{summary['verses']} good verses, "
+            f"mean score {summary['mean_score']:.2f}",
+            extra={'text': self.text_type, 'chapter': address.label, **summary}
+        )
+        
+        anomalous = [self._verse_label(verse) for verse in verses if verse.quality.anomalies]
+        if anomalous:
+            self.logger.warning(
+                f"{chapter_name} verses with quality issues: {', '.join(anomalous[:5])}{'...' if len(anomalous) > 5 else ''}",
+                extra={'text': self.text_type, 'chapter': address.label, 'anomalies': summary['anomalies']}
+            )
+        return verses
+    
+    def _contains_sanskrit_content(self, element: Tag) -> bool:
+        """Check if element contains Sanskrit content (for advanced view)"""
+        text = element.get_text().strip()
+        
+        # Check for Sanskrit text (Devanagari)
+        has_sanskrit = bool(re.search(r'[\u0900-\u097F]', text))
+        
+        # Check for reasonable length (not too short, not too long)
+        reasonable_length = 20 < len(text) < 2000
+        
+        return has_sanskrit and reasonable_length
+    
+    def _find_individual_verses_in_container(self, container: Tag) -> List[VerseSegment]:
+        """Find individual verse elements within av-verses container, handling merged verses
+        
+        One pass over the container finds the verse headers ("ТЕКСТ 5", "ТЕКСТЫ 16-18");
+        the verse element of a header is its nearest ancestor with Sanskrit and
+        translation text. The text of each ancestor is extracted at most once and
+        kept with the verse element, and every verse element is returned once.
+        """
+        segments = []
+        # id(ancestor) -> its stripped text if it is a verse element, None if not
+        candidates: Dict[int, Optional[str]] = {}
+        found = set()
+        
+        for header in container.descendants:
+            # Same headers as find_all(['div', 'span'], string=VERSE_HEADER_PATTERN)
+            if not isinstance(header, Tag) or header.name not in ('div', 'span'):
+                continue
+            header_text = header.string
+            if header_text is None or not VERSE_HEADER_PATTERN.search(header_text):
+                continue
+            
+            parent = header.parent
+            while parent is not None and parent is not container:
+                key = id(parent)
+                if key not in candidates:
+                    text = parent.get_text().strip()
+                    is_verse = len(text) > 50 and DEVANAGARI_PATTERN.search(text) and CYRILLIC_PATTERN.search(text)
+                    candidates[key] = text if is_verse else None
+                
+                if candidates[key] is not None:
+                    if key not in found:
+                        found.add(key)
+                        segments.append(VerseSegment(parent, candidates[key]))
+                    break
+                parent = parent.parent
+        
+        # If no verses found with the above method, look for divs with a header and Sanskrit
+        if not segments:
+            segments = self._find_verse_divs(container)
+        
+        return segments
+    
+    def _find_verse_divs(self, element: Tag) -> List[VerseSegment]:
+        """Divs below element whose text has a verse header, Sanskrit and over 100 characters
+        
+        The text of a child is part of its parent's text, so the children of an
+        element that fails these checks cannot pass them and are not visited.
+        """
+        segments = []
+        for child in element.children:
+            if not isinstance(child, Tag):
+                continue
+            text = child.get_text().strip()
+            if not (VERSE_HEADER_PATTERN.search(text) and DEVANAGARI_PATTERN.search(text) and len(text) > 100):
+                continue
+            if child.name == 'div':
+                segments.append(VerseSegment(child, text))
+            segments.extend(self._find_verse_divs(child))
+        return segments
+    
+    def _contains_verse_content(self, element: Tag) -> bool:
+        """Check if element contains verse-like content"""
+        text = element.get_text().strip()
+        
+        # Check for verse indicators
+        verse_indicators = [
+            'ТЕКСТ',
+            'стих',
+            'verse',
+            'шлока',
+            'shloka'
+        ]
+        
+        # Check for Sanskrit text (Devanagari)
+        has_sanskrit = bool(re.search(r'[\u0900-\u097F]', text))
+        
+        # Check for verse indicators
+        has_indicators = any(indicator.lower() in text.lower() for indicator in verse_indicators)
+        
+        # Check for reasonable length (not too short, not too long)
+        reasonable_length = 20 < len(text) < 2000
+        
+        return (has_sanskrit or has_indicators) and reasonable_length
+    
+    def _extract_verse_from_advanced_element(self, element: Tag, address: ChapterAddress, text: str = None) -> VerseRecord:
+        """Extract verse data from advanced view element"""
+        try:
+            if text is None:
+                text = element.get_text().strip()
+            
+            # Extract verse number
+            verse_number = self._extract_verse_number(text)
+            if not verse_number:
+                verse_number = self._extract_verse_number_from_context(element)
+            
+            if not verse_number:
+                self.logger.warning(f"Could not extract verse number from: {text[:100]}...")
+                return None
+            
+            # Look for Sanskrit text in child elements
+            sanskrit = self._extract_sanskrit_from_advanced_element(element, text)
+            
+            # Look for translation in child elements
+            translation = self._extract_translation_from_advanced_element(element, text)
+            
+            # Look for transliteration
+            transliteration = self._extract_transliteration_from_advanced_element(element, text)
+            
+            # Look for word-by-word translation
+            word_by_word_translation = self._extract_word_by_word_translation_from_advanced_element(element, text)
+            
+            # Look for commentary
+            commentary = self._extract_commentary_from_advanced_element(element)
+            
+            verse = VerseRecord(
+                title=self.text_name,
+                chapter=address.chapter,
+                verse_number=verse_number,
+                canto=address.canto,
+                sanskrit=sanskrit,
+                transliteration=transliteration,
+                word_by_word_translation=word_by_word_translation,
+                translation=translation,
+                commentary=commentary,
+                source="Vedabase",
+                language="ru",
+                url=self._verse_url(address, verse_number),
+                metadata={
+                    'element_tag': element.name,
+                    'element_class': element.get('class', []),
+                    'raw_text_length': len(text),
+                    'extraction_method': 'advanced_view'
+                }
+            )
+            
+            return verse
+        
+        except Exception as e:
+            self.logger.error(f"Error extracting verse from advanced element: {e}")
+            return None
+    
+    def _extract_verse_number_from_context(self, element: Tag) -> int:
+        """Try to extract verse number from element context"""
+        # Check element attributes
+        for attr in ['data-verse', 'data-number', 'id']:
+            value = element.get(attr, '')
+            if value:
+                numbers = re.findall(r'\d+', value)
+                if numbers:
+                    return int(numbers[0])
+        
+        # Check parent elements
+        parent = element.parent
+        while parent and parent.name != 'body':
+            for attr in ['data-verse', 'data-number', 'id']:
+                value = parent.get(attr, '')
+                if value:
+                    numbers = re.findall(r'\d+', value)
+                    if numbers:
+                        return int(numbers[0])
+            parent = parent.parent
+        
+        return None
+    
+    def _extract_sanskrit_from_advanced_element(self, element: Tag, text: str = None) -> str:
+        """Extract Sanskrit text from advanced view element"""
+        # Look for devanagari class elements
+        devanagari_elements = element.find_all(['div', 'span'], class_=re.compile(r'devanagari', re.I))
+        
+        for dev_elem in devanagari_elements:
+            text = dev_elem.get_text().strip()
+            sanskrit = self._extract_sanskrit_text(text)
+            if sanskrit:
+                return sanskrit
+        
+        # If no devanagari class found, look for Sanskrit in the element itself
+        if text is None:
+            text = element.get_text().strip()
+        return self._extract_sanskrit_text(text)
+    
+    def _extract_translation_from_advanced_element(self, element: Tag, text: str = None) -> str:
+        """Extract translation from advanced view element"""
+        # Look for translation class elements
+        translation_elements = element.find_all(['div', 'span'], class_=re.compile(r'translation', re.I))
+        
+        for trans_elem in translation_elements:
+            text = trans_elem.get_text().strip()
+            # Remove "Перевод" prefix
+            text = re.sub(r'^Перевод\s*', '', text, flags=re.IGNORECASE)
+            if text and len(text) > 10:
+                return self._clean_text(text)
+        
+        # If no translation class found, extract from main text
+        if text is None:
+            text = element.get_text().strip()
+        sanskrit = self._extract_sanskrit_text(text)
+        if sanskrit:
+            text = text.replace(sanskrit, '').strip()
+        return self._clean_translation(text)
+    
+    def _extract_transliteration_from_advanced_element(self, element: Tag, text: str = None) -> str:
+        """Extract transliteration from advanced view element - improved version"""
+        # Get the full text of the element
+        if text is None:
+            text = element.get_text().strip()
+        
+        # Method 1: Look for transliteration after "Текст стиха"
+        text_after_verse = re.split(r'Текст стиха', text, flags=re.IGNORECASE)
+        if len(text_after_verse) > 1:
+            potential_transliteration = text_after_verse[1]
+            
+            # Find the end of transliteration by looking for "Пословный перевод"
+            end_marker = 'Пословный перевод'
+            if end_marker in potential_transliteration:
+                transliteration_text = potential_transliteration.split(end_marker)[0].strip()
+                
+                # Clean up the transliteration
+                # Remove any remaining Russian text at the beginning
+                lines = transliteration_text.split('\n')
+                transliteration_lines = []
+                
+                for line in lines:
+                    line = line.strip()
+                    if line and not any(word in line.lower() for word in ['перевод', 'комментарий', 'текст', 'стих']):
+                        # Check if line contains Sanskrit transliteration characters
+                        if re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F]', line, re.IGNORECASE):
+                            transliteration_lines.append(line)
+                
+                if transliteration_lines:
+                    full_transliteration = ' '.join(transliteration_lines)
+                    # Clean up extra spaces and normalize
+                    full_transliteration = re.sub(r'\s+', ' ', full_transliteration).strip()
+                    
+                    # Check if it's long enough and has diacritics
+                    has_diacritics = bool(re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F]', full_transliteration, re.IGNORECASE))
+                    if len(full_transliteration) > 20 and has_diacritics:
+                        return full_transliteration
+        
+        # Method 2: Fallback to original approach for edge cases
+        # Look for transliteration pattern (Cyrillic with diacritics, spaces, and hyphens)
+        transliteration_match = re.search(r'^([а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\s\-\u0300-\u036F]+)', text, re.IGNORECASE)
+        if transliteration_match:
+            candidate = transliteration_match.group(1).strip()
+            # Check if it looks like Sanskrit transliteration
+            has_diacritics = (re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]', candidate, re.IGNORECASE) or
+                            re.search(r'[\u0300-\u036F]', candidate))
+            if len(candidate) > 10 and has_diacritics:
+                # Stop at the first non-transliteration word
+                end_markers = ['Пословный перевод', 'Перевод', 'Комментарий', 'дхр̣тара̄шт̣рах̣ ува̄ча']
+                for marker in end_markers:
+                    if marker in candidate:
+                        candidate = candidate.split(marker)[0].strip()
+                        break
+                return candidate
+        
+        # Method 3: Alternative approach for different structures
+        transliteration_pattern = r'([а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]+(?:\s+[а-яёāīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]+)*)'
+        matches = re.findall(transliteration_pattern, text, re.IGNORECASE)
+        
+        for match in matches:
+            # Check if this looks like Sanskrit transliteration
+            has_diacritics = bool(re.search(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ]', match, re.IGNORECASE))
+            has_sanskrit_patterns = bool(re.search(r'[а-яё]+[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ][а-яё]*', match, re.IGNORECASE))
+            
+            # Skip common Russian words
+            russian_words = {'текст', 'стих', 'перевод', 'комментарий', 'деванагари', 'синонимы', 'глава'}
+            is_russian_text = any(word.lower() in russian_words for word in match.split())
+            
+            if (has_diacritics or has_sanskrit_patterns) and len(match) > 15 and not is_russian_text:
+                # Make sure it's not part of the Sanskrit text or translation
+                if not re.search(r'[\u0900-\u097F]', match):  # Not Devanagari
+                    if not re.search(r'[а-яё]{3,}', match.lower()):  # Not long Russian words
+                        return match
+        
+        return None
+    
+    def _extract_word_by_word_translation_from_advanced_element(self, element: Tag, text: str = None) -> str:
+        """Extract word-by-word translation from advanced view element"""
+        return self._extract_word_by_word_translation(element.get_text().strip() if text is None else text)
+    
+    def _extract_commentary_from_advanced_element(self, element: Tag) -> str:
+        """Extract commentary from advanced view element"""
+        # Look for purport/commentary class elements
+        commentary_elements = element.find_all(['div', 'span'], class_=re.compile(r'purport|commentary', re.I))
+        
+        for comm_elem in commentary_elements:
+            text = comm_elem.get_text().strip()
+            # Remove "Комментарий" prefix
+            text = re.sub(r'^Комментарий\s*', '', text, flags=re.IGNORECASE)
+            if text and len(text) > 20:
+                return self._clean_text(text)
+        
+        return None
+    
+    def _clean_translation(self, translation: str) -> str:
+        """Clean and normalize translation text"""
+        if not translation:
+            return ""
+        
+        # Remove verse number prefixes
+        translation = re.sub(r'^ТЕКСТ(?:Ы)?\s*\d+(?:-\d+)?\s*:', '', translation, flags=re.IGNORECASE)
+        translation = re.sub(r'^стих\s*\d+\s*:', '', translation, flags=re.IGNORECASE)
+        translation = re.sub(r'^verse\s*\d+\s*:', '', translation, flags=re.IGNORECASE)
+        
+        # Remove extra punctuation and whitespace
+        translation = re.sub(r'^[:\-\s]+', '', translation)
+        translation = self._clean_text(translation)
+        
+        return translation
+    
+    def _extract_verses_alternative(self, soup: BeautifulSoup, address: ChapterAddress) -> List[VerseRecord]:
+        """Alternative method to extract verses when standard methods fail"""
+        verses = []
+        
+        try:
+            # Look for all text blocks that might contain verses
+            all_text_elements = soup.find_all(['div', 'p', 'span'])
+            
+            current_verse_number = 1
+            for element in all_text_elements:
+                text = element.get_text().strip()
+                
+                # Skip if too short or too long
+                if len(text) < 20 or len(text) > 2000:
+                    continue
+                
+                # Check if this looks like a verse
+                if self._looks_like_verse(text):
+                    sanskrit = self._extract_sanskrit_text(text)
+                    translation = self._clean_text(text)
+                    
+                    if sanskrit:
+                        translation = translation.replace(sanskrit, '').strip()
+                    
+                    translation = self._clean_translation(translation)
+                    
+                    verse = VerseRecord(
+                        title=self.text_name,
+                        chapter=address.chapter,
+                        verse_number=current_verse_number,
+                        canto=address.canto,
+                        sanskrit=sanskrit,
+                        translation=translation,
+                        source="Vedabase",
+                        language="ru",
+                        url=self._verse_url(address, current_verse_number),
+                        metadata={'extraction_method': 'alternative'}
+                    )
+                    
+                    verses.append(verse)
+                    current_verse_number += 1
+                    
+                    # Limit to reasonable number of verses per chapter
+                    if current_verse_number > 50:
+                        break
+        
+        except Exception as e:
+            self.logger.error(f"Error in alternative verse extraction: {e}")
+        
+        return verses
+    
+    def _looks_like_verse(self, text: str) -> bool:
+        """Check if text looks like a verse"""
+        # Must have Sanskrit text
+        has_sanskrit = bool(re.search(r'[\u0900-\u097F]', text))
+        
+        # Must not be just navigation or metadata
+        navigation_indicators = ['глав', 'chapter', 'назад', 'далее', 'содержание', 'menu']
+        is_navigation = any(indicator in text.lower() for indicator in navigation_indicators)
+        
+        # Must have reasonable content
+        has_content = len(text.split()) > 5
+        
+        return has_sanskrit and not is_navigation and has_content
+    
     def _extract_word_by_word_translation(self, text: str) -> str:
         """Extract word-by-word translation from text"""
         # Look for word-by-word translation after "Пословный перевод"
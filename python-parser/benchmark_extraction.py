@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the shared verse extraction engine on saved advanced-view pages
+
+Pages are stored as <dir>/<text_type>/<label>.html, where label is the chapter
+address ("2" for BG chapter 2, "1.2" for SB canto 1 chapter 2 or CC Adi 2).
+This is the parser page cache layout (PARSER_PAGE_CACHE_DIR), so a cache filled
+by a crawl can be benchmarked directly. Use --fetch to download the first N
+chapters of a text once, then run the benchmark offline as often as needed.
+Per-page runs also check the page classifier against the extraction: a page
+should be classified as having verses exactly when verses are extracted.
+
+--crawl measures end-to-end throughput of parse_all_chapters over the saved
+pages, with --latency simulating the network round trip of each page fetch
+and --concurrency setting how many chapters are in flight. --full crawls every
+chapter address of the text, serving the saved pages round-robin, and
+--memory reports peak traced memory of the run and verse construction cost.
+--strategies prints attempts, hits and time of every extraction strategy
+with the fallbacks that could be dropped or reordered.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from base_parser import ChapterAddress
+from config import PARSER_CONFIG
+from extraction_profiler import extraction_profiler
+from main import PARSERS, parser_class
+from models import ParsedVerse, VerseRecord
+from page_classifier import classify_page
+
+DEFAULT_PAGES_DIR = Path(__file__).parent / 'benchmark_pages'
+
+
+async def fetch_pages(parser, pages_dir: Path, count: int):
+    """Download the first `count` chapter pages of the text into the page cache"""
+    parser.config['page_cache_dir'] = str(pages_dir)
+    
+    async with parser:
+        for address in list(parser._chapter_addresses())[:count]:
+            if parser._page_cache_path(address).exists():
+                continue
+            
+            html = await parser._fetch_chapter_page(address)
+            if html:
+                print(f"💾 {address.label}.html: {len(html)} characters")
+            else:
+                print(f"❌ Failed to fetch {parser._chapter_log_name(address)}")
+            
+            await asyncio.sleep(parser.config['delay_between_requests'])
+
+
+def load_pages(pages_dir: Path) -> List[Tuple[ChapterAddress, str]]:
+    """Load saved pages sorted by address"""
+    pages = [
+        (ChapterAddress.from_label(path.stem), path.read_text(encoding='utf-8'))
+        for path in pages_dir.glob('*.html')
+    ]
+    return sorted(pages, key=lambda page: (page[0].canto or 0, page[0].chapter))
+
+
+def benchmark_page(parser, address: ChapterAddress, html: str, repeat: int) -> dict:
+    """Best-of-N timings (ms) of each extraction stage for one page"""
+    timings = {'classify': [], 'parse_html': [], 'extract': []}
+    verses = []
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        verdict = classify_page(html)
+        timings['classify'].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        soup = parser._parse_html(html)
+        timings['parse_html'].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        verses = parser._extract_verses_from_html(soup, address)
+        timings['extract'].append(time.perf_counter() - start)
+    
+    result = {stage: min(values) * 1000 for stage, values in timings.items()}
+    result['verses'] = len(verses)
+    result['bytes'] = len(html.encode('utf-8'))
+    result['verdict'] = verdict
+    return result
+
+
+def run_benchmark(text_type: str, pages_dir: Path, repeat: int, verbose: bool):
+    """Run the benchmark over all saved pages of a text"""
+    parser = parser_class(text_type)()
+    if not verbose:
+        parser.logger.setLevel(logging.WARNING)
+    
+    pages = load_pages(pages_dir)
+    if not pages:
+        print(f"❌ No pages in {pages_dir} (use --fetch N to download some)")
+        return
+    
+    print(f"⏱️  {parser.text_name}: {len(pages)} pages, best of {repeat} runs")
+    print(f"   {'page':>8} {'KB':>7} {'verses':>7} {'classify':>9} {'parse':>9} {'extract':>9}")
+    
+    totals = {'classify': 0.0, 'parse_html': 0.0, 'extract': 0.0, 'verses': 0, 'bytes': 0}
+    # Pages where the classifier and the full extraction disagree on whether there are verses
+    misclassified = []
+    for address, html in pages:
+        result = benchmark_page(parser, address, html, repeat)
+        for key in totals:
+            totals[key] += result[key]
+        if result['verdict'].has_verses != bool(result['verses']):
+            misclassified.append(f"{address.label} ({result['verdict'].reason}, {result['verses']} verses)")
+        print(
+            f"   {address.label:>8} {result['bytes'] / 1024:>7.0f} {result['verses']:>7} "
+            f"{result['classify']:>7.1f}ms {result['parse_html']:>7.1f}ms {result['extract']:>7.1f}ms"
+        )
+    
+    total_ms = totals['classify'] + totals['parse_html'] + totals['extract']
+    print(f"\n📊 Total: {totals['verses']} verses in {total_ms:.0f} ms")
+    print(f"   Per page: classify {totals['classify'] / len(pages):.1f} ms, "
+          f"parse {totals['parse_html'] / len(pages):.1f} ms, "
+          f"extract {totals['extract'] / len(pages):.1f} ms")
+    print(f"   Classifier: {len(pages) - len(misclassified)}/{len(pages)} pages agree with extraction")
+    for page in misclassified:
+        print(f"      ❌ {page}")
+    if total_ms:
+        print(f"   Throughput: {totals['verses'] / total_ms * 1000:.0f} verses/s, "
+              f"{totals['bytes'] / 1024 / 1024 / total_ms * 1000:.1f} MB/s")
+
+
+def construction_benchmark(verse_type, verses: list, count: int = 20000) -> float:
+    """Microseconds to construct one verse_type object from the fields of crawled verses"""
+    fields = [verse._asdict() for verse in verses]
+    
+    start = time.perf_counter()
+    for i in range(count):
+        verse_type(**fields[i % len(fields)])
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def write_volume(verses: list) -> Tuple[int, int, int]:
+    """Text bytes the writer sends for the verses: (with merged blocks, without, block rows)"""
+    from database import DatabaseManager
+    db = DatabaseManager()
+    updated_at = datetime.utcnow()
+    
+    def text_bytes(rows: list) -> int:
+        return sum(len(value.encode('utf-8')) for row in rows for value in row if isinstance(value, str))
+    
+    block_rows, rows = db._write_rows(verses, updated_at)
+    _, flat_rows = db._write_rows([verse._replace(block=None) for verse in verses], updated_at)
+    return text_bytes(block_rows) + text_bytes(rows), text_bytes(flat_rows), len(block_rows)
+
+
+async def run_crawl_benchmark(text_type: str, pages_dir: Path, latency: float, concurrency: int,
+                              save: bool, full: bool, memory: bool):
+    """Crawl the saved pages through the concurrent scheduler and report throughput"""
+    parser = parser_class(text_type)({'max_concurrency': concurrency})
+    parser.logger.setLevel(logging.WARNING)
+    
+    pages = load_pages(pages_dir)
+    if not pages:
+        print(f"❌ No pages in {pages_dir} (use --fetch N to download some)")
+        return
+    
+    # Saved pages stand in for the network; --full serves them round-robin for every chapter
+    addresses = list(parser._chapter_addresses()) if full else [address for address, _ in pages]
+    page_by_address = {
+        address: pages[i % len(pages)][1]
+        for i, address in enumerate(addresses)
+    }
+    
+    async def fetch_with_latency(address: ChapterAddress):
+        # The sleep models one network round trip per page
+        await asyncio.sleep(latency / 1000)
+        return page_by_address[address]
+    
+    parser._fetch_chapter_page = fetch_with_latency
+    
+    if memory:
+        tracemalloc.start()
+    
+    start = time.perf_counter()
+    result = await parser.parse_all_chapters(addresses)
+    crawl_seconds = time.perf_counter() - start
+    
+    print(f"🕸️  {parser.text_name}: {len(addresses)} chapters, concurrency {concurrency}, latency {latency:.0f} ms")
+    print(f"   Crawl: {result.total_verses} verses in {crawl_seconds:.2f}s "
+          f"({len(addresses) / crawl_seconds:.1f} chapters/s, {result.total_verses / crawl_seconds:.0f} verses/s)")
+    
+    if memory:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   Memory: peak {peak / 1024 / 1024:.1f} MB, retained after crawl {retained / 1024 / 1024:.1f} MB "
+              f"({retained / max(result.total_verses, 1) / 1024:.2f} KB per verse)")
+        if result.verses:
+            for verse_type in (VerseRecord, ParsedVerse):
+                print(f"   Construction: {construction_benchmark(verse_type, result.verses):.2f} µs per {verse_type.__name__}")
+    
+    if not full:
+        total_chapters = len(list(parser._chapter_addresses()))
+        print(f"   Projected full crawl of {total_chapters} chapters: "
+              f"{total_chapters / len(addresses) * crawl_seconds / 60:.1f} min")
+    
+    if result.verses:
+        written, flat, blocks = write_volume(result.verses)
+        print(f"   Write volume: {written / 1024 / 1024:.2f} MB of text in {len(result.verses)} verse rows "
+              f"and {blocks} merged block rows ({flat / 1024 / 1024:.2f} MB with text copied into every verse)")
+    
+    if save and result.verses:
+        from database import DatabaseManager
+        async with DatabaseManager(profile='bulk_write') as db:
+            start = time.perf_counter()
+            saved_count = await db.save_verses(result.verses)
+            write_seconds = time.perf_counter() - start
+        print(f"   Bulk write: {saved_count} verses in {write_seconds:.2f}s ({saved_count / write_seconds:.0f} verses/s)")
+
+
+async def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Benchmark verse extraction on saved vedabase.io pages')
+    parser.add_argument('--text-type', '-t', choices=list(PARSERS), default='bg',
+                       help='Text type to benchmark (default: bg)')
+    parser.add_argument('--pages-dir', type=Path, default=DEFAULT_PAGES_DIR,
+                       help='Directory with saved pages, one subdirectory per text type')
+    parser.add_argument('--fetch', type=int, default=0,
+                       help='Download the first N chapter pages before benchmarking')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per page, the best one is reported (default: 3)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Keep parser INFO logging (logging cost is then included)')
+    parser.add_argument('--crawl', action='store_true',
+                       help='Measure crawl throughput through parse_all_chapters instead of per-page timings')
+    parser.add_argument('--latency', type=float, default=500.0,
+                       help='Simulated fetch latency per page in ms for --crawl (default: 500)')
+    parser.add_argument('--concurrency', type=int, default=PARSER_CONFIG['max_concurrency'],
+                       help='Chapters in flight for --crawl (default: max_concurrency from config)')
+    parser.add_argument('--save', action='store_true',
+                       help='With --crawl, also time the bulk write of the crawled verses to the database')
+    parser.add_argument('--full', action='store_true',
+                       help='With --crawl, crawl every chapter of the text using the saved pages round-robin')
+    parser.add_argument('--memory', action='store_true',
+                       help='With --crawl, trace peak memory and verse construction cost (slower)')
+    parser.add_argument('--strategies', action='store_true',
+                       help='Report hit rate and time of each extraction strategy (per-page runs count every repeat)')
+    
+    args = parser.parse_args()
+    pages_dir = args.pages_dir / args.text_type
+    
+    if args.fetch:
+        await fetch_pages(parser_class(args.text_type)(), args.pages_dir, args.fetch)
+    
+    if args.crawl:
+        await run_crawl_benchmark(args.text_type, pages_dir, args.latency, args.concurrency,
+                                  args.save, args.full, args.memory)
+    else:
+        run_benchmark(args.text_type, pages_dir, args.repeat, args.verbose)
+    
+    if args.strategies:
+        print()
+        for line in extraction_profiler.format_report():
+            print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Sri Chaitanya-charitamrita parser for vedabase.io
+"""
+from typing import List, Iterable, Union
+
+from base_parser import BaseVedabaseParser, ChapterAddress
+from models import VerseRecord
+
+
+class ChaitanyaCharitamritaParser(BaseVedabaseParser):
+    """Parser for Sri Chaitanya-charitamrita from vedabase.io (lila/chapter/verse addressing)
+    
+    Lilas are numbered 1-3 (Adi, Madhya, Antya); the number is stored in the canto column.
+    """
+    
+    def __init__(self, config: dict = None):
+        super().__init__('cc', config)
+        self.lilas = self.text_info['lilas']
+        # Chapter counts come from VEDABASE_URLS, config may override single lilas
+        self.chapters_per_lila = {
+            **self.text_info['chapters_per_lila'],
+            **self.config.get('chapters_per_lila', {})
+        }
+    
+    async def parse_chapter(self, lila: Union[int, str], chapter_number: int) -> List[VerseRecord]:
+        """Parse a chapter of a lila, given by number (1-3) or slug ('adi', 'madhya', 'antya')"""
+        return await self.parse_address(ChapterAddress(chapter_number, self._lila_number(lila)))
+    
+    def _lila_number(self, lila: Union[int, str]) -> int:
+        """Normalize a lila number or URL slug to the lila number"""
+        if isinstance(lila, str):
+            numbers = {slug: number for number, slug in self.lilas.items()}
+            if lila.lower() not in numbers:
+                raise ValueError(f"Unknown lila: {lila}")
+            return numbers[lila.lower()]
+        
+        if lila not in self.lilas:
+            raise ValueError(f"Unknown lila: {lila}")
+        return lila
+    
+    def _chapter_addresses(self) -> Iterable[ChapterAddress]:
+        """All lila/chapter addresses in reading order"""
+        return [
+            ChapterAddress(chapter, lila)
+            for lila in sorted(self.lilas)
+            for chapter in range(1, self.chapters_per_lila.get(lila, 0) + 1)
+        ]
+    
+    def _chapter_path(self, address: ChapterAddress) -> str:
+        """Lilas are addressed by slug on vedabase.io: "adi/1/" """
+        return f"{self.lilas[address.canto]}/{address.chapter}/"
+    
+    def _chapter_log_name(self, address: ChapterAddress) -> str:
+        """Human readable chapter name for logs: "CC Adi 1" """
+        return f"CC {self.lilas[address.canto].capitalize()} {address.chapter}"
@@ -0,0 +1,171 @@
+"""
+Precomputed chapter bundles of the reading room
+
+During a group reading session every participant reads the same chapter.
+Instead of fetching it verse by verse from the database, the Next.js app
+serves the whole chapter from a bundle file built here
+(app/api/verses/chapter/route.ts).
+
+A bundle is the chapter rendered as JSON: the verses in reading order, with
+the verses of a merged block grouped into one entry that carries the block
+text and commentary once. It is stored gzip-compressed next to its ETag:
+
+    <bundle dir>/<text>/<chapter label>.json.gz   (bg/2.json.gz, sb/1.2.json.gz)
+    <bundle dir>/<text>/<chapter label>.etag      ("<BLAKE2b of the JSON>")
+
+The bundle holds no build time, so an unchanged chapter renders to the same
+bytes: its files are not rewritten and clients keep their cached copy (304).
+Bundles are rebuilt for the parsed chapters after every save (main.py, queue
+workers) and for a whole selection with python main.py --build-bundles.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from config import BUNDLE_CONFIG, VEDABASE_URLS
+from logging_setup import ROOT_LOGGER
+from records import ChapterAddress
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.chapter_bundles")
+
+# Verse text columns copied into the bundle entries (merged blocks: once per block)
+TEXT_FIELDS = ('sanskrit', 'transliteration', 'wordByWordTranslation', 'translation', 'commentary')
+
+
+class BundleStats:
+    """Bundles written by build_bundles, those left as they were and those removed"""
+    
+    def __init__(self):
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_written = 0
+    
+    def describe(self) -> str:
+        """Summary for logs: "3 written, 15 unchanged (412 KB)" """
+        summary = f"{self.written} written, {self.unchanged} unchanged"
+        if self.removed:
+            summary += f", {self.removed} removed"
+        return f"{summary} ({self.bytes_written / 1024:.0f} KB)"
+
+
+def bundle_dir(path: str = None) -> Path:
+    return Path(path or BUNDLE_CONFIG['dir'])
+
+
+def bundle_paths(text_type: str, address: ChapterAddress, root: str = None):
+    """Bundle file and ETag file of a chapter"""
+    folder = bundle_dir(root) / text_type
+    return folder / f"{address.label}.json.gz", folder / f"{address.label}.etag"
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def render_chapter(text_type: str, address: ChapterAddress, rows: List[dict]) -> dict:
+    """Bundle of a chapter from its get_chapter_range rows (merged block text resolved)"""
+    entries = []
+    blocks = {}
+    for row in rows:
+        block_id = row['mergedBlockId']
+        if block_id and block_id in blocks:
+            # Later verses of a merged block only add their numbers to its entry
+            entry = blocks[block_id]
+            entry['verseNumbers'].append(row['verseNumber'])
+            entry['ids'].append(row['id'])
+            continue
+        
+        entry = {
+            'verseNumbers': [row['verseNumber']],
+            'ids': [row['id']],
+            **{field: row[field] for field in TEXT_FIELDS},
+            'mergedBlockId': block_id,
+            'source': row['source'],
+            'updatedAt': _json_value(row['updatedAt'])
+        }
+        if block_id:
+            blocks[block_id] = entry
+        entries.append(entry)
+    
+    return {
+        'text': text_type,
+        'title': VEDABASE_URLS[text_type]['name'],
+        'canto': address.canto,
+        'chapter': address.chapter,
+        'language': rows[0]['language'] if rows else 'ru',
+        'verseCount': len(rows),
+        'updatedAt': max((_json_value(row['updatedAt']) for row in rows), default=None),
+        'verses': entries
+    }
+
+
+def encode_bundle(bundle: dict):
+    """Compressed bundle and its ETag; equal bundles give equal bytes"""
+    data = json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+    # mtime=0 keeps the gzip header free of the build time
+    return gzip.compress(data, compresslevel=9, mtime=0), etag
+
+
+def _replace_file(path: Path, content: bytes):
+    """Write next to the target and rename, so readers never see a partial file"""
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    partial.write_bytes(content)
+    os.replace(partial, path)
+
+
+def write_bundle(text_type: str, address: ChapterAddress, rows: List[dict],
+                 root: str = None, stats: BundleStats = None) -> Optional[str]:
+    """Render and store a chapter bundle unless the stored one is the same; returns its ETag
+    
+    A chapter without verses (e.g. after --clear) loses its bundle.
+    """
+    stats = stats if stats is not None else BundleStats()
+    bundle_path, etag_path = bundle_paths(text_type, address, root)
+    
+    if not rows:
+        if bundle_path.exists():
+            bundle_path.unlink()
+            etag_path.unlink(missing_ok=True)
+            stats.removed += 1
+        return None
+    
+    content, etag = encode_bundle(render_chapter(text_type, address, rows))
+    try:
+        if etag_path.read_text() == etag and bundle_path.exists():
+            stats.unchanged += 1
+            return etag
+    except FileNotFoundError:
+        pass
+    
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    # The bundle goes first: a reader that sees the new ETag also gets the new bundle
+    _replace_file(bundle_path, content)
+    _replace_file(etag_path, etag.encode('utf-8'))
+    stats.written += 1
+    stats.bytes_written += len(content)
+    return etag
+
+
+async def build_bundles(db, text_type: str, addresses: Iterable[ChapterAddress],
+                        root: str = None, language: str = 'ru') -> BundleStats:
+    """Rebuild the bundles of chapters of a text from the database"""
+    stats = BundleStats()
+    title = VEDABASE_URLS[text_type]['name']
+    for address in sorted(set(addresses), key=lambda address: (address.canto or 0, address.chapter)):
+        rows = await db.get_chapter_range(title, address.chapter, canto=address.canto, language=language)
+        write_bundle(text_type, address, rows, root, stats)
+    
+    logger.info(f"📦 {title} chapter bundles in {bundle_dir(root)}: {stats.describe()}")
+    return stats
+
+
+def parsed_addresses(verses) -> List[ChapterAddress]:
+    """Chapters of a batch of parsed verses"""
+    return list({ChapterAddress(verse.chapter, verse.canto) for verse in verses})
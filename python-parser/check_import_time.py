@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Import-time budget of the CLI and integration entry points
+
+Runs each command in a fresh interpreter with `python -X importtime` and sums
+the cumulative import time of the modules the command loads (modules the bare
+interpreter loads on startup are not counted). A command fails the check when
+it exceeds its budget or imports a module it must not need, e.g. bs4 for stats.
+
+The database points at a closed port, so commands stop right after their
+imports with a connection error and no database is needed.
+
+Usage:
+    python check_import_time.py            # check all commands
+    python check_import_time.py --scale 2  # double the budgets on a slow machine
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PARSER_DIR = Path(__file__).parent
+
+# Parser stack; commands that only read the database must not load it
+PARSER_MODULES = ('main', 'base_parser', 'bs4', 'aiohttp', 'pydantic', 'dotenv')
+
+# Modules of the main.py subcommands; --stats must not load them
+SUBCOMMAND_MODULES = ('work_queue', 'job_control', 'chapter_bundles')
+
+# Command -> (interpreter arguments, budget in ms, modules that must not be imported)
+BUDGETS = {
+    'integration_api stats': (['integration_api.py', 'stats'], 200, PARSER_MODULES),
+    'integration_api status': (['integration_api.py', 'status'], 200, PARSER_MODULES),
+    'integration_api search': (['integration_api.py', 'search', 'кришна'], 200, PARSER_MODULES),
+    'integration_api control': (['integration_api.py', 'control', 'status'], 200, PARSER_MODULES),
+    'main --stats': (['main.py', '--stats'], 250, ('base_parser', 'bs4', 'aiohttp', 'pydantic', *SUBCOMMAND_MODULES)),
+    'integration_api parse': (['-c', "import integration_api, main; main.parser_class('bg')"], 900, ()),
+}
+
+
+def import_times(args: List[str]) -> Dict[str, int]:
+    """Module -> cumulative import time (µs) of the top-level imports of a command"""
+    env = {
+        **os.environ,
+        'DATABASE_URL': 'postgresql://importtime@127.0.0.1:1/importtime',
+        # Node sets this too; the .env of a developer machine must not change the result
+        'PARSER_SKIP_DOTENV': '1',
+    }
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=PARSER_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+    
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented; their time is part of the top-level import
+        if len(name) - len(name.lstrip()) <= 1:
+            times[name.strip()] = int(cumulative)
+        else:
+            times.setdefault(name.strip(), 0)
+    return times
+
+
+def check(scale: float) -> bool:
+    startup = set(import_times(['-c', 'pass']))
+    ok = True
+    
+    print(f"⏱️  Import time budget (startup modules of the interpreter excluded)")
+    for command, (args, budget_ms, forbidden) in BUDGETS.items():
+        times = import_times(args)
+        own: List[Tuple[str, int]] = [
+            (name, micros) for name, micros in times.items()
+            if name not in startup and micros
+        ]
+        total_ms = sum(micros for _, micros in own) / 1000
+        loaded_forbidden = [module for module in forbidden if module in times]
+        
+        passed = total_ms <= budget_ms * scale and not loaded_forbidden
+        ok = ok and passed
+        status = "✅" if passed else "❌"
+        print(f"   {status} {command}: {total_ms:.0f} ms (budget {budget_ms * scale:.0f} ms)")
+        
+        slowest = sorted(own, key=lambda item: item[1], reverse=True)[:3]
+        print(f"      slowest: {', '.join(f'{name} {micros / 1000:.0f} ms' for name, micros in slowest)}")
+        if loaded_forbidden:
+            print(f"      imports modules it does not need: {', '.join(loaded_forbidden)}")
+    
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check import-time budgets of the parser entry points')
+    parser.add_argument('--scale', type=float, default=1.0,
+                       help='Multiply every budget, e.g. 2 on a slow machine (default: 1)')
+    args = parser.parse_args()
+    
+    sys.exit(0 if check(args.scale) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ async def check_sample_verses():
         # Проверим несколько стихов Шримад Бхагаватам
         result = await db.pool.fetch('''
             SELECT title, canto, chapter, "verseNumber", sanskrit
-            FROM verses 
+            FROM verses_resolved
             WHERE title LIKE '%Шримад-Бхагаватам%'
             ORDER BY id
             LIMIT 5
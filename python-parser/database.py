@@ -3,20 +3,478 @@ Database operations for storing parsed verses
 """
 import asyncio
 import asyncpg
-from typing import List, Optional
+import hashlib
+import logging
+import time
+from contextlib import contextmanager, asynccontextmanager
+from typing import List, Optional, Dict, Iterable, TYPE_CHECKING
 from datetime import datetime
 import json
 
-from models import ParsedVerse, ParseResult
-from config import DATABASE_URL
+from records import VerseRecord, MergedBlock, VerseKey
+from transliteration import fold_transliteration
+from config import DATABASE_URL, DATABASE_POOL_PROFILES, DEFAULT_POOL_PROFILE
+from logging_setup import ROOT_LOGGER, setup_logging
+
+if TYPE_CHECKING:
+    # pydantic models are only needed by the parser, not by stats/search readers
+    from models import ParseResult
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.database")
+
+# Short text codes used by the parsers mapped to verse titles in the database
+TITLE_MAP = {
+    'bg': 'Бхагавад-гита',
+    'sb': 'Шримад-Бхагаватам',
+    'cc': 'Шри Чайтанья-чаритамрита'
+}
+
+# Fields tracked in completeness statistics: stats key -> verses column
+COMPLETENESS_FIELDS = {
+    'sanskrit': 'sanskrit',
+    'transliteration': 'transliteration',
+    'word_by_word_translation': '"wordByWordTranslation"',
+    'translation': 'translation',
+    'commentary': 'commentary'
+}
+
+# Indexes the verse read/write paths rely on: name -> (columns, unique)
+# The natural key includes canto (SB canto, CC lila) so SB 1.1.1 and SB 2.1.1 are distinct rows
+VERSE_INDEXES = {
+    'verses_title_canto_chapter_verseNumber_language_key': (('title', 'canto', 'chapter', 'verseNumber', 'language'), True),
+    'verses_title_chapter_verseNumber_language_idx': (('title', 'chapter', 'verseNumber', 'language'), False),
+    'verses_mergedBlockId_idx': (('mergedBlockId',), False),
+    'verses_qualityScore_idx': (('qualityScore',), False)
+}
+
+# Old unique key without canto; it rejects the second canto/lila of a chapter number.
+# Replaced by prisma/migrations/*_add_canto_to_verse_key, never dropped at runtime
+LEGACY_VERSE_KEY_INDEX = 'verses_title_chapter_verseNumber_language_key'
+
+# Full-text search vectors kept up to date by Postgres on every insert/update
+SEARCH_COLUMNS = {
+    'searchText': (
+        "setweight(to_tsvector('russian'::regconfig, COALESCE(translation, '')), 'A') || "
+        "setweight(to_tsvector('russian'::regconfig, COALESCE(commentary, '')), 'B')"
+    ),
+    'searchTransliteration': "to_tsvector('simple'::regconfig, COALESCE(transliteration, ''))"
+}
+
+# Search indexes: name -> index definition after "ON verses" (verse_blocks gets the same ones)
+SEARCH_INDEXES = {
+    'verses_search_text_idx': 'USING gin ("searchText")',
+    'verses_search_transliteration_idx': 'USING gin ("searchTransliteration")',
+    'verses_translation_trgm_idx': 'USING gin (translation gin_trgm_ops)',
+    'verses_transliteration_trgm_idx': 'USING gin (transliteration gin_trgm_ops)',
+    'verses_transliteration_folded_trgm_idx': 'USING gin ("transliterationFolded" gin_trgm_ops)'
+}
+
+# Diacritic-free transliteration written by the upsert (see transliteration.fold_transliteration)
+FOLDED_TRANSLITERATION_COLUMN = 'transliterationFolded'
+
+# Hash of the values a verse or block row was last written with (see content_hash); the
+# upsert skips rows whose hash is unchanged, so a refresh rewrites only changed rows.
+# It saves writes, not storage: there is no hash -> text store. Repeated text is stored
+# once only for merged blocks (verse_blocks); other texts stay in the verse rows
+CONTENT_HASH_COLUMN = 'contentHash'
+
+# Channel on which the writers announce the chapters they changed (LISTENed by verse_cache.py).
+# Payload: JSON list of [title, chapter, language, canto] chapters, or "*" for all of them.
+VERSE_CACHE_CHANNEL = 'verse_cache'
+
+# Chapters per NOTIFY payload (Postgres limits a payload to 8000 bytes)
+CHANGED_CHAPTERS_PER_NOTIFY = 50
+
+# Parse quality of each verse (see quality.py): column -> type
+QUALITY_COLUMNS = {
+    'qualityScore': 'DOUBLE PRECISION',
+    'quality': 'JSONB'
+}
+
+# Verses whose parse quality is worth a look: low score or any anomaly flag
+LOW_QUALITY_MATCH = """
+    ("qualityScore" < $1 OR jsonb_array_length(quality->'anomalies') > 0)
+"""
+
+# Non-unique fallback used when existing duplicate rows prevent the unique index
+VERSE_KEY_FALLBACK_INDEX = 'verses_title_canto_chapter_verseNumber_language_fallback_idx'
+
+# Merged verse blocks (ТЕКСТЫ 16-18): the shared text is stored once per block and
+# the verse rows of the block reference it by "mergedBlockId" without the text
+VERSE_BLOCKS_TABLE = """
+    CREATE TABLE IF NOT EXISTS verse_blocks (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        canto INTEGER,
+        chapter INTEGER NOT NULL,
+        "verseNumbers" INTEGER[] NOT NULL,
+        sanskrit TEXT NOT NULL,
+        transliteration TEXT,
+        "wordByWordTranslation" TEXT,
+        translation TEXT NOT NULL,
+        commentary TEXT,
+        source TEXT NOT NULL DEFAULT 'Vedabase',
+        language TEXT NOT NULL DEFAULT 'ru',
+        "transliterationFolded" TEXT,
+        "contentHash" TEXT,
+        "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        "updatedAt" TIMESTAMP(3) NOT NULL
+    )
+"""
+
+# Block text of verse rows written without it, joined after "FROM verses"
+VERSE_BLOCK_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT sanskrit AS block_sanskrit, transliteration AS block_transliteration,
+               "wordByWordTranslation" AS block_word_by_word, translation AS block_translation,
+               commentary AS block_commentary
+        FROM verse_blocks
+        WHERE verse_blocks.id = verses."mergedBlockId"
+    ) block ON true
+"""
+
+# Verse text columns resolved through VERSE_BLOCK_JOIN: verses column -> expression
+RESOLVED_TEXT_COLUMNS = {
+    'sanskrit': "COALESCE(NULLIF(sanskrit, ''), block_sanskrit)",
+    'transliteration': 'COALESCE(transliteration, block_transliteration)',
+    '"wordByWordTranslation"': 'COALESCE("wordByWordTranslation", block_word_by_word)',
+    'translation': "COALESCE(NULLIF(translation, ''), block_translation)",
+    'commentary': 'COALESCE(commentary, block_commentary)'
+}
+
+# Use with VERSE_BLOCK_JOIN
+VERSE_COLUMNS = f"""
+    id, title, chapter, "verseNumber", canto,
+    {RESOLVED_TEXT_COLUMNS['sanskrit']} AS sanskrit,
+    {RESOLVED_TEXT_COLUMNS['transliteration']} AS transliteration,
+    {RESOLVED_TEXT_COLUMNS['"wordByWordTranslation"']} AS "wordByWordTranslation",
+    {RESOLVED_TEXT_COLUMNS['translation']} AS translation,
+    {RESOLVED_TEXT_COLUMNS['commentary']} AS commentary,
+    source, language, "isMergedVerse", "mergedWith", "mergedBlockId", "qualityScore", "createdAt", "updatedAt"
+"""
+
+# Verse rows with merged block text resolved, for readers without the join (raw SQL, scripts)
+VERSES_RESOLVED_VIEW = 'verses_resolved'
+
+# Search rank and match conditions; valid for both verses and verse_blocks rows.
+# $1 query text, $2 ILIKE substring pattern, $7 LIKE pattern of the diacritic-folded query
+SEARCH_RANK = """
+    ts_rank_cd("searchText", websearch_to_tsquery('russian', $1))
+      + ts_rank_cd("searchTransliteration", websearch_to_tsquery('simple', $1))
+      + CASE WHEN translation ILIKE $2 OR transliteration ILIKE $2 THEN 1::real ELSE 0::real END
+      + CASE WHEN "transliterationFolded" LIKE $7 THEN 0.5::real ELSE 0::real END
+"""
+SEARCH_MATCH = """
+    ("searchText" @@ websearch_to_tsquery('russian', $1)
+     OR "searchTransliteration" @@ websearch_to_tsquery('simple', $1)
+     OR translation ILIKE $2
+     OR transliteration ILIKE $2
+     OR "transliterationFolded" LIKE $7)
+"""
+
+# Named statements for the hot read/write paths, prepared once per pool connection
+# by asyncpg's statement cache (see BoundStatement)
+VERSE_STATEMENTS = {
+    # Update-then-insert keyed on the natural key; works with or without the unique index.
+    # Rows whose content hash ($19) is unchanged are left alone, "updatedAt" included.
+    'verse_upsert': """
+        WITH updated AS (
+            UPDATE verses SET
+                sanskrit = $5,
+                transliteration = $6,
+                "wordByWordTranslation" = $7,
+                translation = $8,
+                commentary = $9,
+                source = $10,
+                "isMergedVerse" = $11,
+                "mergedWith" = $12,
+                "mergedBlockId" = $13,
+                "updatedAt" = $15,
+                "transliterationFolded" = $16,
+                "qualityScore" = $17,
+                quality = $18::jsonb,
+                "contentHash" = $19
+            WHERE title = $1 AND chapter = $2 AND "verseNumber" = $3 AND language = $4
+              AND canto IS NOT DISTINCT FROM $14
+              AND "contentHash" IS DISTINCT FROM $19
+            RETURNING id
+        )
+        INSERT INTO verses (
+            id, title, chapter, "verseNumber", language, sanskrit, transliteration,
+            "wordByWordTranslation", translation, commentary, source,
+            "isMergedVerse", "mergedWith", "mergedBlockId", canto, "createdAt", "updatedAt",
+            "transliterationFolded", "qualityScore", quality, "contentHash"
+        )
+        SELECT gen_random_uuid()::text, $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $15, $16,
+               $17, $18::jsonb, $19
+        WHERE NOT EXISTS (SELECT 1 FROM updated)
+          AND NOT EXISTS (
+              SELECT 1 FROM verses
+              WHERE title = $1 AND chapter = $2 AND "verseNumber" = $3 AND language = $4
+                AND canto IS NOT DISTINCT FROM $14
+          )
+    """,
+    # Block ids are derived from the block address, so re-parsing updates the same row
+    'verse_block_upsert': """
+        INSERT INTO verse_blocks (
+            id, title, canto, chapter, "verseNumbers", sanskrit, transliteration,
+            "wordByWordTranslation", translation, commentary, source, language,
+            "transliterationFolded", "createdAt", "updatedAt", "contentHash"
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $14, $15)
+        ON CONFLICT (id) DO UPDATE SET
+            "verseNumbers" = EXCLUDED."verseNumbers",
+            sanskrit = EXCLUDED.sanskrit,
+            transliteration = EXCLUDED.transliteration,
+            "wordByWordTranslation" = EXCLUDED."wordByWordTranslation",
+            translation = EXCLUDED.translation,
+            commentary = EXCLUDED.commentary,
+            source = EXCLUDED.source,
+            "transliterationFolded" = EXCLUDED."transliterationFolded",
+            "updatedAt" = EXCLUDED."updatedAt",
+            "contentHash" = EXCLUDED."contentHash"
+        WHERE verse_blocks."contentHash" IS DISTINCT FROM EXCLUDED."contentHash"
+    """,
+    # Stored content hashes of a batch of verse keys; key_index is the 1-based position in the batch
+    'verse_hashes': """
+        SELECT key_index, "contentHash"
+        FROM unnest($1::text[], $2::int[], $3::int[], $4::text[], $5::int[])
+            WITH ORDINALITY AS k(key_title, key_chapter, key_verse, key_language, key_canto, key_index)
+        JOIN verses ON title = key_title AND chapter = key_chapter
+         AND "verseNumber" = key_verse AND language = key_language
+         AND canto IS NOT DISTINCT FROM key_canto
+    """,
+    'verse_block_hashes': """
+        SELECT id, "contentHash" FROM verse_blocks WHERE id = ANY($1::text[])
+    """,
+    'verses_by_chapter': f"""
+        SELECT {VERSE_COLUMNS}
+        FROM verses
+        {VERSE_BLOCK_JOIN}
+        WHERE title = $1 AND chapter = $2
+        ORDER BY "verseNumber"
+        LIMIT $3
+    """,
+    'verses_by_keys': f"""
+        SELECT {VERSE_COLUMNS}
+        FROM verses
+        {VERSE_BLOCK_JOIN}
+        JOIN unnest($1::text[], $2::int[], $3::int[], $4::text[], $5::int[])
+            AS k(key_title, key_chapter, key_verse, key_language, key_canto)
+            ON title = key_title AND chapter = key_chapter
+           AND "verseNumber" = key_verse AND language = key_language
+           AND canto IS NOT DISTINCT FROM key_canto
+    """,
+    'chapter_range': f"""
+        SELECT {VERSE_COLUMNS}
+        FROM verses
+        {VERSE_BLOCK_JOIN}
+        WHERE title = $1 AND chapter = $2 AND language = $3
+          AND "verseNumber" BETWEEN $4 AND $5
+        ORDER BY "verseNumber"
+    """,
+    # $1 query text, $2 ILIKE substring pattern, $3 language, $4 title or NULL, $5 limit, $6 offset,
+    # $7 LIKE pattern of the diacritic-folded query (NULL when nothing is left after folding).
+    # Merged block text is searched in verse_blocks and a matching block is returned as its first verse.
+    # Hits are grouped per verse, so a verse matched in both branches is returned and counted once.
+    'search_verses': f"""
+        WITH hits AS (
+            SELECT id AS match_id, {SEARCH_RANK} AS rank
+            FROM verses
+            WHERE language = $3
+              AND ($4::text IS NULL OR title = $4)
+              AND {SEARCH_MATCH}
+            UNION ALL
+            SELECT (
+                       SELECT id FROM verses
+                       WHERE "mergedBlockId" = verse_blocks.id
+                       ORDER BY "verseNumber"
+                       LIMIT 1
+                   ),
+                   {SEARCH_RANK}
+            FROM verse_blocks
+            WHERE language = $3
+              AND ($4::text IS NULL OR title = $4)
+              AND {SEARCH_MATCH}
+        ),
+        matches AS (
+            SELECT match_id, MAX(rank) AS rank, COUNT(*) OVER () AS total
+            FROM hits
+            WHERE match_id IS NOT NULL
+            GROUP BY match_id
+            ORDER BY rank DESC, match_id
+            LIMIT $5 OFFSET $6
+        )
+        SELECT {VERSE_COLUMNS}, rank, total,
+               ts_headline('russian', {RESOLVED_TEXT_COLUMNS['translation']}, websearch_to_tsquery('russian', $1),
+                           'MaxFragments=2, MinWords=5, MaxWords=20') AS headline
+        FROM matches
+        JOIN verses ON id = match_id
+        {VERSE_BLOCK_JOIN}
+        ORDER BY rank DESC, id
+    """,
+    'canto_chapter_range': f"""
+        SELECT {VERSE_COLUMNS}
+        FROM verses
+        {VERSE_BLOCK_JOIN}
+        WHERE title = $1 AND canto = $6 AND chapter = $2 AND language = $3
+          AND "verseNumber" BETWEEN $4 AND $5
+        ORDER BY "verseNumber"
+    """
+}
+
+
+class QueryStats:
+    """Per-query timing counters collected for a shared pool"""
+    
+    def __init__(self):
+        # query name -> [count, total seconds, max seconds]
+        self._stats: Dict[str, list] = {}
+    
+    @contextmanager
+    def timer(self, name: str):
+        """Time the wrapped database call under the given name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self._stats.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+    
+    def snapshot(self) -> Dict[str, dict]:
+        """Get timing stats per query name in milliseconds"""
+        return {
+            name: {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'avg_ms': round(total / count * 1000, 3),
+                'max_ms': round(longest * 1000, 3)
+            }
+            for name, (count, total, longest) in self._stats.items()
+        }
+
+
+class WriteStats:
+    """Rows written by save_verses and the unchanged rows it skipped, with their text bytes"""
+    
+    def __init__(self):
+        self.verses_written = 0
+        self.verses_unchanged = 0
+        self.blocks_written = 0
+        self.blocks_unchanged = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+    
+    def snapshot(self) -> Dict[str, int]:
+        return dict(vars(self))
+    
+    def describe(self) -> str:
+        """Summary for logs: "120 verses written, 5880 unchanged (24.3 MB of text not rewritten)" """
+        return (
+            f"{self.verses_written} verses written, {self.verses_unchanged} unchanged "
+            f"({self.bytes_skipped / 1024 / 1024:.1f} MB of text not rewritten)"
+        )
+
+
+def content_hash(values: Iterable) -> str:
+    """Hash of a row's written values: BLAKE2b of their JSON encoding"""
+    encoded = json.dumps(list(values), ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _text_bytes(row: tuple) -> int:
+    """UTF-8 size of the text values of a write row"""
+    return sum(len(value.encode('utf-8')) for value in row if isinstance(value, str))
+
+
+class BoundStatement:
+    """A named statement bound to an acquired pool connection
+    
+    asyncpg invalidates PreparedStatement objects once their connection is
+    released to the pool, so they can't be kept between acquisitions. Passing
+    the query text to the connection uses asyncpg's per-connection statement
+    cache instead, which prepares each statement once per backend connection.
+    """
+    
+    def __init__(self, conn, query: str):
+        self.conn = conn
+        self.query = query
+    
+    async def fetch(self, *args) -> list:
+        return await self.conn.fetch(self.query, *args)
+    
+    async def executemany(self, args: Iterable[tuple]):
+        return await self.conn.executemany(self.query, args)
+
+
+class SharedPool:
+    """A process-wide asyncpg pool for one database URL and profile"""
+    
+    def __init__(self, database_url: str, profile: str):
+        self.database_url = database_url
+        self.profile = profile
+        self.loop = asyncio.get_running_loop()
+        self.pool: Optional[asyncpg.Pool] = None
+        self.users = 0
+        self.query_stats = QueryStats()
+        self._starting: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Create the pool once, even if several managers connect concurrently"""
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(self._create())
+        await self._starting
+    
+    async def _create(self):
+        settings = DATABASE_POOL_PROFILES[self.profile]
+        self.pool = await asyncpg.create_pool(
+            self.database_url,
+            **settings
+        )
+        logger.info(f"✅ Connected to database ({self.profile} pool, max {settings['max_size']} connections)")
+    
+    async def close(self):
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            logger.info("✅ Disconnected from database")
+
+
+# Shared pools keyed by (database_url, profile); one per process and event loop
+_POOL_REGISTRY: Dict[tuple, SharedPool] = {}
+
+
+async def close_pools():
+    """Close every shared pool of the running event loop regardless of users"""
+    loop = asyncio.get_running_loop()
+    for key, shared in list(_POOL_REGISTRY.items()):
+        if shared.loop is loop:
+            del _POOL_REGISTRY[key]
+            await shared.close()
 
 
 class DatabaseManager:
     """Manages database operations for parsed verses"""
     
-    def __init__(self, database_url: str = None):
+    # Database URLs whose schema was already verified in this process
+    _schema_verified = set()
+    # Pools that verify the schema when they connect: the writers, which need the
+    # columns and indexes of the Prisma migrations. Read pools (stats, API) never run DDL.
+    SCHEMA_PROFILES = ('bulk_write',)
+    
+    def __init__(self, database_url: str = None, profile: str = None):
+        setup_logging()
         self.database_url = database_url or DATABASE_URL
+        self.profile = profile or DEFAULT_POOL_PROFILE
+        if self.profile not in DATABASE_POOL_PROFILES:
+            raise ValueError(f"Unknown database pool profile: {self.profile}")
         self.pool: Optional[asyncpg.Pool] = None
+        self._shared: Optional[SharedPool] = None
+        # Totals of this manager's save_verses calls
+        self.write_stats = WriteStats()
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -27,120 +485,475 @@ class DatabaseManager:
         """Async context manager exit"""
         await self.disconnect()
     
+    @property
+    def query_stats(self) -> QueryStats:
+        """Timing stats shared by all managers using the same pool"""
+        return self._shared.query_stats if self._shared else QueryStats()
+    
     async def connect(self):
-        """Create database connection pool"""
+        """Attach to the shared connection pool for this URL and profile"""
+        loop = asyncio.get_running_loop()
+        key = (self.database_url, self.profile)
+        shared = _POOL_REGISTRY.get(key)
+        # Pools are bound to their event loop; each asyncio.run() needs its own
+        if shared is None or shared.loop is not loop:
+            shared = SharedPool(self.database_url, self.profile)
+            _POOL_REGISTRY[key] = shared
+        
+        shared.users += 1
         try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=60
-            )
-            print("✅ Connected to database")
+            await shared.start()
         except Exception as e:
-            print(f"❌ Failed to connect to database: {e}")
+            shared.users -= 1
+            if _POOL_REGISTRY.get(key) is shared:
+                del _POOL_REGISTRY[key]
+            logger.error(f"❌ Failed to connect to database: {e}")
             raise
+        
+        self._shared = shared
+        self.pool = shared.pool
+        
+        if self.profile in self.SCHEMA_PROFILES:
+            try:
+                await self.ensure_schema()
+            except Exception as e:
+                # Read-only roles can still use the database, just without index management
+                logger.warning(f"⚠️ Could not verify the database schema: {e}")
     
     async def disconnect(self):
-        """Close database connection pool"""
-        if self.pool:
-            await self.pool.close()
-            print("✅ Disconnected from database")
+        """Release the shared pool, closing it when the last manager leaves"""
+        shared, self._shared, self.pool = self._shared, None, None
+        if not shared:
+            return
+        
+        shared.users -= 1
+        if shared.users <= 0:
+            key = (shared.database_url, shared.profile)
+            if _POOL_REGISTRY.get(key) is shared:
+                del _POOL_REGISTRY[key]
+            await shared.close()
+    
+    @asynccontextmanager
+    async def _acquire(self, query_name: str):
+        """Acquire a pool connection, timing the work done on it under query_name"""
+        with self.query_stats.timer(query_name):
+            async with self.pool.acquire() as conn:
+                yield conn
     
-    async def save_verses(self, verses: List[ParsedVerse]) -> int:
-        """Save verses to database"""
+    async def _statement(self, conn, name: str) -> BoundStatement:
+        """Get a named statement for an acquired connection (prepared on first use per connection)"""
+        return BoundStatement(conn, VERSE_STATEMENTS[name])
+    
+    async def ensure_schema(self):
+        """Create the columns, tables and indexes of the Prisma migrations that are missing
+        
+        prisma migrate deploy is the normal way to create them; this is the fallback
+        for databases it has not run on. Run once per process by the writer pools and
+        explicitly by python main.py --migrate, never on the read path.
+        """
+        if self.database_url in DatabaseManager._schema_verified:
+            return
+        async with self._acquire('ensure_schema') as conn:
+            rows = await conn.fetch(
+                """
+                SELECT c.relname AS name, i.indisunique AS is_unique, i.indisvalid AS is_valid,
+                       ARRAY(
+                           SELECT a.attname
+                           FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+                           JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                           ORDER BY k.ord
+                       ) AS columns
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'verses'::regclass
+                """
+            )
+            
+            if any(row['name'] == LEGACY_VERSE_KEY_INDEX for row in rows):
+                # Replacing a unique key is left to the migration (add_canto_to_verse_key)
+                logger.warning(
+                    f"⚠️ Unique index {LEGACY_VERSE_KEY_INDEX} has no canto: SB and CC chapters of "
+                    f"different cantos collide until prisma migrate deploy replaces it"
+                )
+            
+            await self._ensure_quality_schema(conn)
+            await self._ensure_content_hash_column(conn, 'verses')
+            
+            # Postgres 15+ can treat the NULL canto of single-level texts (BG) as one key value
+            nulls_not_distinct = await conn.fetchval("SELECT current_setting('server_version_num')::int") >= 150000
+            
+            for name, (columns, unique) in VERSE_INDEXES.items():
+                existing = [
+                    row for row in rows
+                    if tuple(row['columns']) == columns and (row['is_unique'] or not unique)
+                ]
+                if any(row['is_valid'] for row in existing):
+                    continue
+                if unique and any(
+                    row['name'] == VERSE_KEY_FALLBACK_INDEX and row['is_valid'] for row in rows
+                ):
+                    continue
+                
+                # A failed concurrent build leaves an invalid index behind; rebuild it
+                for row in existing:
+                    await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{row["name"]}"')
+                
+                column_list = ', '.join(f'"{column}"' for column in columns)
+                try:
+                    await conn.execute(
+                        f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY IF NOT EXISTS '
+                        f'"{name}" ON verses ({column_list})'
+                        f'{" NULLS NOT DISTINCT" if unique and nulls_not_distinct else ""}'
+                    )
+                    logger.info(f"✅ Created index {name}")
+                except asyncpg.UniqueViolationError:
+                    # Duplicate verse rows exist; keep lookups index-backed without uniqueness
+                    await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+                    await conn.execute(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                        f'"{VERSE_KEY_FALLBACK_INDEX}" ON verses ({column_list})'
+                    )
+                    logger.warning(f"⚠️ Duplicate verses prevent unique index {name}, created {VERSE_KEY_FALLBACK_INDEX}")
+            
+            await self._ensure_search_schema(conn, 'verses', {row['name'] for row in rows if row['is_valid']})
+            await self._backfill_folded_transliteration(conn)
+            await self._ensure_verse_blocks_schema(conn)
+        DatabaseManager._schema_verified.add(self.database_url)
+    
+    async def _ensure_content_hash_column(self, conn, table: str):
+        """Add the content hash column to a table if missing; rows written before it are rewritten once"""
+        exists = await conn.fetchval(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = $1 AND column_name = $2
+            """,
+            table,
+            CONTENT_HASH_COLUMN
+        )
+        if not exists:
+            await conn.execute(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "{CONTENT_HASH_COLUMN}" TEXT')
+            logger.info(f"✅ Added content hash column {table}.{CONTENT_HASH_COLUMN}")
+    
+    async def _ensure_quality_schema(self, conn):
+        """Add the parse quality columns of verses if missing (their index is in VERSE_INDEXES)"""
+        existing_columns = {
+            row['column_name'] for row in await conn.fetch(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = 'verses' AND column_name = ANY($1::text[])
+                """,
+                list(QUALITY_COLUMNS)
+            )
+        }
+        for column, column_type in QUALITY_COLUMNS.items():
+            if column not in existing_columns:
+                await conn.execute(f'ALTER TABLE verses ADD COLUMN IF NOT EXISTS "{column}" {column_type}')
+                logger.info(f"✅ Added quality column verses.{column}")
+    
+    async def _ensure_verse_blocks_schema(self, conn):
+        """Create the merged verse block table and its search columns if missing"""
+        await conn.execute(VERSE_BLOCKS_TABLE)
+        await self._ensure_content_hash_column(conn, 'verse_blocks')
+        valid_indexes = {
+            row['name'] for row in await conn.fetch(
+                """
+                SELECT c.relname AS name
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'verse_blocks'::regclass AND i.indisvalid
+                """
+            )
+        }
+        await self._ensure_search_schema(conn, 'verse_blocks', valid_indexes)
+        
+        if not await conn.fetchval('SELECT to_regclass($1)', VERSES_RESOLVED_VIEW):
+            await conn.execute(
+                f"CREATE OR REPLACE VIEW {VERSES_RESOLVED_VIEW} AS SELECT {VERSE_COLUMNS} FROM verses {VERSE_BLOCK_JOIN}"
+            )
+            logger.info(f"✅ Created view {VERSES_RESOLVED_VIEW}")
+    
+    async def _ensure_search_schema(self, conn, table: str, valid_indexes: set):
+        """Add the search columns, pg_trgm and the search indexes of a table if missing"""
+        existing_columns = {
+            row['column_name'] for row in await conn.fetch(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = $2 AND column_name = ANY($1::text[])
+                """,
+                [*SEARCH_COLUMNS, FOLDED_TRANSLITERATION_COLUMN],
+                table
+            )
+        }
+        if FOLDED_TRANSLITERATION_COLUMN not in existing_columns:
+            await conn.execute(
+                f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "{FOLDED_TRANSLITERATION_COLUMN}" TEXT'
+            )
+        
+        for column, expression in SEARCH_COLUMNS.items():
+            if column not in existing_columns:
+                # Stored generated columns are filled by Postgres during every upsert
+                await conn.execute(
+                    f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "{column}" tsvector '
+                    f'GENERATED ALWAYS AS ({expression}) STORED'
+                )
+                logger.info(f"✅ Added search column {table}.{column}")
+        
+        # verses_search_text_idx -> verse_blocks_search_text_idx
+        indexes = {name.replace('verses', table, 1): definition for name, definition in SEARCH_INDEXES.items()}
+        missing_indexes = [name for name in indexes if name not in valid_indexes]
+        if not missing_indexes:
+            return
+        
+        await conn.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name in missing_indexes:
+            await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+            await conn.execute(f'CREATE INDEX CONCURRENTLY "{name}" ON {table} {indexes[name]}')
+            logger.info(f"✅ Created search index {name}")
+    
+    async def _backfill_folded_transliteration(self, conn) -> int:
+        """Fold transliterations of rows written without the folded column (e.g. by Prisma)"""
+        rows = await conn.fetch(
+            f"""
+            SELECT id, transliteration FROM verses
+            WHERE "{FOLDED_TRANSLITERATION_COLUMN}" IS NULL AND transliteration IS NOT NULL
+            """
+        )
+        if rows:
+            await conn.executemany(
+                f'UPDATE verses SET "{FOLDED_TRANSLITERATION_COLUMN}" = $2 WHERE id = $1',
+                [(row['id'], fold_transliteration(row['transliteration'])) for row in rows]
+            )
+            logger.info(f"✅ Folded transliteration of {len(rows)} verses")
+        return len(rows)
+    
+    @staticmethod
+    def _with_content_hash(row: tuple, updated_at_index: int) -> tuple:
+        """Append the content hash of a write row, computed over everything but its timestamp"""
+        return row + (content_hash(row[:updated_at_index] + row[updated_at_index + 1:]),)
+    
+    @classmethod
+    def _verse_row(cls, verse: VerseRecord, updated_at: datetime, merged_with: str = None) -> tuple:
+        """Build verse_upsert arguments for a parsed verse
+        
+        Verses of a merged block are written without text, it is stored once in
+        the block row; merged_with is the JSON encoded verse list of the block.
+        """
+        quality = verse.quality
+        quality_score = quality.score if quality else None
+        quality_json = json.dumps(quality.to_json()) if quality else None
+        
+        if verse.block:
+            row = (
+                verse.title,
+                verse.chapter,
+                verse.verse_number,
+                verse.language,
+                '',
+                None,
+                None,
+                '',
+                None,
+                verse.source,
+                True,
+                merged_with,
+                verse.block.id,
+                verse.canto,
+                updated_at,
+                None,
+                quality_score,
+                quality_json
+            )
+            return cls._with_content_hash(row, 14)
+        
+        row = (
+            verse.title,
+            verse.chapter,
+            verse.verse_number,
+            verse.language,
+            verse.sanskrit,
+            verse.transliteration,
+            verse.word_by_word_translation,
+            verse.translation,
+            verse.commentary,
+            verse.source,
+            False,
+            None,
+            None,
+            verse.canto,
+            updated_at,
+            fold_transliteration(verse.transliteration) if verse.transliteration else None,
+            quality_score,
+            quality_json
+        )
+        return cls._with_content_hash(row, 14)
+    
+    @classmethod
+    def _verse_block_row(cls, block: MergedBlock, updated_at: datetime) -> tuple:
+        """Build verse_block_upsert arguments for a merged block"""
+        row = (
+            block.id,
+            block.title,
+            block.canto,
+            block.chapter,
+            list(block.verse_numbers),
+            block.sanskrit,
+            block.transliteration,
+            block.word_by_word_translation,
+            block.translation,
+            block.commentary,
+            block.source,
+            block.language,
+            fold_transliteration(block.transliteration) if block.transliteration else None,
+            updated_at
+        )
+        return cls._with_content_hash(row, 13)
+    
+    def _write_rows(self, verses: List[VerseRecord], updated_at: datetime) -> tuple:
+        """Build the block rows and verse rows for saving verses: (block_rows, verse_rows)"""
+        blocks = {verse.block.id: verse.block for verse in verses if verse.block}
+        merged_with = {block_id: json.dumps(list(block.verse_numbers)) for block_id, block in blocks.items()}
+        
+        block_rows = [self._verse_block_row(block, updated_at) for block in blocks.values()]
+        rows = [
+            self._verse_row(verse, updated_at, merged_with[verse.block.id] if verse.block else None)
+            for verse in verses
+        ]
+        return block_rows, rows
+    
+    async def _unchanged_rows(self, conn, block_rows: List[tuple], rows: List[tuple]) -> tuple:
+        """Positions of the block rows and verse rows whose stored content hash equals theirs"""
+        unchanged_blocks = set()
+        if block_rows:
+            stored = {
+                record['id']: record['contentHash']
+                for record in await (await self._statement(conn, 'verse_block_hashes')).fetch(
+                    [row[0] for row in block_rows]
+                )
+            }
+            unchanged_blocks = {
+                index for index, row in enumerate(block_rows) if stored.get(row[0]) == row[-1]
+            }
+        
+        # Key -> stored hashes; duplicate rows of a key (no unique index) must all match
+        stored_hashes: Dict[int, set] = {}
+        records = await (await self._statement(conn, 'verse_hashes')).fetch(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            [row[3] for row in rows],
+            [row[13] for row in rows]
+        )
+        for record in records:
+            stored_hashes.setdefault(record['key_index'] - 1, set()).add(record['contentHash'])
+        unchanged_verses = {
+            index for index, row in enumerate(rows) if stored_hashes.get(index) == {row[-1]}
+        }
+        return unchanged_blocks, unchanged_verses
+    
+    async def save_verses(self, verses: List[VerseRecord]) -> int:
+        """Save verses to database, merged blocks first
+        
+        Rows whose content hash matches the stored one are skipped and counted
+        as saved; write_stats keeps the written and skipped rows and text bytes.
+        """
         if not verses:
             return 0
         
+        block_rows, rows = self._write_rows(verses, datetime.utcnow())
         saved_count = 0
         
-        async with self.pool.acquire() as conn:
-            for verse in verses:
-                try:
-                    # Use individual transactions for each verse to avoid rollback issues
-                    async with conn.transaction():
-                        # Check if verse already exists
-                        existing = await conn.fetchrow(
-                            """
-                            SELECT id FROM verses 
-                            WHERE title = $1 AND chapter = $2 AND "verseNumber" = $3 AND language = $4
-                            """,
-                            verse.title, verse.chapter, verse.verse_number, verse.language
-                        )
-                        
-                        if existing:
-                            # Update existing verse
-                            await conn.execute(
-                                """
-                                UPDATE verses SET
-                                    sanskrit = $1,
-                                    transliteration = $2,
-                                    "wordByWordTranslation" = $3,
-                                    translation = $4,
-                                    commentary = $5,
-                                    source = $6,
-                                    "isMergedVerse" = $7,
-                                    "mergedWith" = $8,
-                                    "mergedBlockId" = $9,
-                                    canto = $10,
-                                    "updatedAt" = $11
-                                WHERE id = $12
-                                """,
-                                verse.sanskrit,
-                                verse.transliteration,
-                                verse.word_by_word_translation,
-                                verse.translation,
-                                verse.commentary,
-                                verse.source,
-                                verse.metadata.get('is_merged_verse', False) if verse.metadata else False,
-                                json.dumps(verse.metadata.get('merged_with', [])) if verse.metadata and verse.metadata.get('merged_with') else None,
-                                verse.metadata.get('merged_block_id') if verse.metadata else None,
-                                verse.canto,
-                                datetime.utcnow(),
-                                existing['id']
-                            )
-                        else:
-                            # Insert new verse
-                            await conn.execute(
-                                """
-                                INSERT INTO verses (
-                                    id, title, chapter, "verseNumber", sanskrit, transliteration,
-                                    "wordByWordTranslation", translation, commentary, source, language, 
-                                    "isMergedVerse", "mergedWith", "mergedBlockId", canto, "createdAt", "updatedAt"
-                                ) VALUES (
-                                    gen_random_uuid()::text, $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16
-                                )
-                                """,
-                                verse.title,
-                                verse.chapter,
-                                verse.verse_number,
-                                verse.sanskrit,
-                                verse.transliteration,
-                                verse.word_by_word_translation,
-                                verse.translation,
-                                verse.commentary,
-                                verse.source,
-                                verse.language,
-                                verse.metadata.get('is_merged_verse', False) if verse.metadata else False,
-                                json.dumps(verse.metadata.get('merged_with', [])) if verse.metadata and verse.metadata.get('merged_with') else None,
-                                verse.metadata.get('merged_block_id') if verse.metadata else None,
-                                verse.canto,
-                                datetime.utcnow(),
-                                datetime.utcnow()
-                            )
-                        
+        async with self._acquire('save_verses') as conn:
+            block_upsert = await self._statement(conn, 'verse_block_upsert')
+            upsert = await self._statement(conn, 'verse_upsert')
+            try:
+                unchanged_blocks, unchanged_verses = await self._unchanged_rows(conn, block_rows, rows)
+            except asyncpg.PostgresError as e:
+                # E.g. no verse_blocks table yet: write everything, the upsert still skips unchanged rows
+                logger.warning(f"⚠️ Could not read stored content hashes ({e}), writing all rows")
+                unchanged_blocks, unchanged_verses = set(), set()
+            
+            stats = self.write_stats
+            stats.blocks_unchanged += len(unchanged_blocks)
+            stats.verses_unchanged += len(unchanged_verses)
+            stats.bytes_skipped += sum(_text_bytes(block_rows[index]) for index in unchanged_blocks)
+            stats.bytes_skipped += sum(_text_bytes(rows[index]) for index in unchanged_verses)
+            saved_count = len(unchanged_verses)
+            
+            block_rows = [row for index, row in enumerate(block_rows) if index not in unchanged_blocks]
+            changed = [index for index in range(len(rows)) if index not in unchanged_verses]
+            verses = [verses[index] for index in changed]
+            rows = [rows[index] for index in changed]
+            stats.blocks_written += len(block_rows)
+            stats.bytes_written += sum(map(_text_bytes, block_rows))
+            try:
+                # Fast path: the whole batch in one transaction
+                async with conn.transaction():
+                    if block_rows:
+                        await block_upsert.executemany(block_rows)
+                    if rows:
+                        await upsert.executemany(rows)
+                saved_count += len(rows)
+                stats.verses_written += len(rows)
+                stats.bytes_written += sum(map(_text_bytes, rows))
+            except Exception as e:
+                logger.warning(f"⚠️ Batch save failed ({e}), saving verses one by one")
+                for block_row in block_rows:
+                    try:
+                        async with conn.transaction():
+                            await block_upsert.fetch(*block_row)
+                    except Exception as e:
+                        logger.error(f"❌ Error saving merged block {block_row[0]}: {e}")
+                
+                for verse, row in zip(verses, rows):
+                    try:
+                        # Individual transactions so one bad verse doesn't roll back the rest
+                        async with conn.transaction():
+                            await upsert.fetch(*row)
                         saved_count += 1
-                        
-                except Exception as e:
-                    print(f"❌ Error saving verse {verse.chapter}.{verse.verse_number}: {e}")
-                    continue
+                        stats.verses_written += 1
+                        stats.bytes_written += _text_bytes(row)
+                    except Exception as e:
+                        logger.error(
+                            f"❌ Error saving verse {verse.chapter}.{verse.verse_number}: {e}",
+                            extra={'chapter': verse.chapter, 'verse': verse.verse_number}
+                        )
+                        continue
+            
+            # Chapters whose rows changed, including those of rewritten blocks
+            changed_chapters = {(verse.title, verse.chapter, verse.language, verse.canto) for verse in verses}
+            changed_chapters.update((row[1], row[3], row[11], row[2]) for row in block_rows)
+            await self._announce_changes(conn, changed_chapters)
         
-        print(f"✅ Saved {saved_count} verses to database")
+        details = []
+        if block_rows:
+            details.append(f"{len(block_rows)} merged blocks")
+        if unchanged_verses:
+            details.append(f"{len(unchanged_verses)} unchanged")
+        details = f" ({', '.join(details)})" if details else ""
+        logger.info(f"✅ Saved {saved_count} verses to database{details}")
         return saved_count
     
-    async def save_parse_record(self, result: ParseResult, user_id: str = None) -> str:
+    @staticmethod
+    async def _announce_changes(conn, chapters: Optional[Iterable[tuple]]):
+        """NOTIFY the verse caches of changed (title, chapter, language, canto) chapters, all when None"""
+        if chapters is None:
+            payloads = ['*']
+        else:
+            chapters = sorted(chapters, key=str)
+            payloads = [
+                json.dumps(chapters[start:start + CHANGED_CHAPTERS_PER_NOTIFY], ensure_ascii=False)
+                for start in range(0, len(chapters), CHANGED_CHAPTERS_PER_NOTIFY)
+            ]
+        try:
+            for payload in payloads:
+                await conn.execute('SELECT pg_notify($1, $2)', VERSE_CACHE_CHANNEL, payload)
+        except asyncpg.PostgresError as e:
+            # The verses are saved; caches then serve the old text until their entries expire
+            logger.warning(f"⚠️ Could not announce changed chapters to verse caches: {e}")
+    
+    async def save_parse_record(self, result: 'ParseResult', user_id: str = None) -> str:
         """Save parse operation record"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire('save_parse_record') as conn:
             # Get or create system user
             if not user_id:
                 user_id = await conn.fetchval(
@@ -190,20 +1003,14 @@ class DatabaseManager:
                 datetime.utcnow()
             )
         
-        print(f"✅ Saved parse record: {record_id}")
+        logger.info(f"✅ Saved parse record: {record_id}")
         return record_id
     
     async def get_verse_count(self, text_type: str = None) -> int:
         """Get total verse count"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire('get_verse_count') as conn:
             if text_type:
-                # Map text type to title
-                title_map = {
-                    'bg': 'Бхагавад-гита',
-                    'sb': 'Шримад-Бхагаватам',
-                    'cc': 'Шри Чайтанья-чаритамрита'
-                }
-                title = title_map.get(text_type)
+                title = TITLE_MAP.get(text_type)
                 if title:
                     count = await conn.fetchval(
                         "SELECT COUNT(*) FROM verses WHERE title = $1",
@@ -216,28 +1023,249 @@ class DatabaseManager:
         
         return count
     
+    async def get_verse_stats(self) -> dict:
+        """Get verse statistics by text, canto, chapter and language in one grouped query"""
+        completeness_columns = ',\n'.join(
+            f"COUNT(*) FILTER (WHERE COALESCE({RESOLVED_TEXT_COLUMNS[column]}, '') <> '') AS with_{key}"
+            for key, column in COMPLETENESS_FIELDS.items()
+        )
+        
+        async with self._acquire('get_verse_stats') as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT title, canto, chapter, language,
+                       GROUPING(title, canto, chapter, language) AS level,
+                       COUNT(*) AS verses,
+                       COUNT(*) FILTER (WHERE "isMergedVerse") AS merged_verses,
+                       {completeness_columns}
+                FROM verses
+                {VERSE_BLOCK_JOIN}
+                GROUP BY GROUPING SETS (
+                    (), (language), (title), (title, language), (title, canto), (title, canto, chapter)
+                )
+                """
+            )
+        
+        return self._build_verse_stats(rows)
+    
+    @staticmethod
+    def _build_verse_stats(rows: List[dict]) -> dict:
+        """Fold grouping-set rows of get_verse_stats into a nested statistics dict"""
+        # GROUPING() bitmask: title=8, canto=4, chapter=2, language=1 (bit set = aggregated away)
+        levels = {
+            15: 'total',
+            14: 'language',
+            7: 'title',
+            6: 'title_language',
+            3: 'title_canto',
+            1: 'title_canto_chapter'
+        }
+        text_types = {title: code for code, title in TITLE_MAP.items()}
+        
+        def completeness(row) -> dict:
+            return {key: row[f'with_{key}'] for key in COMPLETENESS_FIELDS}
+        
+        stats = {
+            'total_verses': 0,
+            'merged_verses': 0,
+            'completeness': {key: 0 for key in COMPLETENESS_FIELDS},
+            'by_text_type': {code: 0 for code in TITLE_MAP},
+            'by_language': {},
+            'by_title': {}
+        }
+        
+        def title_entry(title: str) -> dict:
+            if title not in stats['by_title']:
+                stats['by_title'][title] = {
+                    'text_type': text_types.get(title),
+                    'total_verses': 0,
+                    'merged_verses': 0,
+                    'completeness': {},
+                    'by_language': {},
+                    'cantos': [],
+                    'chapters': []
+                }
+            return stats['by_title'][title]
+        
+        for row in rows:
+            level = levels.get(row['level'])
+            
+            if level == 'total':
+                stats['total_verses'] = row['verses']
+                stats['merged_verses'] = row['merged_verses']
+                stats['completeness'] = completeness(row)
+            elif level == 'language':
+                stats['by_language'][row['language']] = row['verses']
+            elif level == 'title':
+                entry = title_entry(row['title'])
+                entry['total_verses'] = row['verses']
+                entry['merged_verses'] = row['merged_verses']
+                entry['completeness'] = completeness(row)
+                if entry['text_type']:
+                    stats['by_text_type'][entry['text_type']] = row['verses']
+            elif level == 'title_language':
+                title_entry(row['title'])['by_language'][row['language']] = row['verses']
+            elif level == 'title_canto' and row['canto'] is not None:
+                title_entry(row['title'])['cantos'].append({
+                    'canto': row['canto'],
+                    'verses': row['verses']
+                })
+            elif level == 'title_canto_chapter':
+                title_entry(row['title'])['chapters'].append({
+                    'canto': row['canto'],
+                    'chapter': row['chapter'],
+                    'verses': row['verses']
+                })
+        
+        for entry in stats['by_title'].values():
+            entry['cantos'].sort(key=lambda c: c['canto'])
+            entry['chapters'].sort(key=lambda c: (c['canto'] or 0, c['chapter']))
+            for canto in entry['cantos']:
+                canto['chapters'] = sum(1 for c in entry['chapters'] if c['canto'] == canto['canto'])
+        
+        return stats
+    
+    async def get_quality_report(self, text_type: str = None, max_score: float = 0.5, limit: int = 20) -> dict:
+        """Parse quality per text and the worst verses (score below max_score or flagged)"""
+        title = TITLE_MAP.get(text_type) if text_type else None
+        
+        async with self._acquire('get_quality_report') as conn:
+            summary = await conn.fetch(
+                f"""
+                SELECT title, COUNT(*) AS verses, COUNT("qualityScore") AS scored,
+                       AVG("qualityScore") AS mean_score,
+                       COUNT(*) FILTER (WHERE {LOW_QUALITY_MATCH}) AS low_quality
+                FROM verses
+                WHERE $2::text IS NULL OR title = $2
+                GROUP BY title
+                ORDER BY title
+                """,
+                max_score,
+                title
+            )
+            anomalies = await conn.fetch(
+                """
+                SELECT anomaly, COUNT(*) AS verses
+                FROM verses, jsonb_array_elements_text(quality->'anomalies') AS anomaly
+                WHERE $1::text IS NULL OR title = $1
+                GROUP BY anomaly
+                ORDER BY verses DESC
+                """,
+                title
+            )
+            worst = await conn.fetch(
+                f"""
+                SELECT title, canto, chapter, "verseNumber", "qualityScore", quality
+                FROM verses
+                WHERE {LOW_QUALITY_MATCH} AND ($2::text IS NULL OR title = $2)
+                ORDER BY "qualityScore", title, canto, chapter, "verseNumber"
+                LIMIT $3
+                """,
+                max_score,
+                title,
+                limit
+            )
+        
+        return {
+            'texts': [
+                {**dict(row), 'mean_score': round(row['mean_score'], 4) if row['mean_score'] is not None else None}
+                for row in summary
+            ],
+            'anomalies': {row['anomaly']: row['verses'] for row in anomalies},
+            'worst': [{**dict(row), 'quality': json.loads(row['quality'])} for row in worst]
+        }
+    
     async def get_verses_by_chapter(self, title: str, chapter: int, limit: int = None) -> List[dict]:
         """Get verses by title and chapter"""
-        async with self.pool.acquire() as conn:
-            query = """
-                SELECT id, title, chapter, "verseNumber", sanskrit, transliteration, 
-                       translation, commentary, source, language, "createdAt", "updatedAt"
-                FROM verses 
-                WHERE title = $1 AND chapter = $2
-                ORDER BY "verseNumber"
-            """
-            params = [title, chapter]
-            
-            if limit:
-                query += " LIMIT $3"
-                params.append(limit)
-            
-            rows = await conn.fetch(query, *params)
+        async with self._acquire('get_verses_by_chapter') as conn:
+            # LIMIT NULL means no limit, so one statement serves both cases
+            statement = await self._statement(conn, 'verses_by_chapter')
+            rows = await statement.fetch(title, chapter, limit)
             return [dict(row) for row in rows]
     
+    async def get_verses_by_keys(self, keys: Iterable[VerseKey]) -> Dict[VerseKey, dict]:
+        """Get many verses by natural key in one index-backed query"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        
+        async with self._acquire('get_verses_by_keys') as conn:
+            statement = await self._statement(conn, 'verses_by_keys')
+            rows = await statement.fetch(
+                [key.title for key in keys],
+                [key.chapter for key in keys],
+                [key.verse_number for key in keys],
+                [key.language for key in keys],
+                [key.canto for key in keys]
+            )
+        
+        return {
+            VerseKey(row['title'], row['chapter'], row['verseNumber'], row['language'], row['canto']): dict(row)
+            for row in rows
+        }
+    
+    async def get_chapter_range(self,
+                                title: str,
+                                chapter: int,
+                                first_verse: int = 1,
+                                last_verse: int = None,
+                                canto: int = None,
+                                language: str = 'ru') -> List[dict]:
+        """Get a contiguous range of verses of a chapter (canto is required for SB)"""
+        if last_verse is None:
+            last_verse = 2 ** 31 - 1
+        
+        async with self._acquire('get_chapter_range') as conn:
+            if canto is None:
+                statement = await self._statement(conn, 'chapter_range')
+                rows = await statement.fetch(title, chapter, language, first_verse, last_verse)
+            else:
+                statement = await self._statement(conn, 'canto_chapter_range')
+                rows = await statement.fetch(title, chapter, language, first_verse, last_verse, canto)
+        
+        return [dict(row) for row in rows]
+    
+    async def search_verses(self,
+                            query: str,
+                            title: str = None,
+                            language: str = 'ru',
+                            limit: int = 20,
+                            offset: int = 0) -> dict:
+        """Ranked, paginated search over translation, commentary and transliteration
+        
+        Supports websearch syntax ("quoted phrases", -exclusions, or) and falls back
+        to trigram-indexed substring matching for partial words. Transliteration is
+        also matched diacritic-insensitively, so "дхритараштра" finds "дхр̣тара̄шт̣ра".
+        """
+        query = (query or '').strip()
+        if not query:
+            return {'total': 0, 'limit': limit, 'offset': offset, 'results': []}
+        
+        # Escape LIKE wildcards so the query is matched literally
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f'%{escaped}%'
+        # Folding drops punctuation, so the folded query never contains LIKE wildcards
+        folded = fold_transliteration(query)
+        folded_pattern = f'%{folded}%' if folded else None
+        
+        async with self._acquire('search_verses') as conn:
+            statement = await self._statement(conn, 'search_verses')
+            rows = await statement.fetch(query, pattern, language, title, limit, offset, folded_pattern)
+        
+        results = [dict(row) for row in rows]
+        for result in results:
+            result.pop('total')
+        
+        return {
+            'total': rows[0]['total'] if rows else 0,
+            'limit': limit,
+            'offset': offset,
+            'results': results
+        }
+    
     async def get_parse_records(self, limit: int = 10) -> List[dict]:
         """Get recent parse records"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire('get_parse_records') as conn:
             records = await conn.fetch(
                 """
                 SELECT id, "textType", "totalVerses", "totalErrors", success, "createdAt"
@@ -252,39 +1280,44 @@ class DatabaseManager:
     
     async def clear_verses(self, text_type: str = None):
         """Clear verses from database"""
-        async with self.pool.acquire() as conn:
+        async with self._acquire('clear_verses') as conn:
             if text_type:
-                title_map = {
-                    'bg': 'Бхагавад-гита',
-                    'sb': 'Шримад-Бхагаватам',
-                    'cc': 'Шри Чайтанья-чаритамрита'
-                }
-                title = title_map.get(text_type)
+                title = TITLE_MAP.get(text_type)
                 if title:
                     deleted = await conn.execute(
                         "DELETE FROM verses WHERE title = $1",
                         title
                     )
-                    print(f"✅ Deleted verses for {title}")
+                    await conn.execute("DELETE FROM verse_blocks WHERE title = $1", title)
+                    logger.info(f"✅ Deleted verses for {title}")
                 else:
-                    print(f"❌ Unknown text type: {text_type}")
+                    logger.error(f"❌ Unknown text type: {text_type}")
             else:
                 deleted = await conn.execute("DELETE FROM verses")
-                print("✅ Deleted all verses")
+                await conn.execute("DELETE FROM verse_blocks")
+                logger.info("✅ Deleted all verses")
+            await self._announce_changes(conn, None)
     
     async def get_verses_for_backup(self, 
                                   language: str = None,
                                   source: str = None,
                                   canto: int = None) -> List[dict]:
         """Get verses for backup with optional filters"""
-        async with self.pool.acquire() as conn:
-            query = """
-                SELECT id, "sessionId", chapter, "verseNumber", sanskrit, translation, 
-                       commentary, "assignedTo", "isRead", "readAt", "order", "createdAt", 
-                       "createdBy", language, source, title, transliteration, "updatedAt",
-                       "wordByWordTranslation", "isMergedVerse", "mergedWith", "mergedBlockId", 
+        async with self._acquire('get_verses_for_backup') as conn:
+            # Merged block text is resolved, so backups restore as self-contained verse rows
+            query = f"""
+                SELECT id, "sessionId", chapter, "verseNumber",
+                       {RESOLVED_TEXT_COLUMNS['sanskrit']} AS sanskrit,
+                       {RESOLVED_TEXT_COLUMNS['translation']} AS translation,
+                       {RESOLVED_TEXT_COLUMNS['commentary']} AS commentary,
+                       "assignedTo", "isRead", "readAt", "order", "createdAt", 
+                       "createdBy", language, source, title,
+                       {RESOLVED_TEXT_COLUMNS['transliteration']} AS transliteration, "updatedAt",
+                       {RESOLVED_TEXT_COLUMNS['"wordByWordTranslation"']} AS "wordByWordTranslation",
+                       "isMergedVerse", "mergedWith", "mergedBlockId", 
                        canto, metadata
-                FROM verses 
+                FROM verses
+                {VERSE_BLOCK_JOIN}
                 WHERE 1=1
             """
             params = []
@@ -312,7 +1345,10 @@ class DatabaseManager:
     
     async def save_verse(self, verse_data: dict) -> bool:
         """Save a single verse to database"""
-        async with self.pool.acquire() as conn:
+        transliteration = verse_data.get('transliteration')
+        # Diacritic-free search needs the folded column, as written by verse_upsert
+        folded = fold_transliteration(transliteration) if transliteration else None
+        async with self._acquire('save_verse') as conn:
             try:
                 async with conn.transaction():
                     # Check if verse already exists
@@ -320,9 +1356,11 @@ class DatabaseManager:
                         """
                         SELECT id FROM verses 
                         WHERE title = $1 AND chapter = $2 AND "verseNumber" = $3 AND language = $4
+                          AND canto IS NOT DISTINCT FROM $5
                         """,
                         verse_data['title'], verse_data['chapter'], 
-                        verse_data['verseNumber'], verse_data['language']
+                        verse_data['verseNumber'], verse_data['language'],
+                        verse_data.get('canto')
                     )
                     
                     if existing:
@@ -347,7 +1385,9 @@ class DatabaseManager:
                                 "mergedBlockId" = $15,
                                 canto = $16,
                                 metadata = $17,
-                                "updatedAt" = $18
+                                "updatedAt" = $18,
+                                "transliterationFolded" = $20,
+                                "contentHash" = NULL
                             WHERE id = $19
                             """,
                             verse_data.get('sessionId'),
@@ -368,7 +1408,8 @@ class DatabaseManager:
                             verse_data.get('canto'),
                             verse_data.get('metadata'),
                             datetime.utcnow(),
-                            existing['id']
+                            existing['id'],
+                            folded
                         )
                     else:
                         # Insert new verse
@@ -379,9 +1420,10 @@ class DatabaseManager:
                                 commentary, "assignedTo", "isRead", "readAt", "order", "createdAt",
                                 "createdBy", language, source, title, transliteration, "updatedAt",
                                 "wordByWordTranslation", "isMergedVerse", "mergedWith", "mergedBlockId",
-                                canto, metadata
+                                canto, metadata, "transliterationFolded"
                             ) VALUES (
-                                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24
+                                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24,
+                                $25
                             )
                             """,
                             verse_data['id'],
@@ -407,11 +1449,15 @@ class DatabaseManager:
                             verse_data.get('mergedWith'),
                             verse_data.get('mergedBlockId'),
                             verse_data.get('canto'),
-                            verse_data.get('metadata')
+                            verse_data.get('metadata'),
+                            folded
                         )
                     
+                    await self._announce_changes(conn, [(
+                        verse_data['title'], verse_data['chapter'], verse_data.get('language', 'ru'), verse_data.get('canto')
+                    )])
                     return True
                     
             except Exception as e:
-                print(f"❌ Error saving verse {verse_data.get('id', 'unknown')}: {e}")
+                logger.error(f"❌ Error saving verse {verse_data.get('id', 'unknown')}: {e}")
                 return False
\ No newline at end of file
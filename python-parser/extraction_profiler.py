@@ -0,0 +1,225 @@
+"""
+Hit-rate profiler of the verse extraction strategies
+
+Every verse element goes through a cascade of strategies: advanced element
+extraction, then the alternative methods (direct text, context, reconstruction
+from fragments), and the page-level alternative extraction when a chapter
+yields nothing. The profiler records attempts, hits (a validated verse), errors
+and time of each strategy per chapter and per run, and reports which fallbacks
+never pay off and in which order they would be cheapest.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from metrics import crawl_metrics
+
+# Strategies in the order the engine tries them; each chain stops at the first hit
+STRATEGY_CHAINS = {
+    'element': ('advanced_element', 'text_direct', 'context', 'reconstruct'),
+    'merged': ('merged_block',),
+    'page': ('page_alternative',),
+}
+
+# Fallbacks that may be reordered or dropped (the first strategy of a chain always runs)
+FALLBACK_CHAINS = {
+    'element': STRATEGY_CHAINS['element'][1:],
+}
+
+# Attempts needed before a strategy with no hits is suggested for removal
+MIN_ATTEMPTS_TO_DROP = 20
+
+
+class StrategyStats:
+    """Attempts, hits, errors and time of one strategy"""
+    
+    __slots__ = ('attempts', 'hits', 'errors', 'produced', 'seconds', 'wasted_seconds')
+    
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.errors = 0
+        # Verses kept from this strategy (a low quality advanced element verse is kept as a last resort)
+        self.produced = 0
+        self.seconds = 0.0
+        # Time of attempts that did not produce a hit
+        self.wasted_seconds = 0.0
+    
+    def add(self, other: 'StrategyStats'):
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+    
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+    
+    def snapshot(self) -> dict:
+        return {
+            'attempts': self.attempts,
+            'hits': self.hits,
+            'errors': self.errors,
+            'produced': self.produced,
+            'hit_rate': round(self.hit_rate, 4),
+            'seconds': round(self.seconds, 6),
+            'wasted_seconds': round(self.wasted_seconds, 6),
+            'avg_ms': round(self.seconds / self.attempts * 1000, 4) if self.attempts else 0.0
+        }
+
+
+class StrategyAttempt:
+    """Outcome of one attempt, set by the caller inside ExtractionProfiler.attempt()"""
+    
+    __slots__ = ('hit',)
+    
+    def __init__(self):
+        self.hit = False
+
+
+class ExtractionProfiler:
+    """Per-chapter and per-run accounting of extraction strategy attempts"""
+    
+    def __init__(self, metrics=crawl_metrics):
+        self.metrics = metrics
+        # (text type, chapter label) -> strategy -> stats
+        self._chapters: Dict[Tuple[str, str], Dict[str, StrategyStats]] = {}
+    
+    def _stats(self, text_type: str, chapter: str, strategy: str) -> StrategyStats:
+        strategies = self._chapters.setdefault((text_type, chapter), {})
+        stats = strategies.get(strategy)
+        if stats is None:
+            stats = strategies[strategy] = StrategyStats()
+        return stats
+    
+    @contextmanager
+    def attempt(self, text_type: str, chapter: str, strategy: str):
+        """Time one strategy attempt; the caller sets `hit` on the yielded StrategyAttempt"""
+        outcome = StrategyAttempt()
+        error = False
+        start = time.perf_counter()
+        try:
+            yield outcome
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self._stats(text_type, chapter, strategy)
+            stats.attempts += 1
+            stats.seconds += elapsed
+            if error:
+                stats.errors += 1
+            if outcome.hit and not error:
+                stats.hits += 1
+            else:
+                stats.wasted_seconds += elapsed
+            
+            result = 'error' if error else 'hit' if outcome.hit else 'miss'
+            self.metrics.observe('parser_extract_seconds', elapsed, text=text_type, method=strategy)
+            self.metrics.increment('parser_extract_attempts_total', text=text_type, method=strategy, outcome=result)
+    
+    def produced(self, text_type: str, chapter: str, strategy: str, count: int = 1):
+        """Count verses kept from a strategy"""
+        self._stats(text_type, chapter, strategy).produced += count
+    
+    def chapter_stats(self, text_type: str, chapter: str) -> Dict[str, StrategyStats]:
+        return self._chapters.get((text_type, chapter), {})
+    
+    def run_stats(self) -> Dict[str, Dict[str, StrategyStats]]:
+        """Stats per text type, summed over all chapters of the run"""
+        totals: Dict[str, Dict[str, StrategyStats]] = {}
+        for (text_type, _), strategies in self._chapters.items():
+            text_totals = totals.setdefault(text_type, {})
+            for strategy, stats in strategies.items():
+                text_totals.setdefault(strategy, StrategyStats()).add(stats)
+        return totals
+    
+    def recommendations(self, strategies: Dict[str, StrategyStats]) -> List[str]:
+        """Fallbacks to drop and the cheapest fallback order for one text"""
+        advice = []
+        total_seconds = sum(stats.seconds for stats in strategies.values())
+        
+        for chain, fallbacks in FALLBACK_CHAINS.items():
+            tried = [strategy for strategy in fallbacks if strategy in strategies]
+            if not tried:
+                advice.append(f"{chain} fallbacks never ran: every attempt hit on {STRATEGY_CHAINS[chain][0]}")
+                continue
+            
+            for strategy in tried:
+                stats = strategies[strategy]
+                if stats.hits == 0 and stats.attempts >= MIN_ATTEMPTS_TO_DROP:
+                    advice.append(
+                        f"drop {strategy}: 0 hits in {stats.attempts} attempts, "
+                        f"{stats.wasted_seconds:.3f}s wasted ({_share(stats.wasted_seconds, total_seconds)} of extraction time)"
+                    )
+            
+            # Expected cost of a sequential search is lowest when ordered by hits per second
+            useful = [strategy for strategy in tried if strategies[strategy].hits]
+            best_order = sorted(
+                useful,
+                key=lambda strategy: strategies[strategy].hits / max(strategies[strategy].seconds, 1e-9),
+                reverse=True
+            )
+            current_order = [strategy for strategy in fallbacks if strategy in useful]
+            if best_order != current_order:
+                advice.append(
+                    f"reorder {chain} fallbacks: {' → '.join(best_order)} "
+                    f"(now {' → '.join(current_order)}; hit rates of later fallbacks are measured after earlier misses)"
+                )
+        
+        if not advice and strategies:
+            advice.append("current strategy order is already the cheapest, nothing to drop")
+        return advice
+    
+    def report(self) -> dict:
+        """Run and per-chapter strategy stats with recommendations, JSON-serializable"""
+        run_stats = self.run_stats()
+        return {
+            'texts': {
+                text_type: {
+                    'strategies': {strategy: stats.snapshot() for strategy, stats in _in_chain_order(strategies)},
+                    'recommendations': self.recommendations(strategies)
+                }
+                for text_type, strategies in run_stats.items()
+            },
+            # Only chapters where a fallback was attempted, the rest are all advanced element hits
+            'chapters': {
+                f"{text_type} {chapter}": {strategy: stats.snapshot() for strategy, stats in _in_chain_order(strategies)}
+                for (text_type, chapter), strategies in self._chapters.items()
+                if any(strategy in strategies for fallbacks in FALLBACK_CHAINS.values() for strategy in fallbacks)
+                or 'page_alternative' in strategies
+            }
+        }
+    
+    def format_report(self) -> List[str]:
+        """Printable run summary: one table per text and its recommendations"""
+        lines = []
+        for text_type, strategies in self.run_stats().items():
+            lines.append(f"🧭 Extraction strategies ({text_type}):")
+            lines.append(f"   {'strategy':<18} {'attempts':>9} {'hits':>7} {'hit rate':>9} {'produced':>9} {'time':>9} {'wasted':>9}")
+            for strategy, stats in _in_chain_order(strategies):
+                lines.append(
+                    f"   {strategy:<18} {stats.attempts:>9} {stats.hits:>7} {stats.hit_rate * 100:>8.1f}% "
+                    f"{stats.produced:>9} {stats.seconds:>8.3f}s {stats.wasted_seconds:>8.3f}s"
+                )
+            for advice in self.recommendations(strategies):
+                lines.append(f"   💡 {advice}")
+        return lines
+    
+    def reset(self):
+        self._chapters.clear()
+
+
+def _in_chain_order(strategies: Dict[str, StrategyStats]) -> List[Tuple[str, StrategyStats]]:
+    order = [strategy for chain in STRATEGY_CHAINS.values() for strategy in chain]
+    return sorted(
+        strategies.items(),
+        key=lambda item: order.index(item[0]) if item[0] in order else len(order)
+    )
+
+
+def _share(part: float, total: float) -> str:
+    return f"{part / total * 100:.1f}%" if total else "0%"
+
+
+# Process-wide profiler shared by all parsers of a run
+extraction_profiler = ExtractionProfiler()
@@ -55,7 +55,7 @@ async def find_chapters_with_merged_verses():
                     verses = await parser.parse_chapter(chapter_num)
                     total_verses_found += len(verses)
                     
-                    merged_verses = [v for v in verses if v.metadata.get('is_merged_verse', False)]
+                    merged_verses = [v for v in verses if v.is_merged]
                     if merged_verses:
                         print(f"     Found {len(merged_verses)} merged verses in parsed data")
                         chapters_with_merged.append({
@@ -1,28 +1,40 @@
 #!/usr/bin/env python3
 """
 Integration API for running Python parser from Node.js
+
+Node spawns a new process per call, so each command imports only what it needs:
+stats/search/status load the database layer, only parse loads the parsers
+(aiohttp, bs4, pydantic). check_import_time.py keeps this within budget.
+
+Every command prints one JSON response line on stdout. `parse` with
+{"stream": true} prints NDJSON instead: one line per progress event
+(chapter_started, chapter_done, verse_batch_saved) as it happens, then the
+response as the "finished" event. Logs always go to stderr.
 """
 import asyncio
+import contextlib
 import json
 import sys
 from typing import Dict, Any
 
-from main import parse_text_type
-from database import DatabaseManager
 
-
-async def run_parser_api(text_type: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
-    """API function for running parser from external systems"""
+async def run_parser_api(text_type: str, options: Dict[str, Any] = None, on_event=None) -> Dict[str, Any]:
+    """API function for running parser from external systems; on_event receives progress events"""
     
     if options is None:
         options = {}
     
     try:
-        # Parse the text type
+        from main import parse_text_type
+        from models import ParsedVerse
+        from selection import WorkSelection
+        
+        # Parse the text type, or the chapters/verses picked by the selection options
         result = await parse_text_type(
             text_type=text_type,
             save_to_db=options.get('save_to_db', True),
-            max_chapters=options.get('max_chapters', None)
+            selection=WorkSelection.from_options(options),
+            on_event=on_event
         )
         
         if result is None:
@@ -44,13 +56,15 @@ async def run_parser_api(text_type: str, options: Dict[str, Any] = None) -> Dict
             'verses_count': len(result.verses),
             'sample_verses': [
                 {
+                    'canto': v.canto,
                     'chapter': v.chapter,
                     'verse_number': v.verse_number,
                     'sanskrit': v.sanskrit[:100] + '...' if len(v.sanskrit) > 100 else v.sanskrit,
                     'translation': v.translation[:100] + '...' if len(v.translation) > 100 else v.translation,
                     'source': v.source
                 }
-                for v in result.verses[:3]  # First 3 verses as sample
+                # Parsers produce VerseRecord tuples, validated models only leave the API
+                for v in map(ParsedVerse.from_record, result.verses[:3])  # First 3 verses as sample
             ]
         }
         
@@ -71,19 +85,11 @@ async def run_parser_api(text_type: str, options: Dict[str, Any] = None) -> Dict
 async def get_database_stats() -> Dict[str, Any]:
     """Get database statistics"""
     try:
+        from database import DatabaseManager
+        
         async with DatabaseManager() as db:
-            total_verses = await db.get_verse_count()
-            
-            stats = {
-                'total_verses': total_verses,
-                'by_text_type': {}
-            }
-            
-            # Get counts by text type
-            text_types = ['bg', 'sb', 'cc']
-            for text_type in text_types:
-                count = await db.get_verse_count(text_type)
-                stats['by_text_type'][text_type] = count
+            # Counts by text, canto, chapter, language and field completeness in one query
+            stats = await db.get_verse_stats()
             
             # Get recent parse records
             records = await db.get_parse_records(5)
@@ -112,6 +118,105 @@ async def get_database_stats() -> Dict[str, Any]:
         }
 
 
+async def search_verses_api(query: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Search verses by phrase of translation, commentary or transliteration"""
+    if options is None:
+        options = {}
+    
+    try:
+        from database import DatabaseManager
+        
+        async with DatabaseManager() as db:
+            found = await db.search_verses(
+                query,
+                title=options.get('title'),
+                language=options.get('language', 'ru'),
+                limit=options.get('limit', 20),
+                offset=options.get('offset', 0)
+            )
+        
+        found['results'] = [
+            {
+                'id': r['id'],
+                'title': r['title'],
+                'canto': r['canto'],
+                'chapter': r['chapter'],
+                'verse_number': r['verseNumber'],
+                'translation': r['translation'],
+                'transliteration': r['transliteration'],
+                'headline': r['headline'],
+                'rank': r['rank']
+            }
+            for r in found['results']
+        ]
+        
+        return {
+            'success': True,
+            'error': None,
+            'data': found
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'data': None
+        }
+
+
+async def get_status() -> Dict[str, Any]:
+    """Availability check: the database is reachable and the verses table exists"""
+    try:
+        from database import DatabaseManager
+        
+        async with DatabaseManager() as db:
+            async with db.pool.acquire() as conn:
+                has_verses = await conn.fetchval("SELECT to_regclass('verses') IS NOT NULL")
+        
+        return {
+            'success': True,
+            'error': None,
+            'data': {
+                'python': sys.version.split()[0],
+                'database': True,
+                'verses_table': has_verses
+            }
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'data': None
+        }
+
+
+async def control_parse(command: str, job_id: str = None) -> Dict[str, Any]:
+    """Send status/pause/resume/cancel to running parses (all of them unless job_id is given)"""
+    try:
+        from job_control import send_command, COMMANDS
+        
+        if command not in COMMANDS or command == 'subscribe':
+            raise ValueError(f"Unknown control command: {command}")
+        
+        replies = await send_command(command, job_id)
+        if job_id and not replies:
+            raise LookupError(f"No running parse job {job_id}")
+        
+        return {
+            'success': True,
+            'error': None,
+            'data': {'jobs': [reply['data'] for reply in replies if reply['success']]}
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'data': None
+        }
+
+
 def main():
     """Main function for command-line interface"""
     if len(sys.argv) < 2:
@@ -147,13 +252,67 @@ def main():
                 }))
                 sys.exit(1)
         
-        result = asyncio.run(run_parser_api(text_type, options))
-        print(json.dumps(result))
+        if options.get('stream'):
+            stdout = sys.stdout
+            
+            def emit(event: Dict[str, Any]):
+                stdout.write(json.dumps(event) + '\n')
+                stdout.flush()
+            
+            # The progress prints of main.py go to stderr, stdout carries only events
+            with contextlib.redirect_stdout(sys.stderr):
+                result = asyncio.run(run_parser_api(text_type, options, on_event=emit))
+            emit({'event': 'finished', **result})
+        else:
+            result = asyncio.run(run_parser_api(text_type, options))
+            print(json.dumps(result))
+        
+    elif command == 'search':
+        if len(sys.argv) < 3:
+            print(json.dumps({
+                'success': False,
+                'error': 'Usage: python integration_api.py search <query> [options_json]',
+                'data': None
+            }))
+            sys.exit(1)
+        
+        query = sys.argv[2]
+        options = {}
+        
+        if len(sys.argv) > 3:
+            try:
+                options = json.loads(sys.argv[3])
+            except json.JSONDecodeError:
+                print(json.dumps({
+                    'success': False,
+                    'error': 'Invalid JSON in options',
+                    'data': None
+                }))
+                sys.exit(1)
+        
+        result = asyncio.run(search_verses_api(query, options))
+        print(json.dumps(result, ensure_ascii=False))
         
     elif command == 'stats':
         result = asyncio.run(get_database_stats())
         print(json.dumps(result))
         
+    elif command == 'status':
+        result = asyncio.run(get_status())
+        print(json.dumps(result))
+        
+    elif command == 'control':
+        if len(sys.argv) < 3:
+            print(json.dumps({
+                'success': False,
+                'error': 'Usage: python integration_api.py control <status|pause|resume|cancel> [job_id]',
+                'data': None
+            }))
+            sys.exit(1)
+        
+        result = asyncio.run(control_parse(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None))
+        print(json.dumps(result))
+        
     else:
         print(json.dumps({
             'success': False,
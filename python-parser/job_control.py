@@ -0,0 +1,314 @@
+"""
+Control of long-running parses: pause, resume, cancel and live progress
+
+A ParseJob is handed to the parser (parser.job). Before a chapter starts,
+the parser stops at the job's pause point: a paused job waits there and a
+cancelled job skips the remaining chapters. Chapters already running finish,
+and their verses are saved. The job counts finished chapters and verses, and
+derives verses/s and an ETA from the time it was not paused. Its on_event
+callback receives chapter_started, chapter_done and verse_batch_saved events
+(integration_api.py streams them to Node as NDJSON).
+
+JobControlServer serves the job on a Unix socket <control_dir>/<job_id>.sock
+with one JSON command per line. status, pause, resume and cancel answer with
+the job's progress; subscribe streams a progress line on every change until
+the job ends. send_command() is the client used by `integration_api.py
+control`, which is how the Next.js admin routes reach running parses.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from logging_setup import ROOT_LOGGER
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.job_control")
+
+# Seconds between progress lines of a subscription when nothing changes
+SUBSCRIBE_KEEPALIVE = 5.0
+
+# Seconds a client waits for a running parse to answer a command
+COMMAND_TIMEOUT = 5.0
+
+COMMANDS = ('status', 'pause', 'resume', 'cancel', 'subscribe')
+
+
+class JobCancelled(Exception):
+    """Raised at the pause point of a cancelled job"""
+
+
+def control_dir(path: str = None) -> Path:
+    """Directory of the control sockets: PARSER_CONTROL_DIR or <tmp>/vedabase-parser"""
+    if path or os.getenv('PARSER_CONTROL_DIR'):
+        return Path(path or os.getenv('PARSER_CONTROL_DIR'))
+    import tempfile
+    return Path(tempfile.gettempdir()) / 'vedabase-parser'
+
+
+class ParseJob:
+    """State and progress of a controllable parse"""
+    
+    def __init__(self, text_type: str, job_id: str = None, chapters_total: int = None,
+                 on_event: Callable[[dict], None] = None):
+        self.text_type = text_type
+        self.job_id = job_id or f"{text_type}-{os.getpid()}"
+        # running -> paused -> running ... -> cancelling -> cancelled | done | failed
+        self.state = 'running'
+        self.chapters_total = chapters_total
+        self.chapters_done = 0
+        self.chapters_failed = 0
+        self.verses = 0
+        self.saved = 0
+        # Called with every progress event: {"event": ..., "job_id": ..., ...}
+        self.on_event = on_event
+        # Chapter label -> start time of the chapters being parsed
+        self.current: Dict[str, float] = {}
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._active_seconds = 0.0
+        self._active_since: Optional[float] = time.monotonic()
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self._changed = asyncio.Event()
+    
+    @property
+    def finished(self) -> bool:
+        return self.state in ('cancelled', 'done', 'failed')
+    
+    @property
+    def cancel_requested(self) -> bool:
+        return self.state in ('cancelling', 'cancelled')
+    
+    @property
+    def active_seconds(self) -> float:
+        """Time spent running, pauses excluded"""
+        if self._active_since is None:
+            return self._active_seconds
+        return self._active_seconds + time.monotonic() - self._active_since
+    
+    def _stop_clock(self):
+        self._active_seconds = self.active_seconds
+        self._active_since = None
+    
+    def _notify(self, event: str = None, **fields):
+        """Wake up the subscribers waiting for a change and pass the event to on_event"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+        if event and self.on_event:
+            self.on_event({'event': event, 'job_id': self.job_id, 'text_type': self.text_type, 'time': time.time(), **fields})
+    
+    # --- Commands ---
+    
+    def pause(self):
+        """Stop starting new chapters; chapters already running finish"""
+        if self.state == 'running':
+            self.state = 'paused'
+            self._stop_clock()
+            self._resumed.clear()
+            logger.info(f"⏸️  Job {self.job_id} paused after {self.chapters_done} chapters")
+            self._notify()
+    
+    def resume(self):
+        if self.state == 'paused':
+            self.state = 'running'
+            self._active_since = time.monotonic()
+            self._resumed.set()
+            logger.info(f"▶️  Job {self.job_id} resumed")
+            self._notify()
+    
+    def cancel(self):
+        """Skip the chapters that have not started; a paused job is woken up to stop"""
+        if self.state in ('running', 'paused'):
+            if self.state == 'paused':
+                self._active_since = time.monotonic()
+            self.state = 'cancelling'
+            self._resumed.set()
+            logger.info(f"⏹️  Job {self.job_id} cancelled, finishing {len(self.current)} running chapters")
+            self._notify()
+    
+    # --- Parser side ---
+    
+    async def checkpoint(self):
+        """Pause point between chapters: waits while paused, raises JobCancelled once cancelled"""
+        await self._resumed.wait()
+        if self.cancel_requested:
+            raise JobCancelled(f"Job {self.job_id} cancelled")
+    
+    def chapter_started(self, label: str):
+        self.current[label] = time.time()
+        self._notify('chapter_started', chapter=label)
+    
+    def chapter_finished(self, label: str, verses: int, failed: bool = False):
+        started = self.current.pop(label, None)
+        self.chapters_done += 1
+        self.chapters_failed += failed
+        self.verses += verses
+        progress = self.progress()
+        self._notify(
+            'chapter_done',
+            chapter=label,
+            verses=verses,
+            failed=failed,
+            seconds=round(time.time() - started, 3) if started else None,
+            **{key: progress[key] for key in ('chapters_done', 'chapters_total', 'verses_per_second', 'eta_seconds')},
+            verses_total=self.verses
+        )
+    
+    def batch_saved(self, saved: int, seconds: float):
+        """Verses written to the database (after the parse, or per chapter by queue workers)"""
+        self.saved += saved
+        self._notify('verse_batch_saved', saved=saved, seconds=round(seconds, 3), saved_total=self.saved)
+    
+    def finish(self, success: bool):
+        """Final state once the parse (and saving its verses) is over"""
+        if self.finished:
+            return
+        self._stop_clock()
+        self.state = 'cancelled' if self.cancel_requested else ('done' if success else 'failed')
+        self.finished_at = time.time()
+        self._resumed.set()
+        self._notify()
+    
+    # --- Progress ---
+    
+    def progress(self) -> dict:
+        """Snapshot for status replies and subscriptions"""
+        active = self.active_seconds
+        remaining = None
+        if self.chapters_total is not None:
+            remaining = max(self.chapters_total - self.chapters_done, 0)
+        
+        eta = None
+        if remaining is not None and self.chapters_done and not self.finished:
+            eta = round(remaining * active / self.chapters_done, 1)
+        
+        return {
+            'job_id': self.job_id,
+            'text_type': self.text_type,
+            'pid': os.getpid(),
+            'state': self.state,
+            'chapters_total': self.chapters_total,
+            'chapters_done': self.chapters_done,
+            'chapters_failed': self.chapters_failed,
+            'current_chapters': sorted(self.current),
+            'verses': self.verses,
+            'saved': self.saved,
+            'verses_per_second': round(self.verses / active, 3) if active > 0 else 0.0,
+            'elapsed_seconds': round(active, 1),
+            'eta_seconds': eta,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+    
+    async def updates(self, keepalive: float = SUBSCRIBE_KEEPALIVE) -> AsyncIterator[dict]:
+        """Progress on every change (at least every keepalive seconds) until the job ends"""
+        while True:
+            changed = self._changed
+            yield self.progress()
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), keepalive)
+            except asyncio.TimeoutError:
+                pass
+
+
+class JobControlServer:
+    """Serves the commands of one job on a Unix socket while the job runs"""
+    
+    def __init__(self, job: ParseJob, directory: str = None):
+        self.job = job
+        self.path = control_dir(directory) / f"{job.job_id}.sock"
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients = set()
+    
+    async def __aenter__(self):
+        if not hasattr(asyncio, 'start_unix_server'):
+            logger.warning("⚠️ Unix sockets are not available, the parse cannot be controlled")
+            return self
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Left over by a process that did not shut down cleanly
+            self.path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+            logger.info(f"🎛️  Job {self.job.job_id} accepts commands on {self.path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not open the control socket {self.path}: {e}")
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._server is None:
+            return
+        self._server.close()
+        # Subscriptions end by themselves once the job has finished
+        if self._clients:
+            await asyncio.wait(self._clients, timeout=1.0)
+        for client in self._clients:
+            client.cancel()
+        self.path.unlink(missing_ok=True)
+        self._server = None
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line or b'{}')
+            except ValueError:
+                request = None
+            # A valid JSON line that is not an object ([] or 1) is an unknown command too
+            command = request.get('command') if isinstance(request, dict) else None
+            
+            if command == 'subscribe':
+                async for progress in self.job.updates():
+                    writer.write(_response(progress))
+                    await writer.drain()
+                return
+            
+            if command not in COMMANDS:
+                writer.write(_response(None, f"Unknown command: {command} (expected one of {', '.join(COMMANDS)})"))
+            else:
+                if command != 'status':
+                    getattr(self.job, command)()
+                writer.write(_response(self.job.progress()))
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+
+def _response(data, error: str = None) -> bytes:
+    """One JSON line in the success/error/data envelope of integration_api.py"""
+    return (json.dumps({'success': error is None, 'error': error, 'data': data}) + '\n').encode('utf-8')
+
+
+async def send_command(command: str, job_id: str = None, directory: str = None) -> List[dict]:
+    """Send a command to one running job (or to all of them); returns the replies
+    
+    Sockets of processes that are gone are removed on the way.
+    """
+    folder = control_dir(directory)
+    paths = [folder / f"{job_id}.sock"] if job_id else sorted(folder.glob('*.sock'))
+    replies = []
+    for path in paths:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(str(path)), COMMAND_TIMEOUT)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if not job_id:
+                path.unlink(missing_ok=True)
+            continue
+        try:
+            writer.write((json.dumps({'command': command}) + '\n').encode('utf-8'))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), COMMAND_TIMEOUT)
+            if line:
+                replies.append(json.loads(line))
+        finally:
+            writer.close()
+    return replies
@@ -0,0 +1,168 @@
+"""
+Structured logging that does not block the event loop
+
+Parser and database loggers live under the "vedabase" logger, whose only
+handler is a QueueHandler: logging a record just puts it on a queue, and a
+QueueListener thread formats it and does the console/file I/O. Before a
+record is queued, per-verse DEBUG records are sampled and repeated warnings
+are rate-limited per call site, so a bad chapter cannot flood the output.
+"""
+import atexit
+import json
+import logging
+import queue
+import time
+from typing import Dict, List, Tuple
+
+from config import LOGGING_CONFIG
+
+ROOT_LOGGER = 'vedabase'
+
+# Attributes of every LogRecord; anything else on a record came from extra= and is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the extra= fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass only the first of every `every` DEBUG records of a call site
+    
+    Per-verse debug lines come from a handful of call sites, so sampling per
+    site keeps one example of each in every `every` verses.
+    """
+    
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = every
+        self._seen: Dict[Tuple[str, int], int] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every <= 1:
+            return True
+        
+        site = (record.pathname, record.lineno)
+        seen = self._seen.get(site, 0)
+        self._seen[site] = seen + 1
+        if seen % self.every:
+            return False
+        if seen:
+            record.sampled = f"1/{self.every}"
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most `limit` WARNING records of a call site per `interval` seconds
+    
+    ERROR and CRITICAL records always pass: a burst of failures must not hide them.
+    The first record after a window with dropped records reports how many were dropped.
+    """
+    
+    def __init__(self, limit: int, interval: float = 60.0):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        # call site -> [window start, records passed, records dropped]
+        self._windows: Dict[Tuple[str, int], List] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not logging.WARNING <= record.levelno < logging.ERROR or self.limit <= 0:
+            return True
+        
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        window = self._windows.get(site)
+        
+        if window is None or now - window[0] >= self.interval:
+            dropped = window[2] if window else 0
+            self._windows[site] = [now, 1, 0]
+            if dropped:
+                record.msg = f"{record.msg} ({dropped} similar suppressed)"
+                record.suppressed = dropped
+            return True
+        
+        if window[1] < self.limit:
+            window[1] += 1
+            return True
+        
+        window[2] += 1
+        return False
+    
+    def dropped(self) -> int:
+        """Records dropped in the current windows (not yet reported)"""
+        return sum(window[2] for window in self._windows.values())
+
+
+def setup_logging(config: dict = None) -> logging.Logger:
+    """Route the vedabase loggers through a queue to a listener thread; safe to call repeatedly"""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    if _listener is not None:
+        return root
+    
+    from logging.handlers import QueueHandler, QueueListener
+    config = {**LOGGING_CONFIG, **(config or {})}
+    
+    # Default stream is stderr: stdout of integration_api.py carries only the JSON response
+    console = logging.StreamHandler()
+    console.setFormatter(JsonFormatter() if config['console_json'] else logging.Formatter(config['format']))
+    handlers = [console]
+    
+    if config['file']:
+        file_handler = logging.FileHandler(config['file'], encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(config['verse_debug_sample']))
+    queue_handler.addFilter(RateLimitFilter(config['warnings_per_minute']))
+    
+    root.addHandler(queue_handler)
+    root.setLevel(config['level'])
+    root.propagate = False
+    
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return root
+
+
+def stop_logging():
+    """Report dropped warnings, then write out the queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in root.handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, RateLimitFilter) and log_filter.dropped():
+                # Logged at INFO so the rate limit does not swallow its own report
+                root.info(f"{log_filter.dropped()} repeated warnings suppressed by the rate limit")
+    
+    _listener.stop()
+    _listener = None
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the vedabase hierarchy; logging is set up on first use"""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
@@ -3,18 +3,55 @@ Main script for running Python parser
 """
 import asyncio
 import argparse
+import importlib
+import os
 import sys
-from typing import List
+import time
+from typing import List, TYPE_CHECKING
 
-from bhagavad_gita_parser import BhagavadGitaParser
-from srimad_bhagavatam_parser_v2 import SrimadBhagavatamParser
 from database import DatabaseManager
-from models import ParseResult
-from config import VEDABASE_URLS
+from metrics import crawl_metrics, start_metrics_server
+from extraction_profiler import extraction_profiler
+from config import VEDABASE_URLS, PARSER_CONFIG, BUNDLE_CONFIG
+from selection import WorkSelection
 
+if TYPE_CHECKING:
+    from models import ParseResult
+    from job_control import ParseJob
 
-async def parse_text_type(text_type: str, save_to_db: bool = True, max_chapters: int = None) -> ParseResult:
-    """Parse a specific text type"""
+# The work queue, job control and chapter bundles are imported by the subcommands that use them.
+# Text type -> "module:class" of its parser (all parsers share the extraction engine in base_parser).
+# Parsers pull in aiohttp, bs4 and pydantic, so they are imported only when a text is parsed.
+PARSERS = {
+    'bg': 'bhagavad_gita_parser:BhagavadGitaParser',
+    'sb': 'srimad_bhagavatam_parser_v2:SrimadBhagavatamParser',
+    'cc': 'chaitanya_charitamrita_parser:ChaitanyaCharitamritaParser',
+}
+
+
+def parser_class(text_type: str):
+    """Import and return the parser class of a text type"""
+    module_name, class_name = PARSERS[text_type].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def selected_addresses(text_type: str, selection: WorkSelection) -> list:
+    """Chapter addresses of a text picked by a work selection"""
+    return selection.addresses(parser_class(text_type)()._chapter_addresses())
+
+
+async def parse_text_type(text_type: str, save_to_db: bool = True, max_chapters: int = None,
+                          selection: WorkSelection = None, on_event=None, job: 'ParseJob' = None) -> 'ParseResult':
+    """Parse a specific text type, or the part of it picked by a work selection
+    
+    on_event receives the progress events of the parse job (see job_control.ParseJob).
+    A run over several texts passes its own job, which it serves and finishes;
+    otherwise the parse gets a job and control socket of its own.
+    """
+    if selection is None:
+        selection = WorkSelection(max_chapters=max_chapters)
+    elif max_chapters is not None:
+        selection = selection._replace(max_chapters=max_chapters)
     
     if text_type not in VEDABASE_URLS:
         print(f"❌ Unsupported text type: {text_type}")
@@ -25,70 +62,175 @@ async def parse_text_type(text_type: str, save_to_db: bool = True, max_chapters:
     print(f"📚 Starting to parse: {text_info['name']}")
     print(f"   Base URL: {text_info['base_url']}")
     print(f"   Total chapters: {text_info['chapters']}")
+    if selection.is_partial:
+        print(f"   Selection: {selection.describe()}")
     
     # Create parser
-    if text_type == 'bg':
-        parser = BhagavadGitaParser()
-    elif text_type == 'sb':
-        parser = SrimadBhagavatamParser()
-    else:
+    if text_type not in PARSERS:
         print(f"❌ Parser for {text_type} not implemented yet")
         return None
+    parser = parser_class(text_type)()
+    
+    if job is not None:
+        parser.job = job
+        return await _parse_and_save(parser, selection, save_to_db)
+    
+    # Pause/resume/cancel and live progress over a local socket (see job_control.py)
+    from job_control import ParseJob, JobControlServer
+    parser.job = ParseJob(text_type, on_event=on_event)
+    async with JobControlServer(parser.job):
+        try:
+            result = await _parse_and_save(parser, selection, save_to_db)
+        except BaseException:
+            parser.job.finish(success=False)
+            raise
+        parser.job.finish(success=result.success)
+        return result
+
+
+async def _parse_and_save(parser, selection: WorkSelection, save_to_db: bool) -> 'ParseResult':
+    """Parse the selection and save the verses and the parse record"""
+    text_type = parser.text_type
     
     # Parse with database integration
     if save_to_db:
-        async with DatabaseManager() as db:
+        async with DatabaseManager(profile='bulk_write') as db:
             async with parser:
-                result = await parser.parse_all_chapters()
+                result = await parser.parse_selection(selection)
                 
                 # Save verses to database
                 if result.verses:
-                    saved_count = await db.save_verses(result.verses)
-                    print(f"💾 Saved {saved_count} verses to database")
+                    start = time.perf_counter()
+                    with parser.metrics.timer('parser_db_write_seconds', text=text_type):
+                        saved_count = await db.save_verses(result.verses)
+                    parser.job.batch_saved(saved_count, time.perf_counter() - start)
+                    writes = db.write_stats
+                    parser.metrics.increment('parser_db_rows_total', writes.verses_written, text=text_type)
+                    parser.metrics.increment('parser_db_rows_unchanged_total', writes.verses_unchanged, text=text_type)
+                    parser.metrics.increment('parser_db_bytes_skipped_total', writes.bytes_skipped, text=text_type)
+                    print(f"💾 Saved {saved_count} verses to database: {writes.describe()}")
+                    
+                    if BUNDLE_CONFIG['enabled']:
+                        from chapter_bundles import parsed_addresses
+                        await _build_bundles(db, text_type, parsed_addresses(result.verses))
                 
                 # Save parse record
                 record_id = await db.save_parse_record(result)
                 print(f"📝 Parse record saved: {record_id}")
                 
+                for query_name, timing in db.query_stats.snapshot().items():
+                    print(f"⏱️  {query_name}: {timing['count']} calls, {timing['total_ms']:.0f} ms total, max {timing['max_ms']:.0f} ms")
+                
                 return result
     else:
         # Parse without database
         async with parser:
-            result = await parser.parse_all_chapters()
+            result = await parser.parse_selection(selection)
             return result
 
 
+async def _build_bundles(db, text_type: str, addresses: list):
+    """Rebuild the chapter bundles of the reading room; a failure does not fail the parse"""
+    from chapter_bundles import build_bundles
+    try:
+        await build_bundles(db, text_type, addresses)
+    except OSError as e:
+        print(f"⚠️  Chapter bundles were not written to {BUNDLE_CONFIG['dir']}: {e}")
+
+
 async def main():
     """Main function"""
     parser = argparse.ArgumentParser(description='Python parser for vedabase.io')
     parser.add_argument('--text-type', '-t', 
-                       choices=['bg', 'sb', 'all'],
+                       choices=[*PARSERS, 'all'],
                        default='bg',
                        help='Text type to parse (default: bg)')
     parser.add_argument('--no-save', action='store_true',
                        help='Parse without saving to database')
     parser.add_argument('--max-chapters', type=int,
-                       help='Maximum number of chapters to parse')
+                       help='Maximum number of chapters to parse (after the other selection options)')
+    parser.add_argument('--cantos',
+                       help='SB cantos or CC lilas (1 Adi, 2 Madhya, 3 Antya) to parse, e.g. 10-12 or 1,3')
+    parser.add_argument('--chapters',
+                       help='Chapter numbers to parse (in every selected canto), e.g. 1-5')
+    parser.add_argument('--verses',
+                       help='Parse only these verses: chapter.verse for BG (2.13,2.20-25), '
+                            'canto.chapter.verse for SB/CC (10.1.1-10)')
+    parser.add_argument('--shard',
+                       help='Parse part k of n of the selected chapters, e.g. 3/8 (same other options on every machine)')
+    parser.add_argument('--enqueue', action='store_true',
+                       help='Add the selected chapters to the work queue instead of parsing them')
+    parser.add_argument('--worker', action='store_true',
+                       help='Parse chapters from the work queue until it is drained (run any number of workers)')
+    parser.add_argument('--queue-status', action='store_true',
+                       help='Show the jobs of the work queue')
+    parser.add_argument('--queue', default=None,
+                       help='Name of the work queue (default: PARSER_QUEUE or "default")')
     parser.add_argument('--clear', action='store_true',
                        help='Clear existing verses before parsing')
     parser.add_argument('--stats', action='store_true',
                        help='Show database statistics')
+    parser.add_argument('--migrate', action='store_true',
+                       help='Create missing columns, tables and indexes of the parser (fallback for prisma migrate deploy)')
+    parser.add_argument('--quality', action='store_true',
+                       help='Show parse quality of the saved verses and the worst verses')
+    parser.add_argument('--report', default=PARSER_CONFIG['metrics_report'],
+                       help='Write a JSON run report with stage timings and counters to this file')
+    parser.add_argument('--metrics-port', type=int, default=PARSER_CONFIG['metrics_port'],
+                       help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while parsing')
+    parser.add_argument('--serve-verses', type=int, nargs='?', const=0, metavar='PORT',
+                       help='Serve the reading room verse cache on http://127.0.0.1:PORT/verses '
+                            '(default port: PARSER_VERSE_CACHE_PORT or 8091) instead of parsing')
+    parser.add_argument('--build-bundles', action='store_true',
+                       help='Rebuild the chapter bundles of the selected chapters from the database '
+                            '(PARSER_BUNDLE_DIR) instead of parsing')
     
     args = parser.parse_args()
+    metrics_runner = None
+    
+    try:
+        selection = WorkSelection.from_options(vars(args))
+    except ValueError as e:
+        parser.error(str(e))
+    if selection.verses is not None and args.text_type == 'all':
+        parser.error("--verses needs a single --text-type: verse references do not name the text")
+    if args.clear and selection.is_partial:
+        parser.error("--clear deletes all verses of the text and cannot be combined with a partial selection")
+    if args.enqueue and selection.verses is not None:
+        parser.error("--enqueue queues whole chapters and cannot be combined with --verses")
     
     try:
+        if args.serve_verses is not None:
+            from verse_cache import run_verse_service
+            await run_verse_service(args.serve_verses or None)
+            return
+        
+        if args.migrate:
+            from work_queue import WorkQueue
+            async with DatabaseManager(profile='bulk_write') as db:
+                # Raises what the connect-time check only logged
+                await db.ensure_schema()
+                await WorkQueue(db, args.queue).ensure_schema()
+            print("✅ Database schema is up to date")
+            return
+        
         if args.stats:
             # Show database statistics
             async with DatabaseManager() as db:
-                total_verses = await db.get_verse_count()
+                stats = await db.get_verse_stats()
                 print(f"📊 Database Statistics:")
-                print(f"   Total verses: {total_verses}")
+                print(f"   Total verses: {stats['total_verses']}")
                 
                 for text_type in VEDABASE_URLS.keys():
-                    count = await db.get_verse_count(text_type)
+                    count = stats['by_text_type'].get(text_type, 0)
                     text_name = VEDABASE_URLS[text_type]['name']
                     print(f"   {text_name}: {count} verses")
                 
+                if stats['total_verses']:
+                    print(f"\n🧩 Field completeness:")
+                    for field, count in stats['completeness'].items():
+                        print(f"   {field}: {count} ({count / stats['total_verses'] * 100:.1f}%)")
+                
                 # Show recent parse records
                 records = await db.get_parse_records(5)
                 if records:
@@ -99,66 +241,178 @@ async def main():
             
             return
         
+        if args.quality:
+            async with DatabaseManager() as db:
+                report = await db.get_quality_report(None if args.text_type == 'all' else args.text_type)
+            
+            print(f"🔎 Parse quality:")
+            for text in report['texts']:
+                mean = f"{text['mean_score']:.3f}" if text['mean_score'] is not None else "n/a"
+                print(f"   {text['title']}: {text['scored']}/{text['verses']} scored, mean {mean}, {text['low_quality']} low quality")
+            if report['anomalies']:
+                print(f"\n⚠️  Anomalies:")
+                for anomaly, count in report['anomalies'].items():
+                    print(f"   {anomaly}: {count}")
+            if report['worst']:
+                print(f"\n📉 Worst verses:")
+                for verse in report['worst']:
+                    address = '.'.join(str(part) for part in (verse['canto'], verse['chapter'], verse['verseNumber']) if part is not None)
+                    print(f"   {verse['title']} {address}: {verse['qualityScore']} {', '.join(verse['quality']['anomalies'])}")
+            return
+        
+        # Parse text types
+        if args.text_type == 'all':
+            text_types = list(PARSERS)
+        else:
+            text_types = [args.text_type]
+        
+        if args.build_bundles:
+            async with DatabaseManager() as db:
+                for text_type in text_types:
+                    await _build_bundles(db, text_type, selected_addresses(text_type, selection))
+            return
+        
+        if args.queue_status:
+            from work_queue import WorkQueue
+            async with DatabaseManager() as db:
+                queue = WorkQueue(db, args.queue)
+                await queue.ensure_schema()
+                status = await queue.status()
+            
+            print(f"📋 Work queue '{status['queue']}':")
+            for text_type, jobs in status['texts'].items():
+                print(f"   {text_type.upper()}: {jobs['done']} done ({jobs.get('verses', 0)} verses), "
+                      f"{jobs['pending']} pending, {jobs['running']} running on {jobs.get('workers', 0)} workers, "
+                      f"{jobs['failed']} failed")
+            if status['failures']:
+                print(f"\n❌ Failed jobs:")
+                for failure in status['failures']:
+                    print(f"   {failure['text_type'].upper()} {failure['chapter']} ({failure['attempts']} attempts): {failure['error']}")
+            return
+        
+        if args.enqueue:
+            from work_queue import WorkQueue
+            async with DatabaseManager(profile='bulk_write') as db:
+                queue = WorkQueue(db, args.queue)
+                await queue.ensure_schema()
+                for text_type in text_types:
+                    queued = await queue.enqueue(text_type, selected_addresses(text_type, selection))
+                    print(f"📥 Queued {queued} chapters of {VEDABASE_URLS[text_type]['name']} in '{queue.name}'")
+            return
+        
         if args.clear:
             # Clear existing verses
-            async with DatabaseManager() as db:
+            async with DatabaseManager(profile='bulk_write') as db:
                 if args.text_type == 'all':
                     await db.clear_verses()
                 else:
                     await db.clear_verses(args.text_type)
                 print("🗑️  Cleared existing verses")
         
-        # Parse text types
-        if args.text_type == 'all':
-            text_types = ['bg', 'sb']
-        else:
-            text_types = [args.text_type]
+        if args.metrics_port:
+            metrics_runner = await start_metrics_server(crawl_metrics, args.metrics_port)
+        
+        if args.worker:
+            from job_control import ParseJob, JobControlServer
+            from work_queue import WorkQueue, run_worker
+            async with DatabaseManager(profile='bulk_write') as db:
+                queue = WorkQueue(db, args.queue)
+                await queue.ensure_schema()
+                job = ParseJob(f"queue:{queue.name}", job_id=f"worker-{os.getpid()}")
+                async with JobControlServer(job):
+                    totals = await run_worker(db, queue, lambda text_type: parser_class(text_type)(), control=job)
+                    job.finish(success=not totals['failed'])
+            
+            print(f"\n🎯 Worker {queue.worker_id} finished queue '{queue.name}':")
+            print(f"   Chapters done: {totals['done']} ({totals['verses']} verses)")
+            print(f"   Saved: {db.write_stats.describe()}")
+            print(f"   Attempts to retry: {totals['retried']}, failed: {totals['failed']}, leases lost: {totals['lost']}")
+            return
         
         total_verses = 0
         total_errors = 0
+        results = {}
         
-        for text_type in text_types:
-            print(f"\n{'='*50}")
-            result = await parse_text_type(text_type, not args.no_save, args.max_chapters)
-            
-            if result:
-                print(f"\n📊 Results for {VEDABASE_URLS[text_type]['name']}:")
-                print(f"   Total verses: {result.total_verses}")
-                print(f"   Successful: {result.successful_verses}")
-                print(f"   Failed: {result.failed_verses}")
-                print(f"   Errors: {len(result.errors)}")
-                print(f"   Duration: {result.duration:.2f} seconds")
-                print(f"   Success: {'✅' if result.success else '❌'}")
-                
-                total_verses += result.total_verses
-                total_errors += len(result.errors)
-                
-                # Show sample errors
-                if result.errors:
-                    print(f"\n⚠️  Sample errors:")
-                    for error in result.errors[:3]:
-                        print(f"   - {error}")
-                    if len(result.errors) > 3:
-                        print(f"   ... and {len(result.errors) - 3} more errors")
-                
-                # Show sample verses
-                if result.verses:
-                    print(f"\n📖 Sample verses:")
-                    for verse in result.verses[:2]:
-                        print(f"   {verse.chapter}.{verse.verse_number}: {verse.sanskrit[:50]}...")
-            else:
-                print(f"❌ Failed to parse {text_type}")
+        # One job for the whole run: cancelling it also skips the texts that have not started
+        from job_control import ParseJob, JobControlServer
+        job = ParseJob(args.text_type)
+        job.chapters_total = sum(len(selected_addresses(text_type, selection)) for text_type in text_types)
+        async with JobControlServer(job):
+            try:
+                for text_type in text_types:
+                    if job.cancel_requested:
+                        print(f"⏹️  Job {job.job_id} cancelled, skipping {VEDABASE_URLS[text_type]['name']}")
+                        continue
+                    
+                    print(f"\n{'='*50}")
+                    result = await parse_text_type(text_type, not args.no_save, selection=selection, job=job)
+                    
+                    if result:
+                        print(f"\n📊 Results for {VEDABASE_URLS[text_type]['name']}:")
+                        print(f"   Total verses: {result.total_verses}")
+                        print(f"   Successful: {result.successful_verses}")
+                        print(f"   Failed: {result.failed_verses}")
+                        print(f"   Errors: {len(result.errors)}")
+                        print(f"   Duration: {result.duration:.2f} seconds")
+                        print(f"   Success: {'✅' if result.success else '❌'}")
+                        
+                        total_verses += result.total_verses
+                        total_errors += len(result.errors)
+                        results[text_type] = {
+                            'total_verses': result.total_verses,
+                            'errors': len(result.errors),
+                            'duration': result.duration,
+                            'success': result.success
+                        }
+                        
+                        # Show sample errors
+                        if result.errors:
+                            print(f"\n⚠️  Sample errors:")
+                            for error in result.errors[:3]:
+                                print(f"   - {error}")
+                            if len(result.errors) > 3:
+                                print(f"   ... and {len(result.errors) - 3} more errors")
+                        
+                        # Show sample verses
+                        if result.verses:
+                            print(f"\n📖 Sample verses:")
+                            for verse in result.verses[:2]:
+                                print(f"   {verse.chapter}.{verse.verse_number}: {verse.sanskrit[:50]}...")
+                    else:
+                        print(f"❌ Failed to parse {text_type}")
+            except BaseException:
+                job.finish(success=False)
+                raise
+            job.finish(success=len(results) == len(text_types) and all(r['success'] for r in results.values()))
         
         print(f"\n{'='*50}")
         print(f"🎯 Final Results:")
         print(f"   Total verses parsed: {total_verses}")
         print(f"   Total errors: {total_errors}")
         
+        stages = crawl_metrics.stage_summary()
+        if stages:
+            print(f"\n⏱️  Time by stage:")
+            for stage, timing in stages.items():
+                print(f"   {stage}: {timing['seconds']:.1f}s over {timing['count']} calls")
+        
+        for line in extraction_profiler.format_report():
+            print(line)
+        
+        if args.report:
+            path = crawl_metrics.write_report(
+                args.report, text_types=text_types, results=results, extraction=extraction_profiler.report()
+            )
+            print(f"📈 Run report written to {path}")
+        
     except KeyboardInterrupt:
         print("\n⏹️  Parsing interrupted by user")
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         sys.exit(1)
+    finally:
+        if metrics_runner:
+            await metrics_runner.cleanup()
 
 
 if __name__ == "__main__":
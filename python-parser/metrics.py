@@ -0,0 +1,234 @@
+"""
+Crawl pipeline instrumentation: per-stage histograms and counters
+
+Exported as a JSON run report and in the Prometheus text format
+(optionally served on /metrics while a crawl is running).
+"""
+import bisect
+import json
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Tuple
+
+from logging_setup import ROOT_LOGGER
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.metrics")
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = tuple(kib * 1024 for kib in (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192))
+
+# Metrics of the crawl pipeline: name -> (type, help, histogram buckets)
+METRICS = {
+    'parser_fetch_seconds': ('histogram', 'Chapter page fetch latency of successful requests', SECONDS_BUCKETS),
+    'parser_fetch_bytes': ('histogram', 'Size of fetched chapter pages in bytes', BYTES_BUCKETS),
+    'parser_parse_seconds': ('histogram', 'HTML parsing time per chapter page', SECONDS_BUCKETS),
+    'parser_extract_seconds': ('histogram', 'Verse extraction time per attempt by strategy', SECONDS_BUCKETS),
+    'parser_chapter_seconds': ('histogram', 'Total time per chapter, fetch included', SECONDS_BUCKETS),
+    'parser_db_write_seconds': ('histogram', 'Time to write a batch of verses to the database', SECONDS_BUCKETS),
+    'parser_extract_attempts_total': ('counter', 'Verse extraction attempts by strategy and outcome (hit, miss, error)', None),
+    'parser_fetch_retries_total': ('counter', 'Page fetch attempts repeated after a failure', None),
+    'parser_fetch_errors_total': ('counter', 'Failed page fetch attempts by reason', None),
+    'parser_page_cache_hits_total': ('counter', 'Chapter pages read from the page cache', None),
+    'parser_page_cache_misses_total': ('counter', 'Chapter pages fetched because the page cache had no copy', None),
+    'parser_chapters_total': ('counter', 'Parsed chapters by outcome', None),
+    'parser_verses_total': ('counter', 'Extracted verses', None),
+    'parser_merged_blocks_total': ('counter', 'Merged verse blocks (ТЕКСТЫ 16-18) extracted', None),
+    'parser_db_rows_total': ('counter', 'Verse rows written to the database', None),
+    'parser_db_rows_unchanged_total': ('counter', 'Verse rows skipped by the database writer because their content hash was unchanged', None),
+    'parser_db_bytes_skipped_total': ('counter', 'Text bytes of unchanged rows not rewritten to the database', None),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Bucketed distribution of observed values (cumulative buckets as in Prometheus)"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+    
+    def cumulative(self) -> list:
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            total += count
+            pairs.append((bound, total))
+        pairs.append((float('inf'), self.count))
+        return pairs
+    
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'buckets': {_format_bound(bound): count for bound, count in self.cumulative()}
+        }
+
+
+class CrawlMetrics:
+    """Histograms and counters of a crawl, keyed by metric name and labels"""
+    
+    def __init__(self):
+        self.started_at = datetime.utcnow()
+        # name -> {label key: Histogram or counter value}
+        self._series: Dict[str, Dict[LabelKey, object]] = {name: {} for name in METRICS}
+    
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram"""
+        series = self._series[name]
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(METRICS[name][2])
+        histogram.observe(value)
+    
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Increase a counter"""
+        series = self._series[name]
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + amount
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the wrapped block in a seconds histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter (or observation count of a histogram)"""
+        entry = self._series[name].get(_label_key(labels), 0)
+        return entry.count if isinstance(entry, Histogram) else entry
+    
+    def snapshot(self) -> dict:
+        """All metrics with observations as a JSON-serializable dict"""
+        metrics = {}
+        for name, series in self._series.items():
+            if not series:
+                continue
+            kind, help_text, _ = METRICS[name]
+            metrics[name] = {
+                'type': kind,
+                'help': help_text,
+                'series': [
+                    {
+                        'labels': dict(key),
+                        **(entry.snapshot() if isinstance(entry, Histogram) else {'value': entry})
+                    }
+                    for key, entry in sorted(series.items())
+                ]
+            }
+        return metrics
+    
+    def stage_summary(self) -> Dict[str, dict]:
+        """Total time per stage (and extraction method) across all texts, slowest first"""
+        stages = {}
+        for name in ('parser_fetch_seconds', 'parser_parse_seconds', 'parser_extract_seconds', 'parser_db_write_seconds'):
+            for key, histogram in self._series[name].items():
+                labels = dict(key)
+                stage = name[len('parser_'):-len('_seconds')]
+                if 'method' in labels:
+                    stage = f"{stage}:{labels['method']}"
+                entry = stages.setdefault(stage, {'count': 0, 'seconds': 0.0})
+                entry['count'] += histogram.count
+                entry['seconds'] += histogram.sum
+        
+        return dict(sorted(
+            ((stage, {'count': entry['count'], 'seconds': round(entry['seconds'], 3)}) for stage, entry in stages.items()),
+            key=lambda item: item[1]['seconds'],
+            reverse=True
+        ))
+    
+    def report(self, **run_info) -> dict:
+        """JSON run report: run info, stage time summary and all metrics"""
+        finished_at = datetime.utcnow()
+        return {
+            **run_info,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': finished_at.isoformat(),
+            'duration_seconds': round((finished_at - self.started_at).total_seconds(), 3),
+            'stages': self.stage_summary(),
+            'metrics': self.snapshot()
+        }
+    
+    def write_report(self, path: str, **run_info) -> Path:
+        """Write the JSON run report to a file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(**run_info), ensure_ascii=False, indent=2), encoding='utf-8')
+        return path
+    
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, series in self._series.items():
+            if not series:
+                continue
+            kind, help_text, _ = METRICS[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, entry in sorted(series.items()):
+                if isinstance(entry, Histogram):
+                    for bound, count in entry.cumulative():
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_bound(bound)),))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {entry.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {entry.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(key)} {entry}")
+        return '\n'.join(lines) + '\n'
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    pairs = (
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in key
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else f"{bound:g}"
+
+
+async def start_metrics_server(metrics: CrawlMetrics, port: int, host: str = '127.0.0.1'):
+    """Serve the metrics on http://host:port/metrics; returns the runner to clean up"""
+    from aiohttp import web
+    
+    async def handle_metrics(request):
+        return web.Response(text=metrics.prometheus(), content_type='text/plain', charset='utf-8')
+    
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"📈 Metrics available at http://{host}:{port}/metrics")
+    return runner
+
+
+# Process-wide metrics shared by all parsers of a run
+crawl_metrics = CrawlMetrics()
@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from records import VerseKey, MergedBlock, VerseRecord
+
 
 class ParsedVerse(BaseModel):
     """Model for a parsed verse"""
@@ -21,6 +23,25 @@ class ParsedVerse(BaseModel):
     language: str = "ru"
     url: Optional[str] = None
     metadata: Optional[dict] = None
+    merged_with: Optional[List[int]] = None  # Verse numbers of the merged block
+    merged_block_id: Optional[str] = None
+    quality_score: Optional[float] = None
+    quality: Optional[dict] = None  # Quality vector, see quality.VerseQuality
+    
+    @classmethod
+    def from_record(cls, record: VerseRecord) -> "ParsedVerse":
+        """Validated API model of a VerseRecord"""
+        fields = record._asdict()
+        block = fields.pop('block')
+        if block:
+            fields['merged_with'] = list(block.verse_numbers)
+            fields['merged_block_id'] = block.id
+        fields.pop('scan')
+        quality = fields.pop('quality')
+        if quality:
+            fields['quality_score'] = quality.score
+            fields['quality'] = quality.to_json()
+        return cls(**fields)
 
 
 class ParseResult(BaseModel):
@@ -31,7 +52,7 @@ class ParseResult(BaseModel):
     failed_verses: int = 0
     errors: List[str] = []
     duration: float = 0.0
-    verses: List[ParsedVerse] = []
+    verses: List[VerseRecord] = []
     success: bool = False
 
 
@@ -0,0 +1,68 @@
+"""
+Early-exit classifier of fetched chapter pages
+
+Decides whether a page has verses before it is parsed with BeautifulSoup.
+Not-found markers (404 title, "page not found" heading, error container) are
+looked up only at the start of the <head> and of the body, where a
+not-found page puts them. Verse signals are checked most decisive first
+and the first hit ends the scan: on a chapter page the first Devanagari
+character of the body comes within a few hundred characters. The page is
+lowercased at most once, only when its body has no Devanagari.
+"""
+import re
+from typing import NamedTuple
+
+# Characters scanned for not-found markers at the start of the page (the <title> is there)
+HEAD_SCAN_CHARS = 32 * 1024
+
+# Characters scanned for not-found markers after </head> (headings and error containers)
+BODY_SCAN_CHARS = 16 * 1024
+
+# 404 title, "page not found" heading or an error container, in one pass over the window
+NOT_FOUND_PATTERN = re.compile(
+    r'<title[^>]*>[^<]*404'
+    r'|<h1[^>]*>(?:[^<]|<(?!/h1))*?(?:page not found|страница не найдена)'
+    r'|<div[^>]*class="[^"]*error[^"]*"',
+    re.IGNORECASE
+)
+
+DEVANAGARI_PATTERN = re.compile(r'[\u0900-\u097F]')
+
+# Markup and words of verse pages, lowercase: ТЕКСТ, verse, advanced view container, ...
+VERSE_INDICATORS = ('av-verses', 'текст', 'стих', 'verse', 'shloka', 'devanagari', 'translation', 'purport')
+
+
+class PageVerdict(NamedTuple):
+    """Classification of a page and the signal that decided it"""
+    has_verses: bool
+    reason: str
+
+
+def classify_page(html: str) -> PageVerdict:
+    """Whether a fetched page has verses, deciding on the first conclusive signal"""
+    if not html:
+        return PageVerdict(False, 'empty')
+    
+    # Without </head> the body is taken to start with the page
+    body_start = max(html.find('</head>'), 0)
+    if body_start <= HEAD_SCAN_CHARS:
+        not_found = NOT_FOUND_PATTERN.search(html, 0, body_start + BODY_SCAN_CHARS)
+    else:
+        # Large head (inline scripts and styles): its start and the start of the body
+        not_found = (
+            NOT_FOUND_PATTERN.search(html, 0, HEAD_SCAN_CHARS)
+            or NOT_FOUND_PATTERN.search(html, body_start, body_start + BODY_SCAN_CHARS)
+        )
+    if not_found:
+        return PageVerdict(False, f"not_found: {not_found.group()[:60]}")
+    
+    # Sanskrit text is the most reliable indicator and comes early in the body of a verse page
+    if DEVANAGARI_PATTERN.search(html, body_start):
+        return PageVerdict(True, 'devanagari')
+    
+    lowered = html.lower()
+    for indicator in VERSE_INDICATORS:
+        if indicator in lowered:
+            return PageVerdict(True, indicator)
+    
+    return PageVerdict(False, 'no_signal')
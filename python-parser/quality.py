@@ -0,0 +1,216 @@
+"""
+Parse quality scoring of whole chapters
+
+Every verse gets a quality vector: which fields are usable, the share of
+Devanagari / Cyrillic / IAST diacritic characters in its fields, and robust
+z-scores of its field lengths against the chapter median. Character classes
+are counted over the UTF-8 bytes of each field with bytes.count, and the
+chapter statistics (medians, MADs) are computed once for all verses.
+The per-verse scan (scan_verse) is done once: the extraction-time validation
+keeps it on the record (VerseRecord.scan) and score_chapter reuses it.
+Vectors are stored with the verses (qualityScore, quality) so bad extractions
+can be found later with a query.
+"""
+import re
+import statistics
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Presence of a character class (the sets of the original extraction validation)
+DEVANAGARI_PATTERN = re.compile(r'[\u0900-\u097F]')
+CYRILLIC_PATTERN = re.compile(r'[а-яё]', re.IGNORECASE)
+DIACRITIC_PATTERN = re.compile(r'[āīūṛṝḷḹēōṃḥṅñṭḍṇśṣ\u0300-\u036F]', re.IGNORECASE)
+
+# UTF-8 prefixes of character blocks: counting them in the encoded field counts the
+# block's characters with bytes.count, a C loop per prefix instead of a regex scan
+DEVANAGARI_PREFIXES = (b'\xe0\xa4', b'\xe0\xa5')  # U+0900-U+097F
+CYRILLIC_PREFIXES = (b'\xd0', b'\xd1')  # U+0400-U+047F
+DIACRITIC_PREFIXES = (
+    b'\xc4', b'\xc5',  # Latin Extended-A (ā ī ū ś ...), U+0100-U+017F
+    b'\xe1\xb8', b'\xe1\xb9',  # Latin Extended Additional (ṛ ṃ ḥ ṭ ḍ ṇ ṣ ...), U+1E00-U+1E7F
+    b'\xcc', b'\xcd',  # Combining diacritical marks, U+0300-U+036F
+    b'\xc3\xb1', b'\xc3\x91'  # ñ Ñ
+)
+
+# Minimum stripped length of a usable field (as in the extraction validation)
+MIN_SANSKRIT = 10
+MIN_TEXT = 20
+
+# Points of usable fields; a verse with Sanskrit and translation (4 points) is good
+FIELD_POINTS = {'sanskrit': 2, 'translation': 2, 'transliteration': 1, 'word_by_word': 1}
+MAX_POINTS = sum(FIELD_POINTS.values())
+GOOD_POINTS = 4
+
+# |robust z| above which a field length is an outlier within its chapter
+OUTLIER_Z = 3.5
+
+# Fields whose lengths are compared with the chapter: vector name -> VerseRecord field
+LENGTH_FIELDS = {
+    'sanskrit': 'sanskrit',
+    'translation': 'translation',
+    'commentary': 'commentary'
+}
+
+
+class VerseQuality(NamedTuple):
+    """Quality vector of one verse"""
+    points: int
+    devanagari_ratio: float
+    cyrillic_ratio: float
+    diacritic_ratio: float
+    sanskrit_z: float = 0.0
+    translation_z: float = 0.0
+    commentary_z: float = 0.0
+    anomalies: Tuple[str, ...] = ()
+    
+    @property
+    def score(self) -> float:
+        """Normalized score persisted as qualityScore: field points, halved for anomalous verses"""
+        score = self.points / MAX_POINTS
+        return round(score / 2 if self.anomalies else score, 4)
+    
+    @property
+    def is_good(self) -> bool:
+        return self.points >= GOOD_POINTS
+    
+    def to_json(self) -> dict:
+        return {
+            'points': self.points,
+            'devanagari_ratio': self.devanagari_ratio,
+            'cyrillic_ratio': self.cyrillic_ratio,
+            'diacritic_ratio': self.diacritic_ratio,
+            'sanskrit_z': self.sanskrit_z,
+            'translation_z': self.translation_z,
+            'commentary_z': self.commentary_z,
+            'anomalies': list(self.anomalies)
+        }
+
+
+class FieldScan(NamedTuple):
+    """Character counts of a verse's fields, the per-verse part of the batched pass"""
+    points: int
+    devanagari_ratio: float
+    cyrillic_ratio: float
+    diacritic_ratio: float
+    lengths: Dict[str, int]
+    flags: Tuple[str, ...]
+
+
+def _ratio(encoded: bytes, prefixes: Tuple[bytes, ...], text: str) -> float:
+    """Share of the non-space characters of text in the block given by its UTF-8 prefixes"""
+    letters = len(text) - sum(map(text.count, ' \n\t\u00a0'))
+    if not letters:
+        return 0.0
+    return round(sum(map(encoded.count, prefixes)) / letters, 4)
+
+
+def scan_verse(verse) -> FieldScan:
+    """Usable fields (points) and character ratios of one verse, no chapter statistics needed"""
+    sanskrit = (verse.sanskrit or '').strip()
+    translation = (verse.translation or '').strip()
+    transliteration = (verse.transliteration or '').strip()
+    word_by_word = (verse.word_by_word_translation or '').strip()
+    
+    points = 0
+    flags = []
+    if len(sanskrit) <= MIN_SANSKRIT:
+        flags.append('no_sanskrit')
+    elif not DEVANAGARI_PATTERN.search(sanskrit):
+        flags.append('no_devanagari')
+    else:
+        points += FIELD_POINTS['sanskrit']
+    
+    if len(translation) <= MIN_TEXT:
+        flags.append('no_translation')
+    elif not CYRILLIC_PATTERN.search(translation):
+        flags.append('no_cyrillic')
+    else:
+        points += FIELD_POINTS['translation']
+    
+    if len(transliteration) > MIN_TEXT:
+        if DIACRITIC_PATTERN.search(transliteration):
+            points += FIELD_POINTS['transliteration']
+        else:
+            flags.append('no_diacritics')
+    elif transliteration:
+        flags.append('short_transliteration')
+    
+    if len(word_by_word) > MIN_TEXT:
+        points += FIELD_POINTS['word_by_word']
+    
+    return FieldScan(
+        points=points,
+        devanagari_ratio=_ratio(sanskrit.encode('utf-8'), DEVANAGARI_PREFIXES, sanskrit),
+        cyrillic_ratio=_ratio(translation.encode('utf-8'), CYRILLIC_PREFIXES, translation),
+        diacritic_ratio=_ratio(transliteration.encode('utf-8'), DIACRITIC_PREFIXES, transliteration),
+        lengths={
+            'sanskrit': len(sanskrit),
+            'translation': len(translation),
+            'commentary': len((verse.commentary or '').strip())
+        },
+        flags=tuple(flags)
+    )
+
+
+def _robust_scale(values: Sequence[int]) -> Tuple[float, float]:
+    """Median and MAD-based standard deviation of a column (scale 1 when the MAD is 0)"""
+    median = statistics.median(values)
+    mad = statistics.median(abs(value - median) for value in values)
+    return median, (1.4826 * mad) or 1.0
+
+
+def score_chapter(verses: Sequence) -> List[VerseQuality]:
+    """Quality vectors of all verses of a chapter, in order"""
+    if not verses:
+        return []
+    
+    # Verses validated during extraction carry their scan already
+    scans = [getattr(verse, 'scan', None) or scan_verse(verse) for verse in verses]
+    
+    # Lengths are compared only among verses that have the field at all
+    scales: Dict[str, Optional[Tuple[float, float]]] = {}
+    for name in LENGTH_FIELDS:
+        column = [scan.lengths[name] for scan in scans if scan.lengths[name]]
+        scales[name] = _robust_scale(column) if len(column) >= 3 else None
+    
+    qualities = []
+    for scan in scans:
+        z_scores = {}
+        anomalies = list(scan.flags)
+        for name, scale in scales.items():
+            length = scan.lengths[name]
+            if scale is None or not length:
+                z_scores[name] = 0.0
+                continue
+            median, deviation = scale
+            z = round((length - median) / deviation, 2)
+            z_scores[name] = z
+            if abs(z) > OUTLIER_Z:
+                anomalies.append(f"{name}_length_outlier")
+        
+        qualities.append(VerseQuality(
+            points=scan.points,
+            devanagari_ratio=scan.devanagari_ratio,
+            cyrillic_ratio=scan.cyrillic_ratio,
+            diacritic_ratio=scan.diacritic_ratio,
+            sanskrit_z=z_scores['sanskrit'],
+            translation_z=z_scores['translation'],
+            commentary_z=z_scores['commentary'],
+            anomalies=tuple(anomalies)
+        ))
+    return qualities
+
+
+def chapter_summary(qualities: Sequence[VerseQuality]) -> dict:
+    """Counts for the chapter quality log record"""
+    total = len(qualities)
+    anomalies: Dict[str, int] = {}
+    for quality in qualities:
+        for anomaly in quality.anomalies:
+            anomalies[anomaly] = anomalies.get(anomaly, 0) + 1
+    
+    return {
+        'verses': total,
+        'good': sum(1 for quality in qualities if quality.is_good),
+        'mean_score': round(sum(quality.score for quality in qualities) / total, 4) if total else 0.0,
+        'anomalies': anomalies
+    }
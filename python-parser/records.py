@@ -0,0 +1,99 @@
+"""
+Lightweight verse records and chapter addresses used by the parsers and the database writer
+
+Plain NamedTuples without pydantic, so modules that only read or write rows
+(database.py, the stats/search commands) import quickly. models.py re-exports them.
+"""
+from typing import Optional, NamedTuple, Tuple
+
+
+class ChapterAddress(NamedTuple):
+    """Address of a chapter page: canto is only set for multi-level texts (SB canto, CC lila)"""
+    chapter: int
+    canto: Optional[int] = None
+    
+    @property
+    def label(self) -> str:
+        """Dotted label used in logs and block ids: "2" for BG, "1.2" for SB"""
+        if self.canto is None:
+            return str(self.chapter)
+        return f"{self.canto}.{self.chapter}"
+    
+    @classmethod
+    def from_label(cls, label: str) -> 'ChapterAddress':
+        """Inverse of label: "2" -> (2, None), "1.2" -> (2, 1)"""
+        parts = [int(part) for part in label.split('.')]
+        if len(parts) == 1:
+            return cls(parts[0])
+        if len(parts) == 2:
+            return cls(parts[1], parts[0])
+        raise ValueError(f"Invalid chapter label: {label}")
+
+
+class VerseKey(NamedTuple):
+    """Natural key of a verse row (matches the verses unique index)"""
+    title: str
+    chapter: int
+    verse_number: int
+    language: str = "ru"
+    canto: Optional[int] = None  # SB canto / CC lila, None for single-level texts
+
+
+class MergedBlock(NamedTuple):
+    """Merged verse block (ТЕКСТЫ 16-18): shared text of several verses, stored once
+    
+    Verses of the block reference it via VerseRecord.block; the database writer
+    saves one verse_blocks row and verse rows without the duplicated text.
+    """
+    id: str
+    title: str
+    chapter: int
+    verse_numbers: Tuple[int, ...]
+    sanskrit: str
+    translation: str
+    canto: Optional[int] = None
+    transliteration: Optional[str] = None
+    word_by_word_translation: Optional[str] = None
+    commentary: Optional[str] = None
+    source: str = "Vedabase"
+    language: str = "ru"
+    
+    @property
+    def verse_range(self) -> str:
+        """Verse range for display: "16-18" """
+        return f"{min(self.verse_numbers)}-{max(self.verse_numbers)}"
+
+
+class VerseRecord(NamedTuple):
+    """Verse as produced by extraction and consumed by the database writer
+    
+    A plain tuple: no validation or per-instance __dict__, so a full crawl can
+    keep every verse in memory cheaply. Converted to ParsedVerse only at the
+    API boundary (ParsedVerse.from_record).
+    """
+    title: str
+    chapter: int
+    verse_number: int
+    sanskrit: str
+    translation: str
+    canto: Optional[int] = None  # SB canto / CC lila
+    transliteration: Optional[str] = None
+    word_by_word_translation: Optional[str] = None
+    commentary: Optional[str] = None
+    source: str = "Vedabase"
+    language: str = "ru"
+    url: Optional[str] = None
+    metadata: Optional[dict] = None
+    block: Optional[MergedBlock] = None  # Set for verses of a merged block, text fields are the block's
+    quality: Optional[tuple] = None  # quality.VerseQuality, scored per chapter after extraction
+    scan: Optional[tuple] = None  # quality.FieldScan of the extraction-time validation, until scored
+    
+    @property
+    def key(self) -> VerseKey:
+        """Natural key of the verse row"""
+        return VerseKey(self.title, self.chapter, self.verse_number, self.language, self.canto)
+    
+    @property
+    def is_merged(self) -> bool:
+        """Whether the verse is part of a merged block"""
+        return self.block is not None
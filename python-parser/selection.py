@@ -0,0 +1,173 @@
+"""
+Work selection: which chapters (and verses) of a text a run parses
+
+Narrows the chapter addresses of a text by canto (SB canto, CC lila), by
+chapter number and by an explicit verse list, then splits the remaining
+chapters between machines (--shard k/n) and caps them (--max-chapters).
+Pages are fetched per chapter, so a verse list parses the chapters of the
+listed verses and keeps only those verses.
+
+Specs as accepted by the CLI and integration_api.py:
+    numbers  "10-12", "1,3,5-7"
+    verses   "2.13,2.20-25" (BG chapter.verse), "10.1.1-10" (SB/CC canto.chapter.verse)
+    shard    "3/8" (third of eight)
+"""
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+from records import ChapterAddress
+
+
+class Shard(NamedTuple):
+    """Part `index` (1-based) of `count` equal parts of the selected chapters"""
+    index: int
+    count: int
+    
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_numbers(spec: str) -> FrozenSet[int]:
+    """Numbers of a spec like "1,3,5-7" """
+    numbers = set()
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            start, end = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid number range: {part!r} (expected e.g. 5 or 1-5)")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid number range: {part!r}")
+        numbers.update(range(start, end + 1))
+    
+    if not numbers:
+        raise ValueError(f"Empty number list: {spec!r}")
+    return frozenset(numbers)
+
+
+def parse_shard(spec: str) -> Shard:
+    """Shard of a spec like "3/8" """
+    index, _, count = str(spec).partition('/')
+    try:
+        shard = Shard(int(index), int(count))
+    except ValueError:
+        raise ValueError(f"Invalid shard: {spec!r} (expected k/n, e.g. 3/8)")
+    if not 1 <= shard.index <= shard.count:
+        raise ValueError(f"Invalid shard: {spec!r} (k must be between 1 and n)")
+    return shard
+
+
+def parse_verse_refs(spec: str) -> Dict[ChapterAddress, FrozenSet[int]]:
+    """Chapter address -> verse numbers of a spec like "2.13,2.20-25" or "10.1.1-10" """
+    verses: Dict[ChapterAddress, set] = {}
+    for ref in str(spec).split(','):
+        ref = ref.strip()
+        if not ref:
+            continue
+        label, _, verse_spec = ref.rpartition('.')
+        try:
+            address = ChapterAddress.from_label(label)
+        except ValueError:
+            raise ValueError(f"Invalid verse reference: {ref!r} (expected chapter.verse or canto.chapter.verse)")
+        verses.setdefault(address, set()).update(parse_numbers(verse_spec))
+    
+    if not verses:
+        raise ValueError(f"Empty verse list: {spec!r}")
+    return {address: frozenset(numbers) for address, numbers in verses.items()}
+
+
+class WorkSelection(NamedTuple):
+    """Chapters and verses of a text to parse; unset fields select everything"""
+    cantos: Optional[FrozenSet[int]] = None
+    chapters: Optional[FrozenSet[int]] = None
+    verses: Optional[Dict[ChapterAddress, FrozenSet[int]]] = None
+    shard: Optional[Shard] = None
+    max_chapters: Optional[int] = None
+    
+    @classmethod
+    def from_options(cls, options: dict) -> 'WorkSelection':
+        """Selection from CLI / integration API options (specs as strings or number lists)"""
+        def numbers(value):
+            if value is None or value == '':
+                return None
+            if isinstance(value, (list, tuple)):
+                return parse_numbers(','.join(str(number) for number in value))
+            return parse_numbers(value)
+        
+        max_chapters = options.get('max_chapters')
+        if max_chapters is not None and int(max_chapters) < 1:
+            raise ValueError(f"max_chapters must be positive, got {max_chapters}")
+        
+        return cls(
+            cantos=numbers(options.get('cantos')),
+            chapters=numbers(options.get('chapters')),
+            verses=parse_verse_refs(options['verses']) if options.get('verses') else None,
+            shard=parse_shard(options['shard']) if options.get('shard') else None,
+            max_chapters=int(max_chapters) if max_chapters is not None else None
+        )
+    
+    @property
+    def is_partial(self) -> bool:
+        """Whether the selection leaves out part of the text"""
+        return any(value is not None for value in self)
+    
+    def addresses(self, all_addresses: Iterable[ChapterAddress]) -> List[ChapterAddress]:
+        """Selected chapter addresses, in the reading order of all_addresses
+        
+        A shard takes every n-th of the chapters left by the other filters, so
+        machines running the same selection with shards 1/n..n/n split it evenly.
+        """
+        selected = [
+            address for address in all_addresses
+            # Single-level texts (BG) have no cantos, --cantos does not apply to them
+            if (self.cantos is None or address.canto is None or address.canto in self.cantos)
+            and (self.chapters is None or address.chapter in self.chapters)
+            and (self.verses is None or address in self.verses)
+        ]
+        if self.shard:
+            selected = selected[self.shard.index - 1::self.shard.count]
+        if self.max_chapters is not None:
+            selected = selected[:self.max_chapters]
+        return selected
+    
+    def unknown_verse_chapters(self, all_addresses: Iterable[ChapterAddress]) -> List[ChapterAddress]:
+        """Chapters of the verse list that the text does not have (e.g. "1.2.3" for BG)"""
+        if self.verses is None:
+            return []
+        known = set(all_addresses)
+        return [address for address in self.verses if address not in known]
+    
+    def keeps(self, verse) -> bool:
+        """Whether a parsed verse is part of the selection (only a verse list drops verses)"""
+        if self.verses is None:
+            return True
+        numbers = self.verses.get(ChapterAddress(verse.chapter, verse.canto))
+        return numbers is not None and verse.verse_number in numbers
+    
+    def describe(self) -> str:
+        """Short description for logs: "cantos 10-12, shard 3/8" """
+        parts = []
+        if self.cantos is not None:
+            parts.append(f"cantos {_format_numbers(self.cantos)}")
+        if self.chapters is not None:
+            parts.append(f"chapters {_format_numbers(self.chapters)}")
+        if self.verses is not None:
+            parts.append(f"{sum(len(numbers) for numbers in self.verses.values())} verses in {len(self.verses)} chapters")
+        if self.shard:
+            parts.append(f"shard {self.shard}")
+        if self.max_chapters is not None:
+            parts.append(f"up to {self.max_chapters} chapter{'s' if self.max_chapters != 1 else ''}")
+        return ', '.join(parts) or 'all chapters'
+
+
+def _format_numbers(numbers: FrozenSet[int]) -> str:
+    """Compact form of a number set: {1, 2, 3, 7} -> "1-3,7" """
+    ranges = []
+    for number in sorted(numbers):
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ','.join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
@@ -0,0 +1,7 @@
+"""
+Tests import the parser modules from python-parser/, as the CLI scripts do
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
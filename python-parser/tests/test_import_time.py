@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PARSER_DIR = Path(__file__).parent.parent
+
+
+def test_entry_points_stay_within_their_import_budgets():
+    # Budgets are doubled: a loaded CI machine is slower than a developer one
+    completed = subprocess.run(
+        [sys.executable, 'check_import_time.py', '--scale', '2'],
+        cwd=PARSER_DIR, capture_output=True, text=True, timeout=600
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
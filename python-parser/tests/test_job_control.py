@@ -0,0 +1,36 @@
+import asyncio
+import sys
+
+import main
+from job_control import send_command
+
+
+def test_cancelling_during_the_first_text_stops_the_rest(monkeypatch, tmp_path):
+    real_parser_class = main.parser_class
+    jobs, parsed = [], []
+    
+    def stub_parser_class(text_type):
+        class StubParser(real_parser_class(text_type)):
+            async def parse_address(self, address):
+                if not parsed:
+                    # Cancel through the control socket while the first chapter runs
+                    replies = await send_command('cancel', self.job.job_id, str(tmp_path))
+                    assert replies[0]['data']['state'] == 'cancelling'
+                    jobs.append(self.job)
+                parsed.append((self.text_type, address.label))
+                return []
+        
+        return StubParser
+    
+    monkeypatch.setattr(main, 'parser_class', stub_parser_class)
+    monkeypatch.setenv('PARSER_CONTROL_DIR', str(tmp_path))
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--text-type', 'all', '--no-save', '--max-chapters', '3'])
+    monkeypatch.setitem(main.PARSER_CONFIG, 'max_concurrency', 1)
+    asyncio.run(main.main())
+    
+    assert parsed == [('bg', '1')]
+    job = jobs[0]
+    assert job.state == 'cancelled'
+    assert job.chapters_total == 9
+    assert job.chapters_done == 1
+    assert not list(tmp_path.glob('*.sock'))
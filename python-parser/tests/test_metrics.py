@@ -0,0 +1,48 @@
+import asyncio
+
+from bhagavad_gita_parser import BhagavadGitaParser
+from metrics import CrawlMetrics
+from records import ChapterAddress
+
+
+def cached_parser(cache_dir):
+    parser = BhagavadGitaParser({'page_cache_dir': cache_dir and str(cache_dir)})
+    parser.metrics = CrawlMetrics()
+    parser.fetched = []
+    
+    async def fetch_page(url):
+        parser.fetched.append(url)
+        return f"<html>{url}</html>"
+    
+    parser._fetch_page = fetch_page
+    return parser
+
+
+def test_page_cache_counts_hits_and_misses(tmp_path):
+    parser = cached_parser(tmp_path)
+    
+    async def crawl():
+        return [await parser._fetch_chapter_page(ChapterAddress(chapter)) for chapter in (1, 2, 1, 1)]
+    
+    pages = asyncio.run(crawl())
+    assert pages[0] == pages[2] == pages[3]
+    assert len(parser.fetched) == 2
+    assert (tmp_path / 'bg' / '1.html').read_text(encoding='utf-8') == pages[0]
+    assert parser.metrics.value('parser_page_cache_misses_total', text='bg') == 2
+    assert parser.metrics.value('parser_page_cache_hits_total', text='bg') == 2
+    
+    exported = parser.metrics.prometheus()
+    assert 'parser_page_cache_hits_total{text="bg"} 2' in exported
+    assert 'parser_page_cache_misses_total{text="bg"} 2' in exported
+    assert parser.metrics.report()['metrics']['parser_page_cache_hits_total']['series'] == [
+        {'labels': {'text': 'bg'}, 'value': 2}
+    ]
+
+
+def test_page_cache_counters_stay_off_without_a_cache():
+    parser = cached_parser(None)
+    asyncio.run(parser._fetch_chapter_page(ChapterAddress(1)))
+    
+    assert len(parser.fetched) == 1
+    assert 'parser_page_cache_hits_total' not in parser.metrics.snapshot()
+    assert 'parser_page_cache_misses_total' not in parser.metrics.snapshot()
@@ -0,0 +1,112 @@
+import pytest
+
+from records import ChapterAddress
+from selection import Shard, WorkSelection, parse_numbers, parse_shard, parse_verse_refs
+
+BG = [ChapterAddress(chapter) for chapter in range(1, 19)]
+SB = [ChapterAddress(chapter, canto) for canto in (1, 2, 3) for chapter in range(1, 5)]
+
+
+@pytest.mark.parametrize('spec, numbers', [
+    ('5', {5}),
+    ('1-3', {1, 2, 3}),
+    ('1,3,5-7', {1, 3, 5, 6, 7}),
+    (' 3 - 5 ', {3, 4, 5}),
+    ('1,,2', {1, 2}),
+    ('2-2', {2}),
+])
+def test_parse_numbers(spec, numbers):
+    assert parse_numbers(spec) == numbers
+
+
+@pytest.mark.parametrize('spec', ['0', '5-3', 'x', '1-x', ',', ''])
+def test_parse_numbers_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_numbers(spec)
+
+
+def test_parse_shard():
+    assert parse_shard('3/8') == Shard(3, 8)
+    assert str(parse_shard('1/1')) == '1/1'
+
+
+@pytest.mark.parametrize('spec', ['0/3', '4/3', '3', 'a/b', '-1', '1/'])
+def test_parse_shard_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_parse_verse_refs():
+    assert parse_verse_refs('2.13,2.20-22,3.1') == {
+        ChapterAddress(2): {13, 20, 21, 22},
+        ChapterAddress(3): {1}
+    }
+    assert parse_verse_refs('10.1.1-3, 10.1.5') == {ChapterAddress(1, 10): {1, 2, 3, 5}}
+
+
+@pytest.mark.parametrize('spec', ['13', '1.2.3.4', 'x.1', '2.x', '2.', '1-2.3', ''])
+def test_parse_verse_refs_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_verse_refs(spec)
+
+
+def test_empty_options_select_everything():
+    selection = WorkSelection.from_options({'cantos': None, 'chapters': '', 'verses': None})
+    assert not selection.is_partial
+    assert selection.addresses(SB) == SB
+    assert selection.describe() == 'all chapters'
+
+
+def test_from_options_accepts_number_lists():
+    selection = WorkSelection.from_options({'cantos': [2, 3], 'chapters': '1-2'})
+    assert selection.cantos == {2, 3}
+    assert selection.addresses(SB) == [
+        ChapterAddress(1, 2), ChapterAddress(2, 2), ChapterAddress(1, 3), ChapterAddress(2, 3)
+    ]
+
+
+@pytest.mark.parametrize('options', [{'max_chapters': 0}, {'max_chapters': '-2'}, {'shard': '9/8'}, {'cantos': '3-1'}])
+def test_from_options_rejects(options):
+    with pytest.raises(ValueError):
+        WorkSelection.from_options(options)
+
+
+def test_cantos_do_not_apply_to_single_level_texts():
+    assert WorkSelection.from_options({'cantos': '2'}).addresses(BG) == BG
+
+
+def test_shards_split_the_selection_evenly():
+    options = {'cantos': '1-2'}
+    shards = [WorkSelection.from_options({**options, 'shard': f"{index}/3"}).addresses(SB) for index in (1, 2, 3)]
+    selected = WorkSelection.from_options(options).addresses(SB)
+    
+    assert sorted(address for shard in shards for address in shard) == sorted(selected)
+    assert [len(shard) for shard in shards] == [3, 3, 2]
+    assert shards[1] == [ChapterAddress(2, 1), ChapterAddress(1, 2), ChapterAddress(4, 2)]
+
+
+def test_max_chapters_applies_after_shard():
+    selection = WorkSelection.from_options({'cantos': '2-3', 'chapters': [1, 2], 'shard': '2/2', 'max_chapters': '1'})
+    assert selection.addresses(SB) == [ChapterAddress(2, 2)]
+    assert selection.describe() == 'cantos 2-3, chapters 1-2, shard 2/2, up to 1 chapter'
+
+
+def test_verse_list_selects_chapters_and_keeps_only_its_verses():
+    selection = WorkSelection.from_options({'verses': '2.13,2.20-25,4.1'})
+    assert selection.addresses(BG) == [ChapterAddress(2), ChapterAddress(4)]
+    assert selection.describe() == '8 verses in 2 chapters'
+    
+    class Verse:
+        def __init__(self, chapter, verse_number, canto=None):
+            self.chapter, self.verse_number, self.canto = chapter, verse_number, canto
+    
+    assert selection.keeps(Verse(2, 21))
+    assert not selection.keeps(Verse(2, 14))
+    assert not selection.keeps(Verse(3, 1))
+    assert WorkSelection().keeps(Verse(3, 1))
+
+
+def test_unknown_verse_chapters():
+    selection = WorkSelection.from_options({'verses': '2.1,1.2.3'})
+    assert selection.unknown_verse_chapters(BG) == [ChapterAddress(2, 1)]
+    assert WorkSelection().unknown_verse_chapters(BG) == []
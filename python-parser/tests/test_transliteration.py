@@ -0,0 +1,23 @@
+import pytest
+
+from transliteration import fold_transliteration
+
+
+@pytest.mark.parametrize('latin, cyrillic', [
+    ('yoga', 'йога'),
+    ('bhakti-yoga', 'бхакти-йога'),
+    ('Kṛṣṇa', 'Кр̣шн̣а'),
+    ('dhṛtarāṣṭra', 'дхр̣тара̄шт̣ра'),
+    ('śrī', 'ш́рӣ'),
+])
+def test_latin_and_cyrillic_spellings_fold_equal(latin, cyrillic):
+    assert fold_transliteration(latin) == fold_transliteration(cyrillic)
+
+
+def test_fold_drops_marks_punctuation_and_extra_spaces():
+    assert fold_transliteration('  дхр̣тара̄шт̣ра  ува̄ча, ') == 'дхритараштра увача'
+
+
+def test_fold_empty():
+    assert fold_transliteration('') == ''
+    assert fold_transliteration(None) == ''
@@ -0,0 +1,126 @@
+import pytest
+
+from records import VerseKey
+from verse_corpus import VerseCorpus, write_corpus
+
+BG = 'Бхагавад-гита'
+SB = 'Шримад-Бхагаватам'
+
+
+def verse(title, chapter, verse_number, canto=None, **fields):
+    row = {
+        'id': f"{title}-{canto}-{chapter}-{verse_number}",
+        'title': title,
+        'chapter': chapter,
+        'verseNumber': verse_number,
+        'canto': canto,
+        'language': 'ru',
+        'sanskrit': None,
+        'transliteration': None,
+        'wordByWordTranslation': None,
+        'translation': f"Перевод {chapter}.{verse_number}",
+        'commentary': None,
+        'source': 'vedabase.io',
+        'isMergedVerse': False,
+        'mergedWith': None,
+        'mergedBlockId': None
+    }
+    row.update(fields)
+    return row
+
+
+VERSES = [
+    verse(BG, 2, 1, sanskrit='सञ्जय उवाच', commentary='Комментарий'),
+    verse(BG, 2, 3, translation=''),
+    verse(BG, 2, 16, isMergedVerse=True, mergedWith=['16', '17', '18'], mergedBlockId='block-2-16',
+          translation='Общий перевод', commentary='Общий комментарий'),
+    verse(BG, 2, 17, isMergedVerse=True, mergedWith=['16', '17', '18'], mergedBlockId='block-2-16',
+          translation='Общий перевод', commentary='Общий комментарий'),
+    verse(SB, 2, 1, canto=1),
+    verse(SB, 2, 1, canto=3, translation='Третья песнь'),
+    verse(BG, 2, 1, language='en', translation='Translation 2.1'),
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / 'verses.vcorpus'
+    meta = write_corpus(VERSES, path, source='test')
+    assert meta['verses'] == len(VERSES)
+    assert meta['titles'] == [BG, SB]
+    with VerseCorpus(path) as corpus:
+        yield corpus
+
+
+def test_round_trip_keeps_every_field(corpus):
+    assert len(corpus) == len(VERSES)
+    assert corpus.meta['source'] == 'test'
+    for row in VERSES:
+        key = VerseKey(row['title'], row['chapter'], row['verseNumber'], row['language'], row['canto'])
+        stored = corpus.get(key)
+        assert stored['isMergedVerse'] is row['isMergedVerse']
+        assert stored['sanskrit'] == row['sanskrit']
+        assert stored['translation'] == row['translation']
+        assert stored['commentary'] == row['commentary']
+
+
+def test_null_and_empty_values_differ(corpus):
+    first = corpus.get(VerseKey(BG, 2, 1))
+    assert first['transliteration'] is None
+    assert first['mergedBlockId'] is None
+    assert corpus.get(VerseKey(BG, 2, 3))['translation'] == ''
+    assert corpus.field(VerseKey(BG, 2, 1), 'commentary') is not None
+    assert corpus.field(VerseKey(BG, 2, 3), 'commentary') is None
+
+
+def test_missing_verse_numbers_are_empty_slots(corpus):
+    assert corpus.get(VerseKey(BG, 2, 2)) is None
+    assert corpus.get(VerseKey(BG, 2, 15)) is None
+    assert corpus.get(VerseKey(BG, 2, 18)) is None
+    assert corpus.get(VerseKey(BG, 2, 0)) is None
+    assert corpus.field(VerseKey(BG, 2, 2), 'translation') is None
+    assert [row['verseNumber'] for row in corpus.chapter(BG, 2)] == [1, 3, 16, 17]
+
+
+def test_merged_verses_keep_the_block(corpus):
+    sixteen, seventeen = corpus.get(VerseKey(BG, 2, 16)), corpus.get(VerseKey(BG, 2, 17))
+    assert sixteen['isMergedVerse'] and seventeen['isMergedVerse']
+    assert not corpus.get(VerseKey(BG, 2, 1))['isMergedVerse']
+    # Non-string values are stored as JSON
+    assert sixteen['mergedWith'] == '["16", "17", "18"]'
+    assert sixteen['mergedBlockId'] == seventeen['mergedBlockId'] == 'block-2-16'
+    assert sixteen['translation'] == seventeen['translation'] == 'Общий перевод'
+
+
+def test_canto_and_language_are_part_of_the_key(corpus):
+    assert corpus.get(VerseKey(SB, 2, 1, canto=1))['translation'] == 'Перевод 2.1'
+    assert corpus.get(VerseKey(SB, 2, 1, canto=3))['translation'] == 'Третья песнь'
+    assert corpus.get(VerseKey(SB, 2, 1, canto=2)) is None
+    assert corpus.get(VerseKey(SB, 2, 1)) is None
+    assert corpus.get(VerseKey(BG, 2, 1, canto=1)) is None
+    assert corpus.get(VerseKey(BG, 2, 1, 'en'))['translation'] == 'Translation 2.1'
+    assert corpus.chapter(SB, 2, canto=3)[0]['canto'] == 3
+    assert sorted(corpus.keys()) == sorted(
+        VerseKey(row['title'], row['chapter'], row['verseNumber'], row['language'], row['canto'])
+        for row in VERSES
+    )
+
+
+def test_field_is_a_view_of_the_utf8_value(corpus):
+    value = corpus.field(VerseKey(BG, 2, 1), 'sanskrit')
+    assert isinstance(value, memoryview)
+    assert bytes(value).decode('utf-8') == 'सञ्जय उवाच'
+    assert corpus.field(VerseKey(BG, 9, 1), 'sanskrit') is None
+
+
+def test_rejects_verses_without_a_number(tmp_path):
+    with pytest.raises(ValueError):
+        write_corpus([verse(BG, 2, 0)], tmp_path / 'verses.vcorpus')
+    assert not list(tmp_path.iterdir())
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'backup.json'
+    path.write_bytes(b'{"verses": []}' + b' ' * 64)
+    with pytest.raises(ValueError, match='not a verse corpus file'):
+        VerseCorpus(path)
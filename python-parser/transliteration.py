@@ -0,0 +1,54 @@
+"""
+Diacritic folding for Sanskrit transliteration search
+"""
+import re
+import unicodedata
+
+# Letters whose diacritic changes the sound a user would type, folded before marks are stripped
+# (Cyrillic letter + combining mark, and precomposed Latin IAST letters)
+SOUND_FOLDS = {
+    'р\u0323\u0304': 'ри',  # р̣̄ (ṝ)
+    'р\u0323': 'ри',        # р̣ (ṛ)
+    'л\u0323': 'ли',        # л̣ (ḷ)
+    'ш\u0301': 'ш',         # ш́ (ś)
+    'ṝ': 'ри',
+    'ṛ': 'ри',
+    'ḹ': 'ли',
+    'ḷ': 'ли',
+    'ś': 'ш',
+    'ṣ': 'ш',
+    'ñ': 'нь',
+}
+
+# Latin base letters left over after stripping IAST marks, mapped to the Cyrillic users type.
+# y goes to и, not й: NFKD splits a stored й into и + U+0306 and the mark is stripped.
+LATIN_TO_CYRILLIC = str.maketrans({
+    'a': 'а', 'b': 'б', 'c': 'ч', 'd': 'д', 'e': 'е', 'g': 'г', 'h': 'х',
+    'i': 'и', 'j': 'дж', 'k': 'к', 'l': 'л', 'm': 'м', 'n': 'н', 'o': 'о',
+    'p': 'п', 'r': 'р', 's': 'с', 't': 'т', 'u': 'у', 'v': 'в', 'y': 'и',
+    'ё': 'е',
+})
+
+SOUND_FOLD_PATTERN = re.compile('|'.join(sorted(map(re.escape, SOUND_FOLDS), key=len, reverse=True)))
+COMBINING_MARKS_PATTERN = re.compile(r'[\u0300-\u036F]')
+NON_WORD_PATTERN = re.compile(r'[^\w\s]|_')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def fold_transliteration(text: str) -> str:
+    """Fold transliteration to the plain form users type: "дхр̣тара̄шт̣ра" -> "дхритараштра"
+
+    Pipeline: lowercase, fold sound-changing diacritics, Unicode NFKD, strip
+    combining marks (U+0300-U+036F), map leftover Latin letters to Cyrillic and
+    drop punctuation and hyphens. Used for both stored rows and search queries.
+    """
+    if not text:
+        return ""
+
+    text = unicodedata.normalize('NFC', text.lower())
+    text = SOUND_FOLD_PATTERN.sub(lambda match: SOUND_FOLDS[match.group(0)], text)
+    text = unicodedata.normalize('NFKD', text)
+    text = COMBINING_MARKS_PATTERN.sub('', text)
+    text = text.translate(LATIN_TO_CYRILLIC)
+    text = NON_WORD_PATTERN.sub('', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
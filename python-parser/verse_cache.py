@@ -0,0 +1,473 @@
+"""
+Read-through verse cache of the reading room
+
+The cache stores whole chapters. A verse, its previous and its next verse
+are answered from the cached rows of their chapter, with merged block text
+resolved as in get_chapter_range. A missing chapter is loaded from the
+database only once, even when a whole group session asks for it at the same
+moment. The chapters around it are then loaded in the background, so
+next/previous navigation across a chapter boundary is also served from memory.
+
+Backends: LRUBackend keeps the chapters in the process. RedisBackend stores
+them as JSON in Redis (or any server speaking its protocol, as lib/redis.ts
+does), so several service processes share them. The database writers
+announce the chapters they changed with NOTIFY verse_cache
+(database.VERSE_CACHE_CHANNEL), and every listening cache drops them.
+
+serve_verse_cache() answers the reading room routes of the Next.js app
+(lib/verse-cache.ts) over HTTP: python main.py --serve-verses.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from config import VEDABASE_URLS, VERSE_CACHE_CONFIG
+from database import VERSE_CACHE_CHANNEL, DatabaseManager
+from logging_setup import ROOT_LOGGER
+from records import VerseKey
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.verse_cache")
+
+KEY_PREFIX = 'verse-cache:'
+
+# Texts with cantos (SB) or lilas (CC): their chapters are only cached with the canto,
+# a chapter number alone matches a chapter in every canto
+MULTI_LEVEL_TITLES = frozenset(
+    info['name'] for info in VEDABASE_URLS.values() if 'cantos' in info or 'lilas' in info
+)
+
+
+class RedisError(Exception):
+    """Error reply of the Redis server"""
+
+
+class ChapterKey(NamedTuple):
+    """Chapter of a text in one language, the unit the cache stores"""
+    title: str
+    chapter: int
+    language: str = 'ru'
+    canto: Optional[int] = None  # SB canto / CC lila, None for single-level texts
+    
+    @classmethod
+    def of(cls, verse: VerseKey) -> 'ChapterKey':
+        return cls(verse.title, verse.chapter, verse.language, verse.canto)
+    
+    @property
+    def cache_key(self) -> str:
+        return f"{KEY_PREFIX}{self.title}:{self.language}:{self.canto or 0}:{self.chapter}"
+    
+    def shifted(self, offset: int) -> Optional['ChapterKey']:
+        """The chapter offset chapters away in the same canto, None before the first one"""
+        chapter = self.chapter + offset
+        return self._replace(chapter=chapter) if chapter >= 1 else None
+
+
+class LRUBackend:
+    """Chapters in this process; the least recently used are dropped first"""
+    
+    def __init__(self, max_chapters: int, ttl: float):
+        self.max_chapters = max_chapters
+        self.ttl = ttl
+        # cache key -> (expiry on the monotonic clock, rows)
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, rows = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return rows
+    
+    async def get_many(self, keys: List[str]) -> List[Optional[list]]:
+        return [await self.get(key) for key in keys]
+    
+    async def set(self, key: str, rows: list):
+        self._entries[key] = (time.monotonic() + self.ttl, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_chapters:
+            self._entries.popitem(last=False)
+    
+    async def delete(self, keys: List[str]):
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    async def clear(self):
+        self._entries.clear()
+    
+    async def close(self):
+        pass
+
+
+class RedisBackend:
+    """Chapters as JSON strings in Redis, shared by every process using the server
+    
+    Speaks the Redis protocol (RESP) over one connection. Commands are sent one
+    at a time under a lock, which is plenty for chapter-sized values.
+    """
+    
+    def __init__(self, url: str, ttl: float):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.username = parsed.username
+        self.password = parsed.password
+        self.database = int(parsed.path.lstrip('/') or 0)
+        self.ttl = ttl
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+    
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._send('AUTH', *([self.username] if self.username else []), self.password)
+        if self.database:
+            await self._send('SELECT', self.database)
+    
+    async def _send(self, *args):
+        """Send one command and read its reply"""
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        self._writer.write(b''.join(parts))
+        await self._writer.drain()
+        return await self._read_reply()
+    
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis closed the connection")
+        kind, value = line[:1], line[1:-2]
+        if kind == b'+':
+            return value.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(value.decode('utf-8'))
+        if kind == b':':
+            return int(value)
+        if kind == b'$':
+            length = int(value)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b'*':
+            count = int(value)
+            if count < 0:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line[:40]!r}")
+    
+    async def command(self, *args):
+        """Run a command, reconnecting once if the server dropped the connection"""
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._send(*args)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    await self._disconnect()
+                    if attempt:
+                        raise
+    
+    async def _disconnect(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+    
+    async def get(self, key: str) -> Optional[list]:
+        data = await self.command('GET', key)
+        return json.loads(data) if data is not None else None
+    
+    async def get_many(self, keys: List[str]) -> List[Optional[list]]:
+        """Several chapters in one round trip (MGET)"""
+        if not keys:
+            return []
+        return [json.loads(data) if data is not None else None for data in await self.command('MGET', *keys)]
+    
+    async def set(self, key: str, rows: list):
+        await self.command('SET', key, json.dumps(rows, ensure_ascii=False), 'PX', max(int(self.ttl * 1000), 1))
+    
+    async def delete(self, keys: List[str]):
+        if keys:
+            await self.command('DEL', *keys)
+    
+    async def clear(self):
+        cursor = b'0'
+        while True:
+            cursor, keys = await self.command('SCAN', cursor, 'MATCH', f"{KEY_PREFIX}*", 'COUNT', 500)
+            if keys:
+                await self.command('DEL', *keys)
+            if cursor == b'0':
+                return
+    
+    async def close(self):
+        async with self._lock:
+            await self._disconnect()
+
+
+def create_backend(name: str = None):
+    """Cache backend by name (lru or redis), configured from VERSE_CACHE_CONFIG"""
+    name = name or VERSE_CACHE_CONFIG['backend']
+    if name == 'lru':
+        return LRUBackend(VERSE_CACHE_CONFIG['max_chapters'], VERSE_CACHE_CONFIG['ttl'])
+    if name == 'redis':
+        return RedisBackend(VERSE_CACHE_CONFIG['redis_url'], VERSE_CACHE_CONFIG['ttl'])
+    raise ValueError(f"Unknown verse cache backend: {name} (expected lru or redis)")
+
+
+def _json_row(row: dict) -> dict:
+    """Verse row with its timestamps as ISO strings, the same from every backend"""
+    return {
+        column: value.isoformat() if isinstance(value, (datetime, date)) else value
+        for column, value in row.items()
+    }
+
+
+class VerseCache:
+    """Read-through cache of verse chapters over DatabaseManager.get_chapter_range"""
+    
+    def __init__(self, db, backend=None, prefetch_chapters: int = None):
+        self.db = db
+        self.backend = backend or create_backend()
+        if prefetch_chapters is None:
+            prefetch_chapters = VERSE_CACHE_CONFIG['prefetch_chapters']
+        self.prefetch_chapters = prefetch_chapters
+        self.stats = {'hits': 0, 'misses': 0, 'prefetched': 0, 'invalidated': 0, 'backend_errors': 0}
+        # Chapter loads in flight; concurrent misses of a chapter wait for the same load
+        self._loading: Dict[ChapterKey, asyncio.Future] = {}
+        self._prefetching = set()
+        self._background = set()
+        # Bumped by every invalidation; a load that saw it change does not store its rows
+        self._generation = 0
+        self._listener = None
+    
+    # --- Lookups ---
+    
+    async def chapter(self, key: ChapterKey, prefetch: bool = True) -> List[dict]:
+        """Verse rows of a chapter in verse order, from the cache or loaded once from the database"""
+        if key.canto is None and key.title in MULTI_LEVEL_TITLES:
+            raise ValueError(f"canto is required for {key.title}")
+        rows = await self._cached(key)
+        if rows is None:
+            self.stats['misses'] += 1
+            rows = await self._load(key)
+        else:
+            self.stats['hits'] += 1
+        if prefetch:
+            self._prefetch_around(key)
+        return rows
+    
+    async def verse(self, key: VerseKey) -> Optional[dict]:
+        rows = await self.chapter(ChapterKey.of(key))
+        return next((row for row in rows if row['verseNumber'] == key.verse_number), None)
+    
+    async def next_verse(self, key: VerseKey) -> Optional[dict]:
+        """The verse after key: a later one of its chapter or the first of the next chapter"""
+        chapter = ChapterKey.of(key)
+        for row in await self.chapter(chapter):
+            if row['verseNumber'] > key.verse_number:
+                return row
+        rows = await self.chapter(chapter.shifted(1))
+        return rows[0] if rows else None
+    
+    async def previous_verse(self, key: VerseKey) -> Optional[dict]:
+        """The verse before key: an earlier one of its chapter or the last of the previous chapter"""
+        chapter = ChapterKey.of(key)
+        for row in reversed(await self.chapter(chapter)):
+            if row['verseNumber'] < key.verse_number:
+                return row
+        previous = chapter.shifted(-1)
+        if previous is None:
+            return None
+        rows = await self.chapter(previous)
+        return rows[-1] if rows else None
+    
+    # --- Loading ---
+    
+    async def _cached(self, key: ChapterKey) -> Optional[list]:
+        try:
+            return await self.backend.get(key.cache_key)
+        except (OSError, RedisError) as e:
+            # The cache is an optimization: without the backend, read through to the database
+            self.stats['backend_errors'] += 1
+            logger.warning(f"⚠️ Verse cache backend unavailable: {e}")
+            return None
+    
+    async def _load(self, key: ChapterKey) -> List[dict]:
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = asyncio.ensure_future(self._fetch(key))
+            loading.add_done_callback(lambda _: self._loading.pop(key, None))
+        # A cancelled request must not cancel the load other requests wait for
+        return await asyncio.shield(loading)
+    
+    async def _fetch(self, key: ChapterKey) -> List[dict]:
+        generation = self._generation
+        rows = await self.db.get_chapter_range(key.title, key.chapter, canto=key.canto, language=key.language)
+        # Without a canto the query matches the chapter in every canto; keep the exact chapter
+        rows = [_json_row(row) for row in rows if row['canto'] == key.canto]
+        if generation == self._generation:
+            try:
+                await self.backend.set(key.cache_key, rows)
+            except (OSError, RedisError) as e:
+                self.stats['backend_errors'] += 1
+                logger.warning(f"⚠️ Could not cache {key.cache_key}: {e}")
+        return rows
+    
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    def _prefetch_around(self, key: ChapterKey):
+        neighbors = [
+            neighbor
+            for offset in range(1, self.prefetch_chapters + 1)
+            for neighbor in (key.shifted(offset), key.shifted(-offset))
+            if neighbor is not None and neighbor not in self._loading and neighbor not in self._prefetching
+        ]
+        if neighbors:
+            self._prefetching.update(neighbors)
+            self._spawn(self._prefetch(neighbors))
+    
+    async def _prefetch(self, keys: List[ChapterKey]):
+        """Load the chapters that are not cached yet; the backend is asked once for all of them"""
+        try:
+            cached = await self.backend.get_many([key.cache_key for key in keys])
+            missing = [key for key, rows in zip(keys, cached) if rows is None and key not in self._loading]
+            await asyncio.gather(*(self._load(key) for key in missing))
+            self.stats['prefetched'] += len(missing)
+        except (OSError, RedisError) as e:
+            self.stats['backend_errors'] += 1
+            logger.debug(f"Prefetch of {len(keys)} chapters skipped, backend unavailable: {e}")
+        except Exception as e:
+            logger.debug(f"Prefetch of {len(keys)} chapters failed: {e}")
+        finally:
+            self._prefetching.difference_update(keys)
+    
+    # --- Invalidation ---
+    
+    async def invalidate(self, chapters: Optional[Iterable[ChapterKey]] = None):
+        """Drop chapters from the cache, all of them when chapters is None"""
+        self._generation += 1
+        try:
+            if chapters is None:
+                await self.backend.clear()
+                logger.info("🧹 Verse cache cleared")
+                return
+            keys = [chapter.cache_key for chapter in chapters]
+            await self.backend.delete(keys)
+            self.stats['invalidated'] += len(keys)
+        except (OSError, RedisError) as e:
+            self.stats['backend_errors'] += 1
+            logger.warning(f"⚠️ Could not invalidate cached chapters: {e}")
+    
+    def _on_notify(self, connection, pid, channel, payload: str):
+        if payload == '*':
+            self._spawn(self.invalidate())
+            return
+        try:
+            chapters = [ChapterKey(*chapter) for chapter in json.loads(payload)]
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring malformed {VERSE_CACHE_CHANNEL} notification: {e}")
+            return
+        self._spawn(self.invalidate(chapters))
+    
+    async def listen(self):
+        """Drop the chapters announced by the database writers of any process"""
+        self._listener = await self.db.pool.acquire()
+        await self._listener.add_listener(VERSE_CACHE_CHANNEL, self._on_notify)
+    
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            await listener.remove_listener(VERSE_CACHE_CHANNEL, self._on_notify)
+            await self.db.pool.release(listener)
+        await self.backend.close()
+
+
+def _verse_key(query) -> VerseKey:
+    """Verse key of the query parameters title, chapter, verse, language and canto"""
+    if not query.get('title'):
+        raise ValueError("title is required")
+    if not query.get('canto') and query['title'] in MULTI_LEVEL_TITLES:
+        # Answered at once: the route falls back to the database without a cache load
+        raise ValueError(f"canto is required for {query['title']}")
+    return VerseKey(
+        title=query['title'],
+        chapter=int(query['chapter']),
+        verse_number=int(query.get('verse', 0)),
+        language=query.get('language') or 'ru',
+        canto=int(query['canto']) if query.get('canto') else None
+    )
+
+
+async def serve_verse_cache(cache: VerseCache, port: int, host: str = '127.0.0.1'):
+    """Serve the cache over HTTP; returns the runner to clean up
+    
+    GET /verses/verse, /verses/next and /verses/previous take the query
+    parameters title, chapter, verse, language and canto (required for SB
+    and CC, 400 without it), and answer
+    {"success", "error", "data"} with the verse row (null when there is none).
+    GET /verses/chapter takes the same without verse, /verses/stats returns
+    the cache counters.
+    """
+    from aiohttp import web
+    
+    lookups = {
+        'verse': cache.verse,
+        'next': cache.next_verse,
+        'previous': cache.previous_verse,
+        'chapter': lambda key: cache.chapter(ChapterKey.of(key))
+    }
+    
+    def respond(data, error: str = None, status: int = 200):
+        return web.json_response({'success': error is None, 'error': error, 'data': data}, status=status)
+    
+    async def handle_lookup(request):
+        try:
+            key = _verse_key(request.query)
+        except (KeyError, ValueError) as e:
+            return respond(None, f"Invalid verse parameters: {e}", 400)
+        try:
+            return respond(await lookups[request.match_info['lookup']](key))
+        except Exception as e:
+            logger.error(f"❌ Verse cache lookup {request.path_qs} failed: {e}")
+            return respond(None, str(e), 500)
+    
+    async def handle_stats(request):
+        return respond({**cache.stats, 'backend': type(cache.backend).__name__})
+    
+    app = web.Application()
+    app.router.add_get('/verses/stats', handle_stats)
+    app.router.add_get('/verses/{lookup:verse|next|previous|chapter}', handle_lookup)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"📖 Verse cache ({type(cache.backend).__name__}) available at http://{host}:{port}/verses")
+    return runner
+
+
+async def run_verse_service(port: int = None, backend: str = None):
+    """Serve the verse cache until interrupted (python main.py --serve-verses)"""
+    async with DatabaseManager(profile='interactive_read') as db:
+        cache = VerseCache(db, create_backend(backend))
+        await cache.listen()
+        runner = await serve_verse_cache(cache, port or VERSE_CACHE_CONFIG['port'])
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+            await cache.close()
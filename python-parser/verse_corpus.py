@@ -0,0 +1,307 @@
+"""
+Read-only verse corpus file for lookups without the database
+
+A compact binary snapshot of the verses, written from the database or from a
+backup of scripts/backup_verses.py and read through mmap. Offline tools and
+reports open it in milliseconds and look up any verse in O(1):
+
+    with VerseCorpus('verses.vcorpus') as corpus:
+        verse = corpus.get(VerseKey('Бхагавад-гита', 2, 13))
+        translation = corpus.field(VerseKey('Бхагавад-гита', 2, 13), 'translation')  # memoryview, no copy
+
+Layout (little-endian, sections aligned to 8 bytes):
+
+    header      magic, version, section sizes and offsets (HEADER)
+    meta        JSON: titles, languages, verse count, source, creation time
+    chapters    one CHAPTER record per (title, language, canto, chapter):
+                its first slot and slot count, sorted by key
+    slots       one SLOT record per verse number 1..max of every chapter:
+                flags and the (offset, length) of every FIELDS value
+    strings     UTF-8 values; equal values (texts of a merged block) are stored once
+
+Opening the file reads the header and the chapter table into a dict; a
+verse is then its chapter's first slot + verse number - 1. Merged block text
+is resolved, as in the backups, so every verse slot is self-contained.
+"""
+import gzip
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from records import VerseKey
+
+MAGIC = b'VCORPUS\x00'
+VERSION = 1
+
+# magic, version, meta length, chapter count, slot count, chapters offset, slots offset, strings offset
+HEADER = struct.Struct('<8sIIIIQQQ')
+# title index, language index, canto (0 for single-level texts), chapter, first slot, slot count
+CHAPTER = struct.Struct('<HHHHII')
+
+# Verse values stored as strings, in slot order
+FIELDS = (
+    'id', 'sanskrit', 'transliteration', 'wordByWordTranslation', 'translation',
+    'commentary', 'source', 'mergedWith', 'mergedBlockId'
+)
+# flags, then (offset, length) in the strings section of every field
+SLOT = struct.Struct('<I' + 'II' * len(FIELDS))
+
+# Slot flags; FLAG_NULL << i marks FIELDS[i] as NULL
+FLAG_PRESENT = 1
+FLAG_MERGED = 2
+FLAG_NULL = 1 << 8
+
+# Offsets and lengths are 32-bit
+MAX_STRINGS_SIZE = 2 ** 32 - 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def load_backup_verses(path: str) -> Tuple[List[dict], dict]:
+    """Verses and metadata of a backup file of scripts/backup_verses.py (.json or .json.gz)"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        backup = json.load(f)
+    return backup['verses'], backup.get('metadata', {})
+
+
+def write_corpus(verses: Iterable[dict], path: str, source: str = None) -> dict:
+    """Write verse rows (get_verses_for_backup or backup format) to a corpus file
+    
+    Returns the metadata stored in the file. The file is replaced atomically,
+    so readers that have the old one mapped keep reading it.
+    """
+    chapters: Dict[tuple, Dict[int, dict]] = {}
+    titles: Dict[str, int] = {}
+    languages: Dict[str, int] = {}
+    for verse in verses:
+        if verse['verseNumber'] < 1:
+            raise ValueError(f"Verse {verse['id']} has no verse number: {verse['verseNumber']}")
+        title = titles.setdefault(verse['title'], len(titles))
+        language = languages.setdefault(verse.get('language') or 'ru', len(languages))
+        key = (title, language, verse.get('canto') or 0, verse['chapter'])
+        chapters.setdefault(key, {})[verse['verseNumber']] = verse
+    
+    strings = bytearray()
+    interned: Dict[str, Tuple[int, int]] = {}
+    
+    def intern(value: str) -> Tuple[int, int]:
+        if value not in interned:
+            encoded = value.encode('utf-8')
+            interned[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return interned[value]
+    
+    chapter_table = bytearray()
+    slot_table = bytearray()
+    empty_slot = SLOT.pack(0, *([0] * 2 * len(FIELDS)))
+    slot_count = 0
+    for key in sorted(chapters):
+        chapter_verses = chapters[key]
+        size = max(chapter_verses)
+        chapter_table += CHAPTER.pack(*key, slot_count, size)
+        slot_count += size
+        for number in range(1, size + 1):
+            verse = chapter_verses.get(number)
+            if verse is None:
+                slot_table += empty_slot
+                continue
+            flags = FLAG_PRESENT | (FLAG_MERGED if verse.get('isMergedVerse') else 0)
+            spans = []
+            for index, field in enumerate(FIELDS):
+                value = verse.get(field)
+                if value is None:
+                    flags |= FLAG_NULL << index
+                    spans += (0, 0)
+                    continue
+                if not isinstance(value, str):
+                    value = json.dumps(value, ensure_ascii=False)
+                spans += intern(value)
+            slot_table += SLOT.pack(flags, *spans)
+    
+    if len(strings) > MAX_STRINGS_SIZE:
+        raise ValueError(f"Verse texts take {len(strings)} bytes, a corpus file holds up to {MAX_STRINGS_SIZE}")
+    
+    meta = {
+        'titles': list(titles),
+        'languages': list(languages),
+        'verses': sum(len(chapter_verses) for chapter_verses in chapters.values()),
+        'source': source,
+        'created_at': datetime.now().isoformat()
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    chapters_offset = _align(HEADER.size + len(meta_bytes))
+    slots_offset = _align(chapters_offset + len(chapter_table))
+    strings_offset = _align(slots_offset + len(slot_table))
+    
+    path = Path(path)
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(partial, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(meta_bytes), len(chapters), slot_count,
+                            chapters_offset, slots_offset, strings_offset))
+        for offset, section in ((HEADER.size, meta_bytes), (chapters_offset, chapter_table),
+                                (slots_offset, slot_table), (strings_offset, strings)):
+            f.write(b'\x00' * (offset - f.tell()))
+            f.write(section)
+    os.replace(partial, path)
+    return meta
+
+
+async def export_corpus(path: str, language: str = None) -> dict:
+    """Write the verses of the database (merged block text resolved) to a corpus file"""
+    from database import DatabaseManager
+    
+    async with DatabaseManager(profile='backup_stream') as db:
+        verses = await db.get_verses_for_backup(language=language)
+    return write_corpus(verses, path, source='database')
+
+
+class VerseCorpus:
+    """Memory-mapped corpus file; lookups read only the slot and the values asked for
+    
+    Values returned by field() are views of the mapping and are valid until close().
+    """
+    
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        
+        (magic, version, meta_length, chapter_count, self.slot_count,
+         chapters_offset, self._slots_offset, strings_offset) = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a verse corpus file")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} has corpus version {version}, expected {VERSION}")
+        
+        self.meta = json.loads(bytes(self._view[HEADER.size:HEADER.size + meta_length]))
+        self._strings = self._view[strings_offset:]
+        
+        titles, languages = self.meta['titles'], self.meta['languages']
+        chapters_end = chapters_offset + chapter_count * CHAPTER.size
+        # (title, language, canto, chapter) -> (first slot, slot count)
+        self._chapters: Dict[tuple, Tuple[int, int]] = {
+            (titles[title], languages[language], canto or None, chapter): (first, count)
+            for title, language, canto, chapter, first, count
+            in CHAPTER.iter_unpack(self._view[chapters_offset:chapters_end])
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        if self._mmap.closed:
+            return
+        for view in ('_strings', '_view'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Field views are still referenced; the mapping goes away with them
+            pass
+    
+    def __len__(self) -> int:
+        return self.meta['verses']
+    
+    def _slot(self, key: VerseKey) -> Optional[tuple]:
+        chapter = self._chapters.get((key.title, key.language, key.canto, key.chapter))
+        if chapter is None or not 1 <= key.verse_number <= chapter[1]:
+            return None
+        slot = SLOT.unpack_from(self._view, self._slots_offset + (chapter[0] + key.verse_number - 1) * SLOT.size)
+        return slot if slot[0] & FLAG_PRESENT else None
+    
+    def _value(self, slot: tuple, index: int) -> Optional[memoryview]:
+        if slot[0] & (FLAG_NULL << index):
+            return None
+        offset, length = slot[1 + 2 * index], slot[2 + 2 * index]
+        return self._strings[offset:offset + length]
+    
+    def field(self, key: VerseKey, name: str) -> Optional[memoryview]:
+        """UTF-8 bytes of one value of a verse, without copying; None for a NULL value or unknown verse"""
+        slot = self._slot(key)
+        return self._value(slot, FIELDS.index(name)) if slot else None
+    
+    def get(self, key: VerseKey) -> Optional[dict]:
+        """Verse row (as get_verses_for_backup, without timestamps), None when the corpus has no such verse"""
+        slot = self._slot(key)
+        if slot is None:
+            return None
+        row = {
+            'title': key.title,
+            'chapter': key.chapter,
+            'verseNumber': key.verse_number,
+            'canto': key.canto,
+            'language': key.language,
+            'isMergedVerse': bool(slot[0] & FLAG_MERGED)
+        }
+        for index, name in enumerate(FIELDS):
+            value = self._value(slot, index)
+            row[name] = None if value is None else str(value, 'utf-8')
+        return row
+    
+    def chapter(self, title: str, chapter: int, language: str = 'ru', canto: int = None) -> List[dict]:
+        """Verses of a chapter in order"""
+        chapter_slots = self._chapters.get((title, language, canto, chapter))
+        if chapter_slots is None:
+            return []
+        verses = (self.get(VerseKey(title, chapter, number, language, canto)) for number in range(1, chapter_slots[1] + 1))
+        return [verse for verse in verses if verse is not None]
+    
+    def keys(self) -> Iterator[VerseKey]:
+        """Keys of all verses, in the order of the file"""
+        for (title, language, canto, chapter), (_, count) in self._chapters.items():
+            for number in range(1, count + 1):
+                key = VerseKey(title, chapter, number, language, canto)
+                if self._slot(key) is not None:
+                    yield key
+
+
+def main():
+    """Summary of a corpus file, or the verses given by --verses"""
+    import argparse
+    import time
+    
+    from config import VEDABASE_URLS
+    from selection import parse_verse_refs
+    
+    parser = argparse.ArgumentParser(description='Look up verses in a corpus file without the database')
+    parser.add_argument('corpus', help='Corpus file (scripts/backup_verses.py corpus)')
+    parser.add_argument('--text-type', '-t', choices=list(VEDABASE_URLS), default='bg')
+    parser.add_argument('--verses', help='chapter.verse for BG (2.13,2.20-25), canto.chapter.verse for SB/CC (10.1.1-10)')
+    parser.add_argument('--language', default='ru')
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    with VerseCorpus(args.corpus) as corpus:
+        print(f"📚 {args.corpus}: {len(corpus)} verses in {len(corpus._chapters)} chapters, "
+              f"opened in {(time.perf_counter() - start) * 1000:.2f} ms")
+        print(f"   {corpus.meta['source'] or 'unknown source'}, created {corpus.meta['created_at']}")
+        if not args.verses:
+            return
+        
+        title = VEDABASE_URLS[args.text_type]['name']
+        for address, numbers in parse_verse_refs(args.verses).items():
+            for number in sorted(numbers):
+                verse = corpus.get(VerseKey(title, address.chapter, number, args.language, address.canto))
+                label = f"{address.label}.{number}"
+                if verse is None:
+                    print(f"❌ {label}: not in the corpus")
+                else:
+                    print(f"📖 {label}: {(verse['translation'] or '')[:100]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+"""
+Chapter work queue in Postgres for crawling with many workers
+
+Every chapter to parse is a row of parse_jobs. Workers (processes on any
+machine running this parser against the same database) claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so two workers never get the same job
+and nobody waits on a row another worker holds. A claimed job carries a
+lease that its worker extends with heartbeats; when a worker dies, the
+lease runs out and another worker takes the job over. Failed jobs are
+retried with exponential backoff until max_attempts, then marked failed.
+
+All workers share one politeness budget per site (crawl_budget): every page
+request reserves the next free slot of the site, so the whole crawl makes at
+most one request per request_interval seconds however many workers run.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from config import BUNDLE_CONFIG, QUEUE_CONFIG, VEDABASE_BASE_URL
+from chapter_bundles import build_bundles
+from database import DatabaseManager
+from job_control import JobCancelled, ParseJob
+from logging_setup import ROOT_LOGGER
+from records import ChapterAddress
+
+logger = logging.getLogger(f"{ROOT_LOGGER}.work_queue")
+
+JOB_STATUSES = ('pending', 'running', 'done', 'failed')
+
+QUEUE_TABLES = """
+    CREATE TABLE IF NOT EXISTS parse_jobs (
+        id BIGSERIAL PRIMARY KEY,
+        queue TEXT NOT NULL,
+        "textType" TEXT NOT NULL,
+        canto INTEGER,
+        chapter INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        "maxAttempts" INTEGER NOT NULL,
+        worker TEXT,
+        "availableAt" TIMESTAMPTZ NOT NULL DEFAULT now(),
+        "leaseUntil" TIMESTAMPTZ,
+        "heartbeatAt" TIMESTAMPTZ,
+        "lastError" TEXT,
+        verses INTEGER,
+        "createdAt" TIMESTAMPTZ NOT NULL DEFAULT now(),
+        "updatedAt" TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    -- One job per chapter and queue; BG chapters have no canto
+    CREATE UNIQUE INDEX IF NOT EXISTS parse_jobs_queue_chapter_key
+        ON parse_jobs (queue, "textType", COALESCE(canto, 0), chapter);
+    CREATE INDEX IF NOT EXISTS parse_jobs_queue_status_idx
+        ON parse_jobs (queue, status, "availableAt");
+    CREATE TABLE IF NOT EXISTS crawl_budget (
+        site TEXT PRIMARY KEY,
+        "nextSlotAt" TIMESTAMPTZ NOT NULL
+    );
+"""
+
+QUEUE_STATEMENTS = {
+    # Re-enqueueing a chapter starts it over unless a worker holds it right now
+    'enqueue': """
+        INSERT INTO parse_jobs (queue, "textType", canto, chapter, "maxAttempts")
+        SELECT $1, $2, canto, chapter, $5
+        FROM unnest($3::int[], $4::int[]) AS j(canto, chapter)
+        ON CONFLICT (queue, "textType", COALESCE(canto, 0), chapter) DO UPDATE SET
+            status = 'pending', attempts = 0, "maxAttempts" = EXCLUDED."maxAttempts",
+            worker = NULL, "availableAt" = now(), "leaseUntil" = NULL, "lastError" = NULL,
+            verses = NULL, "updatedAt" = now()
+        WHERE parse_jobs.status <> 'running'
+    """,
+    # Jobs whose worker stopped heartbeating after its last attempt will not be claimed again
+    'expire': """
+        UPDATE parse_jobs SET status = 'failed', worker = NULL, "leaseUntil" = NULL,
+            "lastError" = COALESCE("lastError", 'lease expired'), "updatedAt" = now()
+        WHERE queue = $1 AND status = 'running' AND "leaseUntil" < now() AND attempts >= "maxAttempts"
+    """,
+    # Pending jobs that are due and running jobs whose lease expired, oldest first
+    'claim': """
+        UPDATE parse_jobs SET
+            status = 'running', worker = $2, attempts = attempts + 1,
+            "leaseUntil" = now() + $3::float8 * interval '1 second', "heartbeatAt" = now(), "updatedAt" = now()
+        WHERE id = (
+            SELECT id FROM parse_jobs
+            WHERE queue = $1
+              AND ((status = 'pending' AND "availableAt" <= now())
+                   OR (status = 'running' AND "leaseUntil" < now() AND attempts < "maxAttempts"))
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, "textType", canto, chapter, attempts
+    """,
+    # Every update of a claimed job checks that the worker still holds it
+    'heartbeat': """
+        UPDATE parse_jobs SET "leaseUntil" = now() + $3::float8 * interval '1 second', "heartbeatAt" = now()
+        WHERE id = $1 AND worker = $2 AND status = 'running'
+    """,
+    'complete': """
+        UPDATE parse_jobs SET status = 'done', verses = $3, worker = NULL, "leaseUntil" = NULL,
+            "lastError" = NULL, "updatedAt" = now()
+        WHERE id = $1 AND worker = $2 AND status = 'running'
+    """,
+    # Retry after retry_delay * 2^(attempts - 1) seconds, or give up after the last attempt
+    'fail': """
+        UPDATE parse_jobs SET
+            status = CASE WHEN attempts >= "maxAttempts" THEN 'failed' ELSE 'pending' END,
+            "availableAt" = now() + $4::float8 * power(2, attempts - 1) * interval '1 second',
+            worker = NULL, "leaseUntil" = NULL, "lastError" = $3, "updatedAt" = now()
+        WHERE id = $1 AND worker = $2 AND status = 'running'
+        RETURNING status
+    """,
+    # A stopped worker gives its job back without using up an attempt
+    'release': """
+        UPDATE parse_jobs SET status = 'pending', attempts = attempts - 1, worker = NULL,
+            "leaseUntil" = NULL, "availableAt" = now(), "updatedAt" = now()
+        WHERE id = $1 AND worker = $2 AND status = 'running'
+    """,
+    # Start of the next free request slot of the site, reserved by this call
+    'reserve_request': """
+        INSERT INTO crawl_budget (site, "nextSlotAt")
+        VALUES ($1, clock_timestamp() + $2::float8 * interval '1 second')
+        ON CONFLICT (site) DO UPDATE SET
+            "nextSlotAt" = GREATEST(crawl_budget."nextSlotAt", clock_timestamp()) + $2::float8 * interval '1 second'
+        RETURNING EXTRACT(EPOCH FROM ("nextSlotAt" - clock_timestamp()))::float8 - $2::float8 AS wait
+    """,
+    'status': """
+        SELECT "textType", status, COUNT(*) AS jobs, COALESCE(SUM(verses), 0) AS verses,
+               COUNT(DISTINCT worker) AS workers, MIN("availableAt") AS next_available
+        FROM parse_jobs
+        WHERE queue = $1
+        GROUP BY "textType", status
+        ORDER BY "textType", status
+    """,
+    'errors': """
+        SELECT "textType", canto, chapter, attempts, "lastError"
+        FROM parse_jobs
+        WHERE queue = $1 AND status = 'failed'
+        ORDER BY "textType", canto NULLS FIRST, chapter
+        LIMIT $2
+    """
+}
+
+
+class QueueJob(NamedTuple):
+    """A chapter job claimed by a worker"""
+    id: int
+    text_type: str
+    address: ChapterAddress
+    attempts: int
+    
+    @property
+    def label(self) -> str:
+        return f"{self.text_type.upper()} {self.address.label}"
+
+
+def default_worker_id() -> str:
+    """host:pid, unique among the workers of a crawl"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """Named queue of chapter jobs in parse_jobs, used through a connected DatabaseManager"""
+    
+    # Database URLs whose queue tables were already created in this process
+    _schema_verified = set()
+    
+    def __init__(self, db: DatabaseManager, name: str = None, worker_id: str = None, config: dict = None):
+        self.db = db
+        self.config = {**QUEUE_CONFIG, **(config or {})}
+        self.name = name or self.config['name']
+        self.worker_id = worker_id or default_worker_id()
+    
+    @asynccontextmanager
+    async def _connection(self, query_name: str):
+        """Pool connection of the manager, timed with its query stats"""
+        with self.db.query_stats.timer(query_name):
+            async with self.db.pool.acquire() as conn:
+                yield conn
+    
+    async def _execute(self, name: str, *args) -> str:
+        async with self._connection(f"queue_{name}") as conn:
+            return await conn.execute(QUEUE_STATEMENTS[name], *args)
+    
+    async def _fetch(self, name: str, *args) -> list:
+        async with self._connection(f"queue_{name}") as conn:
+            return await conn.fetch(QUEUE_STATEMENTS[name], *args)
+    
+    async def ensure_schema(self):
+        """Create the queue and budget tables if missing"""
+        if self.db.database_url in WorkQueue._schema_verified:
+            return
+        async with self._connection('queue_ensure_schema') as conn:
+            await conn.execute(QUEUE_TABLES)
+        WorkQueue._schema_verified.add(self.db.database_url)
+    
+    async def enqueue(self, text_type: str, addresses: Iterable[ChapterAddress]) -> int:
+        """Add chapter jobs (or start finished ones over); returns the number of jobs queued"""
+        addresses = list(addresses)
+        if not addresses:
+            return 0
+        status = await self._execute(
+            'enqueue', self.name, text_type,
+            [address.canto for address in addresses], [address.chapter for address in addresses],
+            self.config['max_attempts']
+        )
+        # "INSERT 0 <rows>"
+        return int(status.split()[-1])
+    
+    async def claim(self) -> Optional[QueueJob]:
+        """Take the next due job (or one with an expired lease), None when there is none"""
+        await self._execute('expire', self.name)
+        rows = await self._fetch('claim', self.name, self.worker_id, self.config['lease_seconds'])
+        if not rows:
+            return None
+        row = rows[0]
+        return QueueJob(row['id'], row['textType'], ChapterAddress(row['chapter'], row['canto']), row['attempts'])
+    
+    async def heartbeat(self, job: QueueJob) -> bool:
+        """Extend the lease of a job; False when another worker has taken it over"""
+        status = await self._execute('heartbeat', job.id, self.worker_id, self.config['lease_seconds'])
+        return status.endswith(' 1')
+    
+    async def complete(self, job: QueueJob, verses: int) -> bool:
+        """Mark a job done; False when the lease was lost (the job runs elsewhere)"""
+        status = await self._execute('complete', job.id, self.worker_id, verses)
+        return status.endswith(' 1')
+    
+    async def fail(self, job: QueueJob, error: str) -> Optional[str]:
+        """Record a failed attempt; returns the new status (pending or failed), None if the lease was lost"""
+        rows = await self._fetch('fail', job.id, self.worker_id, error[:1000], self.config['retry_delay'])
+        return rows[0]['status'] if rows else None
+    
+    async def release(self, job: QueueJob):
+        """Give a job back to the queue without counting the attempt"""
+        await self._execute('release', job.id, self.worker_id)
+    
+    async def reserve_request(self, site: str) -> float:
+        """Reserve the next request slot of a site; returns seconds to wait for it"""
+        rows = await self._fetch('reserve_request', site, self.config['request_interval'])
+        return max(rows[0]['wait'], 0.0)
+    
+    async def status(self, error_limit: int = 10) -> dict:
+        """Job counts by text and status, active workers and the latest failures"""
+        rows = await self._fetch('status', self.name)
+        texts: Dict[str, dict] = {}
+        for row in rows:
+            text = texts.setdefault(row['textType'], {status: 0 for status in JOB_STATUSES})
+            text[row['status']] = row['jobs']
+            if row['status'] == 'done':
+                text['verses'] = row['verses']
+            if row['status'] == 'running':
+                text['workers'] = row['workers']
+        
+        failures = await self._fetch('errors', self.name, error_limit)
+        return {
+            'queue': self.name,
+            'texts': texts,
+            'remaining': sum(text['pending'] + text['running'] for text in texts.values()),
+            'failures': [
+                {
+                    'text_type': row['textType'],
+                    'chapter': ChapterAddress(row['chapter'], row['canto']).label,
+                    'attempts': row['attempts'],
+                    'error': row['lastError']
+                }
+                for row in failures
+            ]
+        }
+
+
+class RequestBudget:
+    """Politeness budget shared by all workers: waits for a reserved request slot before each fetch"""
+    
+    def __init__(self, queue: WorkQueue, site: str = None):
+        self.queue = queue
+        self.site = site or urlparse(VEDABASE_BASE_URL).netloc
+    
+    async def acquire(self):
+        wait = await self.queue.reserve_request(self.site)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+async def run_worker(db: DatabaseManager, queue: WorkQueue, parser_factory: Callable,
+                     concurrency: int = None, control: ParseJob = None) -> dict:
+    """Claim and parse chapter jobs until the queue has no pending or running jobs left
+    
+    parser_factory(text_type) returns a parser (not yet entered); one parser per
+    text type is kept open for the whole run. Parsed verses are saved before the
+    job is marked done, so a job that is interrupted in between is parsed again.
+    A control job (job_control.ParseJob) pauses the worker between chapters
+    and stops it when cancelled.
+    """
+    concurrency = concurrency or queue.config['concurrency']
+    budget = RequestBudget(queue) if queue.config['request_interval'] > 0 else None
+    totals = {'done': 0, 'retried': 0, 'failed': 0, 'lost': 0, 'verses': 0}
+    
+    async with AsyncExitStack() as stack:
+        parsers = {}
+        
+        async def parser_for(text_type: str):
+            if text_type not in parsers:
+                parser = parser_factory(text_type)
+                parser.request_budget = budget
+                parsers[text_type] = await stack.enter_async_context(parser)
+            return parsers[text_type]
+        
+        async def keep_lease(job: QueueJob):
+            while True:
+                await asyncio.sleep(queue.config['heartbeat_seconds'])
+                if not await queue.heartbeat(job):
+                    logger.warning(f"⚠️ Lost the lease of {job.label}, another worker took it over")
+                    return
+        
+        async def process(job: QueueJob):
+            heartbeat = asyncio.create_task(keep_lease(job))
+            if control:
+                control.chapter_started(job.label)
+            try:
+                parser = await parser_for(job.text_type)
+                verses = await parser.parse_address(job.address)
+                if not verses:
+                    # Jobs are known chapters: no verses means the fetch or the extraction failed
+                    raise RuntimeError("no verses parsed")
+                start = time.perf_counter()
+                saved = await db.save_verses(verses)
+                if control:
+                    control.batch_saved(saved, time.perf_counter() - start)
+            except asyncio.CancelledError:
+                await asyncio.shield(queue.release(job))
+                raise
+            except Exception as e:
+                status = await queue.fail(job, f"{type(e).__name__}: {e}")
+                if status == 'failed':
+                    totals['failed'] += 1
+                    logger.error(f"❌ {job.label} failed after {job.attempts} attempts: {e}")
+                elif status == 'pending':
+                    totals['retried'] += 1
+                    logger.warning(f"⚠️ {job.label} attempt {job.attempts} failed, will retry: {e}")
+                if control:
+                    control.chapter_finished(job.label, 0, failed=True)
+                return
+            finally:
+                heartbeat.cancel()
+            
+            if control:
+                control.chapter_finished(job.label, saved)
+            
+            if await queue.complete(job, saved):
+                totals['done'] += 1
+                totals['verses'] += saved
+                logger.info(f"✅ {job.label}: {saved} verses (attempt {job.attempts})")
+                if BUNDLE_CONFIG['enabled']:
+                    try:
+                        await build_bundles(db, job.text_type, [job.address])
+                    except OSError as e:
+                        logger.warning(f"⚠️ Chapter bundle of {job.label} was not written: {e}")
+            else:
+                totals['lost'] += 1
+                logger.warning(f"⚠️ {job.label} finished after its lease was lost")
+        
+        async def work_loop():
+            while True:
+                if control:
+                    try:
+                        await control.checkpoint()
+                    except JobCancelled:
+                        return
+                job = await queue.claim()
+                if job:
+                    await process(job)
+                    continue
+                # Nothing due: wait for retries and for the leases of other workers, stop when drained
+                if not (await queue.status(error_limit=0))['remaining']:
+                    return
+                await asyncio.sleep(queue.config['poll_interval'])
+        
+        logger.info(f"Worker {queue.worker_id} processing queue '{queue.name}' with {concurrency} job(s) at a time")
+        await asyncio.gather(*(work_loop() for _ in range(concurrency)))
+    
+    return totals
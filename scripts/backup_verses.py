@@ -20,6 +20,7 @@ sys.path.append(str(Path(__file__).parent.parent / "python-parser"))
 
 from database import DatabaseManager
 from models import Verse
+from verse_corpus import export_corpus, load_backup_verses, write_corpus
 
 
 class VerseBackupManager:
@@ -66,7 +67,7 @@ class VerseBackupManager:
         
         backup_path = self.backup_dir / filename
         
-        async with DatabaseManager() as db:
+        async with DatabaseManager(profile='backup_stream') as db:
             # Получаем стихи с фильтрами
             verses = await db.get_verses_for_backup(
                 language=language,
@@ -166,7 +167,7 @@ class VerseBackupManager:
         print(f"📊 Загружен бекап от {backup_data['metadata']['created_at']}")
         print(f"📖 Стихов в бекапе: {backup_data['metadata']['total_verses']}")
         
-        async with DatabaseManager() as db:
+        async with DatabaseManager(profile='backup_stream') as db:
             if clear_existing:
                 print("🗑️  Очистка существующих стихов...")
                 await db.clear_verses()
@@ -213,6 +214,40 @@ class VerseBackupManager:
             print(f"✅ Восстановлено {restored_count} стихов")
             return restored_count
     
+    async def create_corpus(self,
+                            backup_path: Optional[str] = None,
+                            language: Optional[str] = None,
+                            filename: Optional[str] = None) -> str:
+        """
+        Создает файл корпуса для чтения стихов без БД (python-parser/verse_corpus.py)
+        
+        Args:
+            backup_path: Файл бекапа (если не указан, стихи читаются из базы данных)
+            language: Фильтр по языку (только для базы данных)
+            filename: Имя файла (если не указано, генерируется автоматически)
+        
+        Returns:
+            Путь к созданному файлу корпуса
+        """
+        print("🔄 Создание корпуса стихов...")
+        
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"verses_corpus_{timestamp}.vcorpus"
+        corpus_path = self.backup_dir / filename
+        
+        if backup_path:
+            verses, metadata = load_backup_verses(backup_path)
+            print(f"📊 Загружен бекап от {metadata.get('created_at')}: {len(verses)} стихов")
+            meta = write_corpus(verses, str(corpus_path), source=os.path.basename(backup_path))
+        else:
+            meta = await export_corpus(str(corpus_path), language=language)
+        
+        print(f"✅ Корпус создан: {corpus_path}")
+        print(f"📖 Стихов: {meta['verses']}")
+        print(f"📁 Размер файла: {self._get_file_size(str(corpus_path))}")
+        return str(corpus_path)
+    
     async def list_backups(self) -> List[Dict[str, Any]]:
         """Возвращает список доступных бекапов"""
         backups = []
@@ -266,8 +301,9 @@ class VerseBackupManager:
 async def main():
     """Главная функция"""
     parser = argparse.ArgumentParser(description='Менеджер бекапов стихов Verse')
-    parser.add_argument('action', choices=['create', 'restore', 'list'],
-                       help='Действие: create (создать), restore (восстановить), list (список)')
+    parser.add_argument('action', choices=['create', 'restore', 'list', 'corpus'],
+                       help='Действие: create (создать), restore (восстановить), list (список), '
+                            'corpus (файл корпуса для чтения без БД, из БД или из --backup-file)')
     
     # Параметры для создания бекапа
     parser.add_argument('--language', '-l', 
@@ -313,6 +349,14 @@ async def main():
             )
             print(f"🎉 Восстановлено {restored_count} стихов")
             
+        elif args.action == 'corpus':
+            corpus_path = await backup_manager.create_corpus(
+                backup_path=args.backup_file,
+                language=args.language,
+                filename=args.filename
+            )
+            print(f"🎉 Корпус успешно создан: {corpus_path}")
+            
         elif args.action == 'list':
             backups = await backup_manager.list_backups()
             